@@ -15,15 +15,26 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 # Import submodules
-from .video_capture import VideoCapture, VideoManager, get_video_manager
+from .video_capture import (
+    VideoCapture, VideoFileCapture, VideoManager, FrameRing, FrameRef, get_video_manager
+)
 from .landmark_detection import (
     MediaPipeDetector, FaceDetector, HandDetector, PoseDetector,
-    MediaPipeProcessor, get_mediapipe_processor,
+    MediaPipeProcessor, FramePreprocessor, get_mediapipe_processor,
     DetectionResult, FaceData, HandData, PoseData
 )
+from .landmark_array import LandmarkArray
 from .data_streaming import (
-    DataStreamer, ZMQStreamer, MediaPipeStreamer, get_mediapipe_streamer
+    DataStreamer, ZMQStreamer, AsyncZMQStreamer, SharedMemoryStreamer, MediaPipeStreamer,
+    ChannelMerger, get_mediapipe_streamer
 )
+from .processing_pipeline import StageQueue, PipelineStage
+from .ring_buffer import RingBuffer
+from .wire_format import PickleSerializer, BinarySerializer, DeltaSerializer, get_serializer
+from .batch_processing import BatchProcessor, ResultStreamWriter, read_result_stream
+from .take_format import TakeWriter, TakeReader
+from .replay import ResultReplayer
+from .broker import StreamBroker
 
 
 class MediaPipeModule:
@@ -100,7 +111,7 @@ class MediaPipeModule:
         
         Args:
             config: Dictionary with configuration settings
-            
+        
         Returns:
             bool: True if successfully configured, False otherwise
         """
@@ -120,6 +131,21 @@ class MediaPipeModule:
             if 'enable_pose' in config:
                 self.processor.enable_pose = config['enable_pose']
             
+            if 'pipelined' in config:
+                self.processor.pipelined = config['pipelined']
+            
+            if 'drop_policy' in config:
+                self.processor.drop_policy = config['drop_policy']
+            
+            if 'parallel_detectors' in config:
+                self.processor.parallel_detectors = config['parallel_detectors']
+            
+            if 'input_size' in config:
+                self.processor.preprocessor.input_size = config['input_size']
+            
+            if 'crop_region' in config:
+                self.processor.preprocessor.crop_region = config['crop_region']
+            
             # Configure camera
             if 'camera_index' in config:
                 self.processor.capture = self.video_manager.get_capture(config['camera_index'])
@@ -154,6 +180,9 @@ class MediaPipeModule:
                 self.streamer.topic = config['topic']
                 self.streamer.streamer.topic = config['topic']
             
+            if 'serializer' in config:
+                self.streamer.streamer.serializer = get_serializer(config['serializer'])
+            
             # Restart if was streaming
             if was_streaming:
                 return self.start()
@@ -7,12 +7,28 @@ import bpy
 import time
 import threading
 import math
+import numpy as np
 from mathutils import Vector, Matrix, Quaternion, Euler
 from typing import Dict, List, Tuple, Optional, Any, Union
 
 # Import landmark mapping module
 from . import landmark_mapping
 
+# Import smoothing module
+from .smoothing import LandmarkSmoother, LandmarkFilterBank
+
+# Import bone groups module
+from .bone_groups import get_influence_group
+
+# Import mapping plan module
+from .mapping_plan import get_mapping_plan
+
+# Import recording module
+from .recording import PoseRecorder, bake_action
+
+# Import pose take module
+from .pose_take import reduce_keyframes
+
 class AnimationProcessor:
     """
     Class for processing animation data from MediaPipe.
@@ -33,6 +49,8 @@ class AnimationProcessor:
         # Animation settings
         self.auto_keyframe = True
         self.keyframe_interval = 1
+        self.keyframe_mode = 'live'  # 'live' inserts keyframes, 'bake' records in memory and writes F-curves on stop
+        self.keyframe_tolerance = 0.0  # Maximum channel error when reducing baked keyframes (0 keeps all)
         self.smoothing = 0.5
         self.scale_factor = 1.0
         
@@ -48,10 +66,21 @@ class AnimationProcessor:
         self.start_time = 0
         self.previous_data = None
         
+        # Take recording ('bake' keyframe mode)
+        self.recorder = None
+        self.start_frame = 1
+        self.start_timestamp = None
+        self.last_action = None
+        self.last_bake_stats = None
+        
         # Smoothing buffers
-        self.position_buffer = {}
         self.rotation_buffer = {}
         self.buffer_size = 5  # Number of frames to buffer for smoothing
+        self.smoother = LandmarkSmoother(self.buffer_size)
+        
+        # Smoothing mode ('average', 'one_euro', 'spring' or 'kalman')
+        self.smoothing_mode = 'average'
+        self.filter_bank = None
     
     def set_armature(self, armature):
         """
@@ -64,7 +93,9 @@ class AnimationProcessor:
         self.mapper.set_armature(armature)
         
         # Clear buffers
-        self.position_buffer = {}
+        self.smoother.reset()
+        if self.filter_bank is not None:
+            self.filter_bank.reset()
         self.rotation_buffer = {}
     
     def set_mapper(self, mapper):
@@ -77,9 +108,25 @@ class AnimationProcessor:
         self.mapper = mapper
         
         # Clear buffers
-        self.position_buffer = {}
+        self.smoother.reset()
+        if self.filter_bank is not None:
+            self.filter_bank.reset()
         self.rotation_buffer = {}
     
+    def set_smoothing_mode(self, mode, parameters=None):
+        """
+        Set the smoothing mode.
+        
+        Args:
+            mode: 'average' for the weighted moving average, or 'one_euro', 'spring'
+                or 'kalman' for an adaptive filter
+            parameters: Filter parameters per body part ('face', 'hand', 'pose'),
+                merged over the defaults of the filter
+        """
+        self.filter_bank = None if mode == 'average' else LandmarkFilterBank(mode, parameters)
+        self.smoothing_mode = mode
+        self.smoother.reset()
+    
     def start_recording(self):
         """Start animation recording."""
         if self.is_recording:
@@ -91,13 +138,26 @@ class AnimationProcessor:
         self.start_time = time.time()
         self.previous_data = None
         
+        # Start a new take
+        self.recorder = None
+        self.start_frame = bpy.context.scene.frame_current
+        self.start_timestamp = None
+        
         # Clear buffers
-        self.position_buffer = {}
+        self.smoother.reset()
+        if self.filter_bank is not None:
+            self.filter_bank.reset()
         self.rotation_buffer = {}
     
     def stop_recording(self):
-        """Stop animation recording."""
+        """Stop animation recording, baking the recorded take."""
+        if not self.is_recording:
+            return
+        
         self.is_recording = False
+        if self.recorder is not None and len(self.recorder) > 0:
+            self.bake_recording()
+        self.recorder = None
     
     def process_frame(self, data):
         """
@@ -105,7 +165,7 @@ class AnimationProcessor:
         
         Args:
             data: MediaPipe data dictionary
-            
+        
         Returns:
             bool: True if frame was processed successfully, False otherwise
         """
@@ -124,7 +184,10 @@ class AnimationProcessor:
         
         # Insert keyframes if needed
         if self.auto_keyframe and self.frame_count - self.last_keyframe >= self.keyframe_interval:
-            self.insert_keyframes()
+            if self.keyframe_mode == 'bake':
+                self.record_pose(data)
+            else:
+                self.insert_keyframes()
             self.last_keyframe = self.frame_count
         
         # Store data for next frame
@@ -138,7 +201,7 @@ class AnimationProcessor:
         
         Args:
             data: MediaPipe data dictionary
-            
+        
         Returns:
             dict: Smoothed data dictionary
         """
@@ -203,122 +266,41 @@ class AnimationProcessor:
             previous: Previous landmark data
             landmark_type: Type of landmark ('face', 'hand', 'pose')
             index: Index of the landmark set
-            
+        
         Returns:
             dict: Smoothed landmark data
         """
         # Create a copy of the current data
         smoothed = current.copy()
         
-        # Smooth landmarks
-        if 'landmarks' in current and 'landmarks' in previous:
-            smoothed_landmarks = []
-            
-            for i, lm in enumerate(current['landmarks']):
-                if i < len(previous['landmarks']):
-                    prev_lm = previous['landmarks'][i]
-                    
-                    # Get buffer key
-                    buffer_key = f"{landmark_type}_{index}_{i}"
-                    
-                    # Initialize buffer if needed
-                    if buffer_key not in self.position_buffer:
-                        self.position_buffer[buffer_key] = []
-                    
-                    # Add current position to buffer
-                    self.position_buffer[buffer_key].append(Vector((lm['x'], lm['y'], lm['z'])))
-                    
-                    # Limit buffer size
-                    if len(self.position_buffer[buffer_key]) > self.buffer_size:
-                        self.position_buffer[buffer_key].pop(0)
-                    
-                    # Calculate smoothed position
-                    smoothed_pos = Vector((0, 0, 0))
-                    weights = 0
-                    
-                    for j, pos in enumerate(self.position_buffer[buffer_key]):
-                        weight = (j + 1) / len(self.position_buffer[buffer_key])
-                        smoothed_pos += pos * weight
-                        weights += weight
-                    
-                    if weights > 0:
-                        smoothed_pos /= weights
-                    
-                    # Apply smoothing factor
-                    final_pos = Vector((lm['x'], lm['y'], lm['z'])).lerp(smoothed_pos, self.smoothing)
-                    
-                    # Create smoothed landmark
-                    smoothed_lm = {
-                        'x': final_pos.x,
-                        'y': final_pos.y,
-                        'z': final_pos.z
-                    }
-                    
-                    # Copy additional properties
-                    for key, value in lm.items():
-                        if key not in ['x', 'y', 'z']:
-                            smoothed_lm[key] = value
-                    
-                    smoothed_landmarks.append(smoothed_lm)
-                else:
-                    smoothed_landmarks.append(lm)
-            
-            smoothed['landmarks'] = smoothed_landmarks
+        # Keep the smoothing window in sync with the buffer size setting
+        self.smoother.set_buffer_size(self.buffer_size)
         
-        # Smooth world landmarks if available
-        if 'world_landmarks' in current and 'world_landmarks' in previous:
-            smoothed_world_landmarks = []
-            
-            for i, lm in enumerate(current['world_landmarks']):
-                if i < len(previous['world_landmarks']):
-                    prev_lm = previous['world_landmarks'][i]
-                    
-                    # Get buffer key
-                    buffer_key = f"{landmark_type}_{index}_{i}_world"
-                    
-                    # Initialize buffer if needed
-                    if buffer_key not in self.position_buffer:
-                        self.position_buffer[buffer_key] = []
-                    
-                    # Add current position to buffer
-                    self.position_buffer[buffer_key].append(Vector((lm['x'], lm['y'], lm['z'])))
-                    
-                    # Limit buffer size
-                    if len(self.position_buffer[buffer_key]) > self.buffer_size:
-                        self.position_buffer[buffer_key].pop(0)
-                    
-                    # Calculate smoothed position
-                    smoothed_pos = Vector((0, 0, 0))
-                    weights = 0
-                    
-                    for j, pos in enumerate(self.position_buffer[buffer_key]):
-                        weight = (j + 1) / len(self.position_buffer[buffer_key])
-                        smoothed_pos += pos * weight
-                        weights += weight
-                    
-                    if weights > 0:
-                        smoothed_pos /= weights
-                    
-                    # Apply smoothing factor
-                    final_pos = Vector((lm['x'], lm['y'], lm['z'])).lerp(smoothed_pos, self.smoothing)
-                    
-                    # Create smoothed landmark
-                    smoothed_lm = {
-                        'x': final_pos.x,
-                        'y': final_pos.y,
-                        'z': final_pos.z
-                    }
-                    
-                    # Copy additional properties
-                    for key, value in lm.items():
-                        if key not in ['x', 'y', 'z']:
-                            smoothed_lm[key] = value
-                    
-                    smoothed_world_landmarks.append(smoothed_lm)
+        # Detection timestamps are in milliseconds
+        timestamp = current.get('timestamp')
+        if timestamp is not None:
+            timestamp /= 1000.0
+        
+        # Smooth landmarks and world landmarks if available
+        for landmark_key in ['landmarks', 'world_landmarks']:
+            if landmark_key in current and landmark_key in previous:
+                buffer_key = (landmark_type, index, landmark_key)
+                
+                if self.filter_bank is not None:
+                    smoothed[landmark_key] = self.filter_bank.filter_landmarks(
+                        buffer_key,
+                        landmark_type,
+                        current[landmark_key],
+                        len(previous[landmark_key]),
+                        timestamp
+                    )
                 else:
-                    smoothed_world_landmarks.append(lm)
-            
-            smoothed['world_landmarks'] = smoothed_world_landmarks
+                    smoothed[landmark_key] = self.smoother.smooth_landmarks(
+                        buffer_key,
+                        current[landmark_key],
+                        len(previous[landmark_key]),
+                        self.smoothing
+                    )
         
         return smoothed
     
@@ -328,7 +310,7 @@ class AnimationProcessor:
         
         Args:
             data: MediaPipe data dictionary
-            
+        
         Returns:
             int: Number of bones updated
         """
@@ -340,26 +322,16 @@ class AnimationProcessor:
         if not bone_mapping:
             return 0
         
-        # Update bones based on landmark type
+        # Update bones one at a time through the mapper
         updated_bones = 0
+        influences = {
+            'face': self.face_influence,
+            'hands': self.hands_influence,
+            'pose': self.pose_influence
+        }
         
         for bone_name in bone_mapping.keys():
-            bone_name_lower = bone_name.lower()
-            
-            # Determine influence factor based on bone name
-            influence = 1.0
-            
-            # Face bones
-            if any(part in bone_name_lower for part in ['face', 'head', 'jaw', 'eye', 'brow', 'lip', 'tongue']):
-                influence = self.face_influence
-            
-            # Hand bones
-            elif any(part in bone_name_lower for part in ['hand', 'finger', 'thumb', 'index', 'middle', 'ring', 'pinky']):
-                influence = self.hands_influence
-            
-            # Body bones
-            else:
-                influence = self.pose_influence
+            influence = influences[get_influence_group(bone_name)]
             
             # Update bone transform
             if self.mapper.update_bone_transform(data, bone_name, influence, self.scale_factor):
@@ -373,7 +345,7 @@ class AnimationProcessor:
         
         Args:
             frame: Frame number (None for current frame)
-            
+        
         Returns:
             int: Number of bones keyframed
         """
@@ -387,6 +359,82 @@ class AnimationProcessor:
         # Insert keyframes
         return self.mapper.insert_keyframes(frame)
     
+    def record_pose(self, data):
+        """
+        Record the current location and rotation channels of the mapped bones for baking.
+        The frame number follows the frame timestamps, so the take plays back
+        at the speed it was captured.
+        
+        Args:
+            data: MediaPipe data dictionary
+        
+        Returns:
+            bool: True if the pose was recorded, False otherwise
+        """
+        if self.armature is None or self.mapper is None:
+            return False
+        
+        if self.recorder is None:
+            bone_mapping = self.mapper.get_bone_mapping()
+            if not bone_mapping:
+                return False
+            plan = get_mapping_plan(self.armature, bone_mapping)
+            self.recorder = PoseRecorder(self.armature, plan.bone_names, plan.pose_bone_rows)
+        
+        # Detection timestamps are in milliseconds
+        timestamp = data.get('frame_timestamp', 0) / 1000.0 or time.time()
+        if self.start_timestamp is None:
+            self.start_timestamp = timestamp
+        
+        render = bpy.context.scene.render
+        fps = render.fps / render.fps_base
+        frame = self.start_frame + (timestamp - self.start_timestamp) * fps
+        
+        self.recorder.record_pose(frame, self.armature)
+        return True
+    
+    def bake_recording(self):
+        """
+        Write the recorded take into the armature's current action, or into a
+        new action if it has none. Keys in the take's frame range are replaced.
+        
+        Returns:
+            bpy.types.Action: Baked action, or None if nothing was recorded
+        """
+        if self.recorder is None or len(self.recorder) == 0 or self.armature is None:
+            return None
+        
+        frames, values = self.recorder.get_take()
+        
+        # Optionally drop keys that linear interpolation between the kept keys reproduces
+        # within the tolerance; written keys keep the default interpolation
+        keep = None
+        keys_before = values.size
+        keys_after = keys_before
+        if self.keyframe_tolerance > 0:
+            keep = reduce_keyframes(frames, values, self.recorder.bone_columns, self.keyframe_tolerance)
+            channel_counts = np.diff(self.recorder.bone_columns + [values.shape[1]])
+            keys_after = int(keep.sum(axis=0) @ channel_counts)
+        
+        self.last_action = bake_action(
+            self.armature,
+            self.recorder,
+            frames,
+            values,
+            f"{self.armature.name} MediaPipe Take",
+            keep
+        )
+        
+        self.last_bake_stats = {
+            'frames': len(frames),
+            'keys_before': keys_before,
+            'keys_after': keys_after
+        }
+        print(f"Baked {self.last_action.name}: {keys_after} of {keys_before} keyframes kept "
+              f"(tolerance {self.keyframe_tolerance})")
+        
+        return self.last_action
+    
     def get_fps(self):
         """
         Get the current animation FPS.
@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""
+Batch processing module for MediaPipe to Blender live animation add-on.
+This module runs the MediaPipe detectors over recorded video files as fast as
+inference allows and writes the detection results to disk.
+"""
+
+import os
+import cv2
+import time
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Import video capture module
+from .video_capture import VideoFileCapture, expand_video_paths
+
+# Import landmark detection module
+from .landmark_detection import MediaPipeProcessor, DetectionResult
+
+# Import wire format module
+from .wire_format import encode_result, decode_result
+
+
+# Result stream layout: RESULT_STREAM_MAGIC followed by one record per frame,
+# each a RECORD_STRUCT byte length and a binary wire format message
+RESULT_STREAM_MAGIC = b'MPRS\x01'
+RECORD_STRUCT = struct.Struct('<I')
+RESULT_STREAM_EXTENSION = '.mpr'
+
+
+class ResultStreamWriter:
+    """
+    Append-only writer of a detection result stream file.
+    Every result is stored as a length-prefixed binary wire format message,
+    so the file can be read back with read_result_stream() or sent as is.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a result stream file for writing.
+        
+        Args:
+            path: Output file path; an existing file is replaced
+        """
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(RESULT_STREAM_MAGIC)
+        self.count = 0
+    
+    def write(self, result: Union[DetectionResult, Dict[str, Any]]) -> None:
+        """
+        Append a detection result to the stream.
+        
+        Args:
+            result: DetectionResult or dictionary in the streamer result format
+        """
+        message = encode_result(result)
+        self.file.write(RECORD_STRUCT.pack(len(message)))
+        self.file.write(message)
+        self.count += 1
+    
+    def write_messages(self, messages: Sequence[bytes]) -> None:
+        """
+        Append already encoded results to the stream.
+        
+        Args:
+            messages: Binary wire format messages, in frame order
+        """
+        for message in messages:
+            self.file.write(RECORD_STRUCT.pack(len(message)))
+            self.file.write(message)
+        self.count += len(messages)
+    
+    def close(self) -> None:
+        """Flush and close the file."""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+    
+    def __enter__(self) -> "ResultStreamWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def read_result_stream(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Read the detection results of a result stream file in order.
+    Landmark arrays are read-only views over the file contents.
+    
+    Args:
+        path: Result stream file path
+    
+    Returns:
+        Iterator[Dict[str, Any]]: Result dictionaries with LandmarkArray landmarks
+    """
+    with open(path, 'rb') as file:
+        buffer = memoryview(file.read())
+    
+    if bytes(buffer[:len(RESULT_STREAM_MAGIC)]) != RESULT_STREAM_MAGIC:
+        raise ValueError(f"Not a result stream file: {path}")
+    
+    offset = len(RESULT_STREAM_MAGIC)
+    while offset + RECORD_STRUCT.size <= len(buffer):
+        size, = RECORD_STRUCT.unpack_from(buffer, offset)
+        offset += RECORD_STRUCT.size
+        if offset + size > len(buffer):
+            raise ValueError(f"Truncated result stream file: {path}")
+        
+        yield decode_result(buffer[offset:offset + size])
+        offset += size
+
+
+def run_video_file(
+    processor: MediaPipeProcessor,
+    video_path: str,
+    callback: Callable[[DetectionResult], None],
+    start_frame: int = 0,
+    end_frame: Optional[int] = None
+) -> bool:
+    """
+    Run a processor over the frames of a video file until the file is done.
+    The frame index of every result is its frame's index in the file, so frames
+    the processor skips do not shift the indices of later results.
+    
+    Args:
+        processor: Stopped, non-pipelined MediaPipe processor; its capture is replaced by the file
+        video_path: Video file path
+        callback: Function called with every detection result, in frame order
+        start_frame: Index of the first frame to process
+        end_frame: Index of the frame to stop before, or None to process to the end
+    
+    Returns:
+        bool: True if the file was processed, False otherwise
+    """
+    if processor.pipelined:
+        raise ValueError("Video files must be processed by a non-pipelined processor")
+    
+    capture = VideoFileCapture(video_path, start_frame=start_frame, end_frame=end_frame)
+    
+    def on_result(result: DetectionResult) -> None:
+        # Results are produced on the capture thread while their frame is current
+        result.frame_index = capture.file_position - 1
+        callback(result)
+    
+    processor.capture = capture
+    processor.set_result_callback(on_result)
+    
+    try:
+        if not processor.start():
+            print(f"Failed to process video file {video_path}")
+            return False
+        
+        capture.wait()
+        return True
+    
+    finally:
+        processor.stop()
+        processor.set_result_callback(None)
+
+
+def plan_segments(
+    frame_count: int,
+    fps: float,
+    workers: int,
+    segment_seconds: float = 60.0,
+    overlap_seconds: float = 2.0
+) -> List[Tuple[int, int, Optional[int]]]:
+    """
+    Split a video into time segments that can be processed independently.
+    Every segment starts processing overlap frames early so the detectors
+    have re-established tracking by its first frame; those results are dropped.
+    
+    Args:
+        frame_count: Number of frames in the video
+        fps: Frame rate of the video
+        workers: Number of worker processes; short videos are split so every worker gets a segment
+        segment_seconds: Maximum length of a segment in seconds
+        overlap_seconds: Length of the tracking warm-up before each segment in seconds
+    
+    Returns:
+        List[Tuple[int, int, Optional[int]]]: (warm-up start, first frame, end frame) of each
+            segment; the last segment has no end frame so frame count estimates cannot lose frames
+    """
+    segment_frames = max(1, min(int(round(segment_seconds * fps)), -(-frame_count // max(1, workers))))
+    overlap_frames = max(0, int(round(overlap_seconds * fps)))
+    
+    segments = []
+    for start in range(0, max(frame_count, 1), segment_frames):
+        end = start + segment_frames if start + segment_frames < frame_count else None
+        segments.append((max(0, start - overlap_frames), start, end))
+    
+    return segments
+
+
+# Processor of a segment worker process, created once per process
+segment_processor = None
+
+def _init_segment_worker(options: Dict[str, Any]) -> None:
+    """
+    Create the MediaPipe processor of a segment worker process.
+    
+    Args:
+        options: MediaPipeProcessor keyword arguments
+    """
+    global segment_processor
+    segment_processor = MediaPipeProcessor(**options)
+
+
+def _process_segment(
+    video_path: str,
+    warmup_start: int,
+    start: int,
+    end: Optional[int]
+) -> List[bytes]:
+    """
+    Process one segment of a video file in a worker process.
+    
+    Args:
+        video_path: Video file path
+        warmup_start: Index of the first frame run through the detectors
+        start: Index of the first frame whose result is kept
+        end: Index of the frame to stop before, or None to process to the end
+    
+    Returns:
+        List[bytes]: Encoded results of the segment frames, in frame order
+    """
+    messages = []
+    
+    def on_result(result: DetectionResult) -> None:
+        # Results of the warm-up frames only re-establish tracking
+        if result.frame_index >= start:
+            messages.append(encode_result(result))
+    
+    if not run_video_file(segment_processor, video_path, on_result, warmup_start, end):
+        raise RuntimeError(f"Failed to process frames {start}-{end} of {video_path}")
+    
+    return messages
+
+
+class BatchProcessor:
+    """
+    Offline processor for recorded video files.
+    Each file is decoded with a VideoFileCapture and processed inline on the
+    capture thread, so decoding runs exactly as fast as inference allows, no
+    frame is dropped and results keep the timestamps of the source video.
+    With several workers a file is split into overlapping time segments that
+    are processed in separate processes, one detector set per core.
+    The results of every file are written to their own result stream file.
+    """
+    
+    def __init__(
+        self,
+        output_dir: Optional[str] = None,
+        enable_face: bool = True,
+        enable_hands: bool = True,
+        enable_pose: bool = True,
+        parallel_detectors: bool = False,
+        input_size: Optional[Tuple[int, int]] = None,
+        crop_region: Optional[Tuple[int, int, int, int]] = None,
+        workers: int = 1,
+        segment_seconds: float = 60.0,
+        overlap_seconds: float = 2.0
+    ):
+        """
+        Initialize the batch processor with specified parameters.
+        
+        Args:
+            output_dir: Directory result streams are written to, or None to write next to each video
+            enable_face: Whether to enable face detection
+            enable_hands: Whether to enable hand detection
+            enable_pose: Whether to enable pose detection
+            parallel_detectors: Whether to run the face, hand and pose detectors
+                concurrently on a thread pool
+            input_size: (width, height) frames are resized to before detection, or None
+            crop_region: (x, y, width, height) region of the frame to run detection on, or None
+            workers: Number of worker processes a file is split across (1 processes in this process)
+            segment_seconds: Maximum length of a worker segment in seconds
+            overlap_seconds: Length of the tracking warm-up before each segment in seconds
+        """
+        self.output_dir = output_dir
+        self.workers = max(1, workers)
+        self.segment_seconds = segment_seconds
+        self.overlap_seconds = overlap_seconds
+        
+        # Processor settings, also passed to the worker processes
+        self.options = {
+            'enable_face': enable_face,
+            'enable_hands': enable_hands,
+            'enable_pose': enable_pose,
+            'parallel_detectors': parallel_detectors,
+            'input_size': input_size,
+            'crop_region': crop_region
+        }
+        self.processor = MediaPipeProcessor(**self.options)
+        
+        # Statistics of the processed files
+        self.frame_count = 0
+        self.process_time = 0.0
+    
+    def get_output_path(self, video_path: str) -> str:
+        """
+        Get the result stream path for a video file.
+        
+        Args:
+            video_path: Video file path
+        
+        Returns:
+            str: Result stream file path
+        """
+        name = os.path.splitext(os.path.basename(video_path))[0] + RESULT_STREAM_EXTENSION
+        directory = self.output_dir if self.output_dir else os.path.dirname(video_path)
+        return os.path.join(directory, name)
+    
+    def process_file(self, video_path: str, output_path: Optional[str] = None) -> Optional[str]:
+        """
+        Run the detectors over every frame of a video file.
+        
+        Args:
+            video_path: Video file path
+            output_path: Result stream file path, or None to derive it from the video path
+        
+        Returns:
+            Optional[str]: Path of the written result stream, or None if processing failed;
+                a partially written stream is deleted
+        """
+        if output_path is None:
+            output_path = self.get_output_path(video_path)
+        
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        start_time = time.time()
+        writer = None
+        processed = False
+        try:
+            with ResultStreamWriter(output_path) as writer:
+                segments = self._plan_file(video_path) if self.workers > 1 else None
+                if segments and len(segments) > 1:
+                    self._process_segments(video_path, segments, writer)
+                    processed = True
+                else:
+                    processed = run_video_file(self.processor, video_path, writer.write)
+        
+        except Exception as e:
+            print(f"Error processing video file {video_path}: {e}")
+        
+        if not processed:
+            # Do not leave a partial result stream behind
+            if writer is not None:
+                try:
+                    os.remove(output_path)
+                except OSError as e:
+                    print(f"Error removing partial result stream {output_path}: {e}")
+            return None
+        
+        elapsed = time.time() - start_time
+        self.frame_count += writer.count
+        self.process_time += elapsed
+        
+        fps = writer.count / elapsed if elapsed > 0 else 0.0
+        print(f"Processed {video_path}: {writer.count} frames in {elapsed:.1f} s ({fps:.1f} FPS)")
+        return output_path
+    
+    def _plan_file(self, video_path: str) -> Optional[List[Tuple[int, int, Optional[int]]]]:
+        """
+        Split a video file into worker segments.
+        
+        Args:
+            video_path: Video file path
+        
+        Returns:
+            Optional[List]: Segments from plan_segments(), or None if the frame count is unknown
+        """
+        cap = cv2.VideoCapture(video_path)
+        try:
+            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            fps = cap.get(cv2.CAP_PROP_FPS)
+        finally:
+            cap.release()
+        
+        if frame_count <= 0 or fps <= 0:
+            return None
+        
+        return plan_segments(frame_count, fps, self.workers, self.segment_seconds, self.overlap_seconds)
+    
+    def _process_segments(
+        self,
+        video_path: str,
+        segments: List[Tuple[int, int, Optional[int]]],
+        writer: "ResultStreamWriter"
+    ) -> None:
+        """
+        Process the segments of a video file in worker processes and write
+        their results in frame order.
+        
+        Args:
+            video_path: Video file path
+            segments: Segments from plan_segments()
+            writer: Result stream the results are appended to
+        """
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_segment_worker,
+            initargs=(self.options,)
+        ) as executor:
+            # Keep a bounded number of segments in flight so finished
+            # segments waiting for an earlier one do not pile up in memory
+            pending = deque()
+            for segment in segments:
+                pending.append(executor.submit(_process_segment, video_path, *segment))
+                if len(pending) >= 2 * self.workers:
+                    writer.write_messages(pending.popleft().result())
+            
+            while pending:
+                writer.write_messages(pending.popleft().result())
+    
+    def process(self, source: Union[str, Sequence[str]]) -> List[str]:
+        """
+        Process every video file matching a path or glob pattern.
+        
+        Args:
+            source: Path or glob pattern of video files, or a list of them
+        
+        Returns:
+            List[str]: Paths of the written result streams
+        """
+        output_paths = []
+        for video_path in expand_video_paths(source):
+            output_path = self.process_file(video_path)
+            if output_path is not None:
+                output_paths.append(output_path)
+        
+        return output_paths
+    
+    def get_fps(self) -> float:
+        """
+        Get the average processing rate over all processed files.
+        
+        Returns:
+            float: Frames processed per second
+        """
+        if self.process_time <= 0:
+            return 0.0
+        return self.frame_count / self.process_time
+
+
+if __name__ == "__main__":
+    """Process video files and write their detection results."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Process video files with MediaPipe")
+    parser.add_argument("source", type=str, nargs="+", help="Video file paths or glob patterns")
+    parser.add_argument("--output-dir", type=str, default=None, help="Directory for the result streams")
+    parser.add_argument("--no-face", action="store_true", help="Disable face detection")
+    parser.add_argument("--no-hands", action="store_true", help="Disable hand detection")
+    parser.add_argument("--no-pose", action="store_true", help="Disable pose detection")
+    parser.add_argument("--parallel-detectors", action="store_true", help="Run detectors concurrently on a thread pool")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes per video file")
+    parser.add_argument("--segment-seconds", type=float, default=60.0, help="Maximum length of a worker segment")
+    parser.add_argument("--overlap-seconds", type=float, default=2.0, help="Tracking warm-up before each segment")
+    args = parser.parse_args()
+    
+    batch_processor = BatchProcessor(
+        output_dir=args.output_dir,
+        enable_face=not args.no_face,
+        enable_hands=not args.no_hands,
+        enable_pose=not args.no_pose,
+        parallel_detectors=args.parallel_detectors,
+        workers=args.workers,
+        segment_seconds=args.segment_seconds,
+        overlap_seconds=args.overlap_seconds
+    )
+    
+    output_paths = batch_processor.process(args.source)
+    print(f"Wrote {len(output_paths)} result streams, {batch_processor.frame_count} frames "
+          f"at {batch_processor.get_fps():.1f} FPS")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Benchmark script for MediaPipe to Blender live animation add-on.
+This script compares the previous per-landmark dictionary conversion with the
+bulk landmark extraction used by the detectors.
+"""
+
+import os
+import sys
+import timeit
+import argparse
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from mediapipe.framework.formats import landmark_pb2
+
+# Import MediaPipe module
+from src.mediapipe_module.landmark_detection import landmarks_to_array
+
+# Landmark counts produced by the face mesh, hand and pose solutions
+LANDMARK_COUNTS = {
+    'face': 478,
+    'hand': 21,
+    'pose': 33
+}
+
+def create_landmark_list(count, seed=0):
+    """Create a landmark list filled like a MediaPipe detection result."""
+    rng = np.random.default_rng(seed)
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    for _ in range(count):
+        landmark_list.landmark.add(
+            x=rng.random(),
+            y=rng.random(),
+            z=rng.random() - 0.5,
+            visibility=rng.random()
+        )
+    return landmark_list
+
+def landmarks_to_dicts(landmark_list):
+    """Convert landmarks the way the detectors did before LandmarkArray."""
+    landmarks = []
+    for landmark in landmark_list.landmark:
+        landmarks.append({
+            'x': landmark.x,
+            'y': landmark.y,
+            'z': landmark.z,
+            'visibility': landmark.visibility
+        })
+    return landmarks
+
+def time_function(func, number, repeat):
+    """Return the best time per call in microseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e6
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Benchmark landmark extraction")
+    parser.add_argument("--number", type=int, default=500, help="Calls per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements")
+    args = parser.parse_args()
+    
+    print(f"{'landmarks':<12}{'dicts (us)':>12}{'array (us)':>12}{'speedup':>10}")
+    
+    for name, count in LANDMARK_COUNTS.items():
+        landmark_list = create_landmark_list(count)
+        
+        # Both conversions must produce the same values
+        expected = np.array([[lm['x'], lm['y'], lm['z'], lm['visibility']]
+                             for lm in landmarks_to_dicts(landmark_list)], dtype=np.float32)
+        if not np.array_equal(landmarks_to_array(landmark_list).data, expected):
+            print(f"Mismatch in {name} landmarks")
+            return 1
+        
+        dict_time = time_function(lambda: landmarks_to_dicts(landmark_list), args.number, args.repeat)
+        array_time = time_function(lambda: landmarks_to_array(landmark_list), args.number, args.repeat)
+        
+        print(f"{f'{name} ({count})':<12}{dict_time:>12.1f}{array_time:>12.1f}{dict_time / array_time:>9.1f}x")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
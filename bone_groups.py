@@ -0,0 +1,73 @@
+"""
+MediaPipe Motion Capture - Bone Groups Module
+This module classifies mapped bones by influence group and landmark source for the Blender add-on.
+"""
+
+from typing import Dict, List, Tuple, Optional, Any, Union
+
+# Landmark sources bone landmark indices can refer to
+LANDMARK_SOURCES = ('pose', 'left_hand', 'right_hand', 'face')
+
+# Influence groups, matching the face, hands and pose influence settings
+INFLUENCE_GROUPS = ('face', 'hands', 'pose')
+
+# Bone name parts used to classify bones
+FACE_BONE_PARTS = ('face', 'head', 'jaw', 'eye', 'brow', 'lip', 'tongue')
+HAND_BONE_PARTS = ('hand', 'finger', 'thumb', 'index', 'middle', 'ring', 'pinky')
+FACE_SOURCE_PARTS = ('face', 'jaw', 'eye', 'brow', 'lip', 'tongue')
+FINGER_BONE_PARTS = ('finger', 'thumb', 'index', 'middle', 'ring', 'pinky')
+
+def get_influence_group(bone_name):
+    """
+    Get the influence group of a bone from its name.
+    
+    Args:
+        bone_name: Name of the bone
+    
+    Returns:
+        str: 'face', 'hands' or 'pose'
+    """
+    name = bone_name.lower()
+    if any(part in name for part in FACE_BONE_PARTS):
+        return 'face'
+    if any(part in name for part in HAND_BONE_PARTS):
+        return 'hands'
+    return 'pose'
+
+def get_bone_side(bone_name):
+    """
+    Get the side of a bone from its name.
+    
+    Args:
+        bone_name: Name of the bone
+    
+    Returns:
+        str: 'left', 'right' or None
+    """
+    name = bone_name.lower()
+    if name.endswith(('.l', '_l', '-l')) or 'left' in name:
+        return 'left'
+    if name.endswith(('.r', '_r', '-r')) or 'right' in name:
+        return 'right'
+    return None
+
+def get_landmark_source(bone_name):
+    """
+    Get the landmark source a bone's landmark indices refer to.
+    Finger bones use the hand landmarks of their side, facial bones the face
+    landmarks and all other bones, including the hands themselves, the pose
+    landmarks.
+    
+    Args:
+        bone_name: Name of the bone
+    
+    Returns:
+        str: One of LANDMARK_SOURCES, or None if the source is ambiguous
+    """
+    name = bone_name.lower()
+    if any(part in name for part in FACE_SOURCE_PARTS):
+        return 'face'
+    if any(part in name for part in FINGER_BONE_PARTS):
+        side = get_bone_side(bone_name)
+        return f"{side}_hand" if side is not None else None
+    return 'pose'
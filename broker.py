@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Broker module for MediaPipe to Blender live animation add-on.
+This module forwards the landmark stream of one publisher to any number of
+subscribers through an XSUB/XPUB proxy, so several Blender instances and
+preview clients can share a capture machine.
+"""
+
+import time
+import threading
+import zmq
+from collections import deque
+from typing import Any, Dict
+
+# Default ports; publishers connect to the frontend, subscribers to the backend
+BROKER_FRONTEND_PORT = 5555
+BROKER_BACKEND_PORT = 5556
+
+
+class StreamBroker:
+    """
+    XSUB/XPUB proxy between landmark publishers and subscribers.
+    Publishers such as MediaPipeStreamer connect a PUB socket to the frontend
+    and send each message once; subscribers connect SUB sockets to the backend
+    and subscribe to the topic prefixes they need. Subscriptions are forwarded
+    to the publishers, so messages nobody subscribed to are filtered at the
+    publisher and the broker only forwards what is requested.
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        frontend_port: int = BROKER_FRONTEND_PORT,
+        backend_port: int = BROKER_BACKEND_PORT
+    ):
+        """
+        Initialize the broker with specified parameters.
+        
+        Args:
+            host: Address to bind both sockets to ("0.0.0.0" for all interfaces)
+            frontend_port: Port publishers connect to
+            backend_port: Port subscribers connect to
+        """
+        self.host = host
+        self.frontend_port = frontend_port
+        self.backend_port = backend_port
+        
+        self.context = None
+        self.frontend = None
+        self.backend = None
+        self.is_running = False
+        self.thread = None
+        self.lock = threading.Lock()
+        
+        # Number of subscribers of each topic prefix
+        self.subscriptions = {}
+        
+        # Performance metrics
+        self.message_count = 0
+        self.start_time = 0
+        self.message_times = deque(maxlen=30)  # Seconds since start of the last 30 forwarded messages
+    
+    def start(self) -> bool:
+        """
+        Bind the broker sockets and start forwarding in a separate thread.
+        
+        Returns:
+            bool: True if successfully started, False otherwise
+        """
+        if self.is_running:
+            return True
+        
+        try:
+            self.context = zmq.Context()
+            
+            self.frontend = self.context.socket(zmq.XSUB)
+            self.frontend.setsockopt(zmq.LINGER, 0)
+            self.frontend.bind(f"tcp://{self.host}:{self.frontend_port}")
+            
+            # Pass every subscribe and unsubscribe through so subscribers can be counted
+            self.backend = self.context.socket(zmq.XPUB)
+            self.backend.setsockopt(zmq.LINGER, 0)
+            self.backend.setsockopt(zmq.XPUB_VERBOSER, 1)
+            self.backend.bind(f"tcp://{self.host}:{self.backend_port}")
+            
+            with self.lock:
+                self.subscriptions.clear()
+                self.message_count = 0
+                self.message_times.clear()
+            self.start_time = time.time()
+            
+            self.is_running = True
+            self.thread = threading.Thread(target=self._forward_loop)
+            self.thread.daemon = True
+            self.thread.start()
+            
+            return True
+        
+        except Exception as e:
+            print(f"Error starting stream broker: {e}")
+            self._cleanup()
+            return False
+    
+    def stop(self) -> None:
+        """Stop forwarding and release resources."""
+        self.is_running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        
+        self._cleanup()
+    
+    def _cleanup(self) -> None:
+        """Clean up ZMQ resources."""
+        for socket in (self.frontend, self.backend):
+            if socket is not None:
+                socket.close()
+        self.frontend = None
+        self.backend = None
+        
+        if self.context is not None:
+            self.context.term()
+            self.context = None
+    
+    def _forward_loop(self) -> None:
+        """Main forwarding loop that runs in a separate thread."""
+        poller = zmq.Poller()
+        poller.register(self.frontend, zmq.POLLIN)
+        poller.register(self.backend, zmq.POLLIN)
+        
+        while self.is_running:
+            try:
+                events = dict(poller.poll(100))  # 100ms timeout
+                
+                # Messages from publishers are forwarded without copying
+                if events.get(self.frontend):
+                    frames = self.frontend.recv_multipart(copy=False)
+                    self.backend.send_multipart(frames, copy=False)
+                    
+                    with self.lock:
+                        self.message_count += 1
+                        self.message_times.append(time.time() - self.start_time)
+                
+                # Subscriptions from subscribers are forwarded to the publishers
+                if events.get(self.backend):
+                    message = self.backend.recv()
+                    self.frontend.send(message)
+                    self._update_subscriptions(message)
+            
+            except zmq.ZMQError as e:
+                if not self.is_running:
+                    break
+                print(f"ZMQ error in broker loop: {e}")
+                time.sleep(0.1)
+            
+            except Exception as e:
+                print(f"Error in broker loop: {e}")
+                time.sleep(0.1)
+    
+    def _update_subscriptions(self, message: bytes) -> None:
+        """
+        Count a subscribe or unsubscribe message from the backend.
+        
+        Args:
+            message: Subscription message (1 to subscribe or 0 to unsubscribe, followed by the topic)
+        """
+        if not message or message[0] not in (0, 1):
+            return
+        
+        topic = message[1:].decode('utf-8', errors='replace')
+        with self.lock:
+            count = self.subscriptions.get(topic, 0) + (1 if message[0] == 1 else -1)
+            if count > 0:
+                self.subscriptions[topic] = count
+            else:
+                self.subscriptions.pop(topic, None)
+    
+    def get_subscriptions(self) -> Dict[str, int]:
+        """
+        Get the number of subscribers of each topic prefix.
+        
+        Returns:
+            Dict[str, int]: Subscriber count by topic prefix
+        """
+        with self.lock:
+            return dict(self.subscriptions)
+    
+    def get_message_rate(self) -> float:
+        """
+        Get the current forwarding rate in messages per second.
+        
+        Returns:
+            float: Current message rate
+        """
+        with self.lock:
+            elapsed = time.time() - self.start_time
+            if elapsed <= 0:
+                return 0.0
+            return self.message_count / elapsed
+    
+    def get_recent_message_rate(self) -> float:
+        """
+        Get the forwarding rate over the last 30 messages in messages per second.
+        Falls back to get_message_rate() until that many messages were forwarded.
+        
+        Returns:
+            float: Recent message rate
+        """
+        with self.lock:
+            if len(self.message_times) == self.message_times.maxlen:
+                window = time.time() - self.start_time - self.message_times[0]
+                if window > 0:
+                    return len(self.message_times) / window
+        return self.get_message_rate()
+    
+    def get_broker_stats(self) -> Dict[str, Any]:
+        """
+        Get broker statistics.
+        
+        Returns:
+            Dict[str, Any]: Forwarded message count, message rates and subscriptions
+        """
+        return {
+            'message_count': self.message_count,
+            'message_rate': self.get_message_rate(),
+            'recent_message_rate': self.get_recent_message_rate(),
+            
+            'subscriptions': self.get_subscriptions()
+        }
+    
+    def __del__(self):
+        """Ensure resources are released when object is destroyed."""
+        self.stop()
+
+
+if __name__ == "__main__":
+    """Run a stream broker until interrupted."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Forward a MediaPipe stream to several subscribers")
+    parser.add_argument("--host", type=str, default="0.0.0.0", help="Address to bind to")
+    parser.add_argument("--frontend-port", type=int, default=BROKER_FRONTEND_PORT, help="Port publishers connect to")
+    parser.add_argument("--backend-port", type=int, default=BROKER_BACKEND_PORT, help="Port subscribers connect to")
+    parser.add_argument("--interval", type=float, default=5.0, help="Seconds between statistics reports")
+    args = parser.parse_args()
+    
+    broker = StreamBroker(args.host, args.frontend_port, args.backend_port)
+    if not broker.start():
+        print("Failed to start stream broker")
+        exit(1)
+    
+    print(f"Publishers: tcp://{args.host}:{args.frontend_port}, subscribers: tcp://{args.host}:{args.backend_port}")
+    print("Press Ctrl+C to exit")
+    
+    try:
+        while True:
+            time.sleep(args.interval)
+            stats = broker.get_broker_stats()
+            print(f"Forwarded {stats['message_count']} messages ({stats['message_rate']:.1f}/s)")
+            for topic, count in sorted(stats['subscriptions'].items()):
+                print(f"  {topic or '<all>'}: {count} subscribers")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        broker.stop()
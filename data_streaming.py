@@ -4,17 +4,39 @@ Data streaming module for MediaPipe to Blender live animation add-on.
 This module handles real-time data streaming between MediaPipe and Blender.
 """
 
+import os
 import zmq
+import zmq.asyncio
 import json
+import asyncio
 import time
+import struct
 import threading
 import numpy as np
-from typing import Dict, List, Any, Optional, Callable, Union
-import pickle
+from collections import deque
+from dataclasses import replace
+from multiprocessing import shared_memory
+from typing import Dict, List, Any, Optional, Callable, Sequence, Union
 
 # Import landmark detection module
 from .landmark_detection import DetectionResult, get_mediapipe_processor
 
+# Import wire format module
+from .wire_format import get_serializer
+
+# Import take format module
+from .take_format import TakeWriter
+
+# Import broker module
+from .broker import BROKER_FRONTEND_PORT
+
+# Topic suffix of each result channel when channels are published separately
+CHANNEL_TOPICS = {
+    'faces': 'face',
+    'hands': 'hands',
+    'pose': 'pose'
+}
+
 
 class DataStreamer:
     """
@@ -67,7 +89,10 @@ class ZMQStreamer(DataStreamer):
         host: str = "127.0.0.1",
         port: int = 5556,
         socket_type: str = "PUB",
-        topic: str = "mediapipe"
+        topic: str = "mediapipe",
+        serializer: Union[str, Any] = "pickle",
+        conflate: bool = False,
+        subscriptions: Optional[Sequence[str]] = None
     ):
         """
         Initialize the ZMQ streamer with specified parameters.
@@ -78,6 +103,9 @@ class ZMQStreamer(DataStreamer):
             port: Port number
             socket_type: ZMQ socket type ("PUB", "SUB", "REQ", "REP", "PUSH", "PULL")
             topic: Topic for PUB/SUB sockets
+            serializer: Message serializer ("pickle", "binary" or "delta") or serializer instance
+            conflate: For SUB and PULL sockets, only process the newest queued message of each topic
+            subscriptions: Topic prefixes a SUB socket subscribes to, or None for topic only
         """
         super().__init__()
         self.mode = mode
@@ -85,6 +113,9 @@ class ZMQStreamer(DataStreamer):
         self.port = port
         self.socket_type = socket_type
         self.topic = topic
+        self.serializer = serializer
+        self.conflate = conflate
+        self.subscriptions = list(subscriptions) if subscriptions is not None else [topic]
         
         self.context = None
         self.socket = None
@@ -92,9 +123,9 @@ class ZMQStreamer(DataStreamer):
         
         # Performance metrics
         self.message_count = 0
+        self.skipped_count = 0  # Queued messages replaced by newer ones when conflating
         self.start_time = 0
-        self.message_times = []
-        self.max_message_times = 30
+        self.message_times = deque(maxlen=30)  # Seconds since start of the last 30 messages
         
         # Callbacks
         self.message_callbacks = []
@@ -126,7 +157,8 @@ class ZMQStreamer(DataStreamer):
                     self.socket.bind(f"tcp://{self.host}:{self.port}")
                 else:
                     self.socket.connect(f"tcp://{self.host}:{self.port}")
-                self.socket.setsockopt_string(zmq.SUBSCRIBE, self.topic)
+                for topic in self.subscriptions:
+                    self.socket.setsockopt_string(zmq.SUBSCRIBE, topic)
             
             elif self.socket_type == "REQ":
                 self.socket = self.context.socket(zmq.REQ)
@@ -159,6 +191,8 @@ class ZMQStreamer(DataStreamer):
                 self.is_running = True
                 self.start_time = time.time()
                 self.message_count = 0
+                self.skipped_count = 0
+                self.message_times.clear()
                 self.thread = threading.Thread(target=self._receive_loop)
                 self.thread.daemon = True
                 self.thread.start()
@@ -166,6 +200,7 @@ class ZMQStreamer(DataStreamer):
                 self.is_running = True
                 self.start_time = time.time()
                 self.message_count = 0
+                self.message_times.clear()
             
             return True
         
@@ -202,31 +237,40 @@ class ZMQStreamer(DataStreamer):
                     if self.socket.poll(100) == 0:  # 100ms timeout
                         continue
                     
-                    topic, message = self.socket.recv_multipart()
-                    topic = topic.decode('utf-8')
+                    # Receive without copying; the first frame is the topic
+                    frames = self.socket.recv_multipart(copy=False)
                     
-                    # Process the message
-                    self._process_message(message)
+                    # Process the message, or the newest queued message of each topic
+                    messages = self._receive_latest(frames) if self.conflate else [frames]
+                    for message in messages:
+                        topic = message[0].bytes.decode('utf-8', errors='replace')
+                        self._process_message([frame.buffer for frame in message[1:]], topic)
                 
                 elif self.socket_type == "REP":
-                    # For REP sockets, receive request and send reply
-                    message = self.socket.recv()
+                    # For REP sockets, wait for a request with a timeout so stop() is not blocked
+                    if self.socket.poll(100) == 0:  # 100ms timeout
+                        continue
+                    
+                    # Receive request and send reply
+                    frames = self.socket.recv_multipart(copy=False)
                     
                     # Process the message
-                    reply = self._process_message(message)
+                    reply = self._process_message([frame.buffer for frame in frames])
                     
                     # Send reply
-                    self.socket.send(reply if reply is not None else b'')
+                    self.socket.send_multipart(reply if reply is not None else [b''], copy=False)
                 
                 elif self.socket_type == "PULL":
                     # For PULL sockets, use non-blocking receive with timeout
                     if self.socket.poll(100) == 0:  # 100ms timeout
                         continue
                     
-                    message = self.socket.recv()
+                    frames = self.socket.recv_multipart(copy=False)
                     
-                    # Process the message
-                    self._process_message(message)
+                    # Process the message, or the newest queued message
+                    messages = self._receive_latest(frames) if self.conflate else [frames]
+                    for message in messages:
+                        self._process_message([frame.buffer for frame in message])
             
             except zmq.ZMQError as e:
                 if e.errno == zmq.EAGAIN:
@@ -240,29 +284,108 @@ class ZMQStreamer(DataStreamer):
                 print(f"Error in receive loop: {e}")
                 time.sleep(0.1)
     
-    def _process_message(self, message: bytes) -> Optional[bytes]:
+    def _receive_latest(self, frames: List[zmq.Frame]) -> List[List[zmq.Frame]]:
         """
-        Process a received message.
+        Drain the messages queued behind a received message and keep only the
+        newest one of each topic. ZMQ_CONFLATE cannot be used because it does
+        not support multipart messages.
         
         Args:
-            message: Received message as bytes
+            frames: Frames of the message that was received first
+        
+        Returns:
+            List[List[zmq.Frame]]: Newest message of each topic, in arrival order
+        """
+        has_topic = self.socket_type == "SUB"
+        latest = {}
+        skipped = 0
+        
+        while True:
+            topic = frames[0].bytes if has_topic else None
+            
+            # Keep keyframes of skipped delta messages so later deltas still decode
+            previous = latest.pop(topic, None)
+            if previous is not None:
+                try:
+                    if has_topic:
+                        serializer = self._get_serializer(topic.decode('utf-8', errors='replace'))
+                        serializer.skip_parts([frame.buffer for frame in previous[1:]])
+                    else:
+                        self.serializer.skip_parts([frame.buffer for frame in previous])
+                except Exception as e:
+                    print(f"Error skipping message: {e}")
+                skipped += 1
+            latest[topic] = frames
             
+            try:
+                frames = self.socket.recv_multipart(zmq.NOBLOCK, copy=False)
+            except zmq.Again:
+                break
+        
+        if skipped:
+            with self.lock:
+                self.skipped_count += skipped
+        
+        return list(latest.values())
+    
+    @property
+    def serializer(self) -> Any:
+        """Message serializer of the streamer topic."""
+        return self._serializer
+    
+    @serializer.setter
+    def serializer(self, serializer: Union[str, Any]) -> None:
+        """Replace the message serializer and the serializers forked from it for other topics."""
+        self._serializer = get_serializer(serializer)
+        
+        # Serializer state is kept per topic, e.g. delta keyframes of channel topics
+        self.topic_serializers = {}
+    
+    def _get_serializer(self, topic: Optional[str]) -> Any:
+        """
+        Get the serializer of a topic, forking the streamer serializer for other topics.
+        
+        Args:
+            topic: Message topic, or None for the streamer serializer
+        
+        Returns:
+            Any: Serializer instance
+        """
+        if topic is None or topic == self.topic:
+            return self._serializer
+        
+        serializer = self.topic_serializers.get(topic)
+        if serializer is None:
+            serializer = self._serializer.fork()
+            self.topic_serializers[topic] = serializer
+        return serializer
+    
+    def _process_message(self, frames: List[memoryview], topic: Optional[str] = None) -> Optional[List[Any]]:
+        """
+        Process a received message.
+        
+        Args:
+            frames: Buffers of the received message frames, excluding the topic
+            topic: Topic of the message for SUB sockets
+        
         Returns:
-            Optional[bytes]: Reply message for REP sockets, None otherwise
+            Optional[List[Any]]: Reply message frames for REP sockets, None otherwise
         """
         timestamp = time.time()
         
         try:
             # Try to deserialize the message
-            data = pickle.loads(message)
+            data = self._get_serializer(topic).loads_parts(frames)
+            
+            # Delta messages are skipped until their keyframe has been received
+            if data is None:
+                return None
             
             # Update performance metrics
             with self.lock:
                 self.message_count += 1
                 message_time = timestamp - self.start_time
                 self.message_times.append(message_time)
-                if len(self.message_times) > self.max_message_times:
-                    self.message_times.pop(0)
             
             # Call message callbacks
             reply_data = None
@@ -276,7 +399,7 @@ class ZMQStreamer(DataStreamer):
             
             # Return reply for REP sockets
             if self.socket_type == "REP" and reply_data is not None:
-                return pickle.dumps(reply_data)
+                return self.serializer.dumps_parts(reply_data)
             
             return None
         
@@ -284,13 +407,14 @@ class ZMQStreamer(DataStreamer):
             print(f"Error processing message: {e}")
             return None
     
-    def send_message(self, data: Any) -> bool:
+    def send_message(self, data: Any, topic: Optional[str] = None) -> bool:
         """
         Send a message through the ZMQ socket.
         
         Args:
             data: Data to send
-            
+            topic: Topic for PUB sockets, or None for the streamer topic
+        
         Returns:
             bool: True if successfully sent, False otherwise
         """
@@ -298,14 +422,16 @@ class ZMQStreamer(DataStreamer):
             return False
         
         try:
-            # Serialize the data
-            message = pickle.dumps(data)
+            topic = topic if topic is not None else self.topic
             
-            # Send the message
+            # Serialize the data into frames that reference the landmark arrays
+            frames = self._get_serializer(topic).dumps_parts(data)
+            
+            # Send the message without copying the frames
             if self.socket_type == "PUB":
-                self.socket.send_multipart([self.topic.encode('utf-8'), message])
+                self.socket.send_multipart([topic.encode('utf-8'), *frames], copy=False)
             elif self.socket_type in ["REQ", "PUSH"]:
-                self.socket.send(message)
+                self.socket.send_multipart(frames, copy=False)
             else:
                 print(f"Cannot send message with socket type: {self.socket_type}")
                 return False
@@ -315,8 +441,6 @@ class ZMQStreamer(DataStreamer):
                 self.message_count += 1
                 message_time = time.time() - self.start_time
                 self.message_times.append(message_time)
-                if len(self.message_times) > self.max_message_times:
-                    self.message_times.pop(0)
             
             return True
         
@@ -356,6 +480,31 @@ class ZMQStreamer(DataStreamer):
                 return 0.0
             return self.message_count / elapsed
     
+    def get_recent_message_rate(self) -> float:
+        """
+        Get the message rate over the last 30 messages in messages per second.
+        Falls back to get_message_rate() until that many messages were sent or received.
+        
+        Returns:
+            float: Recent message rate
+        """
+        with self.lock:
+            if len(self.message_times) == self.message_times.maxlen:
+                window = time.time() - self.start_time - self.message_times[0]
+                if window > 0:
+                    return len(self.message_times) / window
+        return self.get_message_rate()
+    
+    def get_skipped_frames(self) -> int:
+        """
+        Get the number of received messages skipped by conflation.
+        
+        Returns:
+            int: Number of messages replaced by a newer message before they were processed
+        """
+        with self.lock:
+            return self.skipped_count
+    
     def is_connected(self) -> bool:
         """
         Check if the ZMQ socket is connected.
@@ -370,130 +519,1308 @@ class ZMQStreamer(DataStreamer):
         self.stop()
 
 
-class MediaPipeStreamer:
+class AsyncZMQStreamer:
     """
-    MediaPipe data streamer.
-    Streams MediaPipe detection results to Blender.
+    ZeroMQ streamer built on zmq.asyncio.
+    A receive task decodes incoming messages into a bounded mailbox that only
+    keeps the newest messages, so a slow consumer skips stale frames instead of
+    working through a backlog, and stop() cancels the task immediately.
+    Consumers read with "async for data in streamer" or receive(), or call
+    get_latest() from another thread, e.g. a Blender timer while the event
+    loop runs in start_background().
     """
     
+    RECEIVE_SOCKET_TYPES = ("SUB", "PULL")
+    SEND_SOCKET_TYPES = ("PUB", "PUSH")
+    
     def __init__(
         self,
+        mode: str = "client",
         host: str = "127.0.0.1",
         port: int = 5556,
-        mode: str = "server",
-        socket_type: str = "PUB",
-        topic: str = "mediapipe"
+        socket_type: str = "SUB",
+        topic: str = "mediapipe",
+        serializer: Union[str, Any] = "pickle",
+        mailbox_size: int = 1,
+        subscriptions: Optional[Sequence[str]] = None
     ):
         """
-        Initialize the MediaPipe streamer with specified parameters.
+        Initialize the asyncio ZMQ streamer with specified parameters.
         
         Args:
+            mode: "server" or "client"
             host: Host address
             port: Port number
-            mode: "server" or "client"
-            socket_type: ZMQ socket type ("PUB", "PUSH", "REQ")
+            socket_type: ZMQ socket type ("SUB", "PULL", "PUB", "PUSH")
             topic: Topic for PUB/SUB sockets
+            serializer: Message serializer ("pickle", "binary" or "delta") or serializer instance
+            mailbox_size: Number of received messages kept for the consumer; older ones are dropped
+            subscriptions: Topic prefixes a SUB socket subscribes to, or None for topic only
         """
+        if socket_type not in self.RECEIVE_SOCKET_TYPES + self.SEND_SOCKET_TYPES:
+            raise ValueError(f"Unsupported socket type: {socket_type}")
+        if mailbox_size < 1:
+            raise ValueError("AsyncZMQStreamer mailbox_size must be at least 1")
+        
+        self.mode = mode
         self.host = host
         self.port = port
-        self.mode = mode
         self.socket_type = socket_type
         self.topic = topic
+        self.serializer = serializer
+        self.subscriptions = list(subscriptions) if subscriptions is not None else [topic]
         
-        # Initialize ZMQ streamer
-        self.streamer = ZMQStreamer(
-            mode=mode,
-            host=host,
-            port=port,
-            socket_type=socket_type,
-            topic=topic
-        )
+        self.context = None
+        self.socket = None
+        self.is_running = False
+        self.receive_task = None
         
-        # Initialize MediaPipe processor
-        self.processor = get_mediapipe_processor()
+        # Latest-only mailbox; the lock allows get_latest() from other threads
+        self.mailbox = deque(maxlen=mailbox_size)
+        self.mailbox_event = None
+        self.lock = threading.Lock()
         
-        # Processing state
-        self.is_streaming = False
-        self.frame_count = 0
-        self.last_frame_time = 0
+        # Event loop thread used by start_background()
+        self.loop = None
+        self.thread = None
+        
+        # Performance metrics
+        self.message_count = 0
+        self.dropped_count = 0  # Messages replaced in the mailbox before they were read
+        self.start_time = 0
+        self.message_times = deque(maxlen=30)
     
-    def start(self) -> bool:
+    async def start(self) -> bool:
         """
-        Start MediaPipe processing and data streaming.
+        Open the socket and start the receive task on the running event loop.
         
         Returns:
             bool: True if successfully started, False otherwise
         """
-        if self.is_streaming:
+        if self.is_running:
             return True
         
-        # Start ZMQ streamer
-        if not self.streamer.start():
-            print("Failed to start ZMQ streamer")
+        try:
+            self.context = zmq.asyncio.Context()
+            self.socket = self.context.socket(getattr(zmq, self.socket_type))
+            self.socket.setsockopt(zmq.LINGER, 0)
+            
+            address = f"tcp://{self.host}:{self.port}"
+            if self.mode == "server":
+                self.socket.bind(address)
+            else:
+                self.socket.connect(address)
+            
+            if self.socket_type == "SUB":
+                for topic in self.subscriptions:
+                    self.socket.setsockopt_string(zmq.SUBSCRIBE, topic)
+            
+            self.mailbox.clear()
+            self.mailbox_event = asyncio.Event()
+            self.message_count = 0
+            self.dropped_count = 0
+            self.message_times.clear()
+            self.start_time = time.time()
+            self.is_running = True
+            
+            if self.socket_type in self.RECEIVE_SOCKET_TYPES:
+                self.receive_task = asyncio.ensure_future(self._receive_loop())
+            
+            return True
+        
+        except Exception as e:
+            print(f"Error starting async ZMQ streamer: {e}")
+            self._cleanup()
             return False
+    
+    async def stop(self) -> None:
+        """Cancel the receive task, wake waiting consumers and release resources."""
+        self.is_running = False
         
-        # Set result callback for MediaPipe processor
-        self.processor.set_result_callback(self._result_callback)
+        if self.receive_task is not None:
+            self.receive_task.cancel()
+            try:
+                await self.receive_task
+            except asyncio.CancelledError:
+                pass
+            self.receive_task = None
         
-        # Start MediaPipe processor
-        if not self.processor.start():
-            print("Failed to start MediaPipe processor")
-            self.streamer.stop()
-            return False
+        if self.mailbox_event is not None:
+            self.mailbox_event.set()
         
-        self.is_streaming = True
-        self.frame_count = 0
-        self.last_frame_time = time.time()
+        self._cleanup()
+    
+    def _cleanup(self) -> None:
+        """Clean up ZMQ resources."""
+        if self.socket is not None:
+            self.socket.close(linger=0)
+            self.socket = None
         
-        return True
+        if self.context is not None:
+            self.context.term()
+            self.context = None
     
-    def stop(self) -> None:
-        """Stop MediaPipe processing and data streaming."""
-        if not self.is_streaming:
-            return
+    async def _receive_loop(self) -> None:
+        """Receive task that decodes messages into the mailbox until cancelled."""
+        while self.is_running:
+            try:
+                frames = await self.socket.recv_multipart(copy=False)
+                
+                # The first frame of a SUB message is the topic
+                serializer = self.serializer
+                if self.socket_type == "SUB":
+                    serializer = self._get_serializer(frames[0].bytes.decode('utf-8', errors='replace'))
+                    frames = frames[1:]
+                
+                data = serializer.loads_parts([frame.buffer for frame in frames])
+                
+                # Delta messages are skipped until their keyframe has been received
+                if data is not None:
+                    self._deliver(data)
+            
+            except asyncio.CancelledError:
+                raise
+            
+            except zmq.ZMQError as e:
+                if not self.is_running:
+                    break
+                print(f"ZMQ error in receive task: {e}")
+                await asyncio.sleep(0.1)
+            
+            except Exception as e:
+                print(f"Error in receive task: {e}")
+    
+    @property
+    def serializer(self) -> Any:
+        """Message serializer of the streamer topic."""
+        return self._serializer
+    
+    @serializer.setter
+    def serializer(self, serializer: Union[str, Any]) -> None:
+        """Replace the message serializer and the serializers forked from it for other topics."""
+        self._serializer = get_serializer(serializer)
         
-        # Stop MediaPipe processor
-        self.processor.set_result_callback(None)
-        self.processor.stop()
+        # Serializer state is kept per topic, e.g. delta keyframes of channel topics
+        self.topic_serializers = {}
+    
+    def _get_serializer(self, topic: str) -> Any:
+        """
+        Get the serializer of a topic, forking the streamer serializer for other topics.
         
-        # Stop ZMQ streamer
-        self.streamer.stop()
+        Args:
+            topic: Message topic
         
-        self.is_streaming = False
+        Returns:
+            Any: Serializer instance
+        """
+        if topic == self.topic:
+            return self._serializer
+        
+        serializer = self.topic_serializers.get(topic)
+        if serializer is None:
+            serializer = self._serializer.fork()
+            self.topic_serializers[topic] = serializer
+        return serializer
     
-    def _result_callback(self, result: DetectionResult) -> None:
+    def _deliver(self, data: Any) -> None:
         """
-        Callback function for MediaPipe detection results.
+        Put a decoded message into the mailbox, dropping the oldest one if full.
         
         Args:
-            result: MediaPipe detection result
+            data: Decoded message
         """
-        # Convert result to serializable format
-        data = self._convert_result_to_dict(result)
+        with self.lock:
+            if len(self.mailbox) == self.mailbox.maxlen:
+                self.dropped_count += 1
+            self.mailbox.append(data)
+            
+            self.message_count += 1
+            self.message_times.append(time.time() - self.start_time)
         
-        # Send data through ZMQ streamer
-        self.streamer.send_message(data)
+        self.mailbox_event.set()
+    
+    async def receive(self) -> Optional[Any]:
+        """
+        Wait for the next message in the mailbox.
         
-        # Update state
-        self.frame_count += 1
-        self.last_frame_time = time.time()
+        Returns:
+            Optional[Any]: Oldest message in the mailbox, or None once the streamer is stopped
+        """
+        while self.is_running:
+            self.mailbox_event.clear()
+            with self.lock:
+                if self.mailbox:
+                    return self.mailbox.popleft()
+            await self.mailbox_event.wait()
+        
+        return None
     
-    def _convert_result_to_dict(self, result: DetectionResult) -> Dict[str, Any]:
+    def get_latest(self) -> Optional[Any]:
         """
-        Convert DetectionResult to a serializable dictionary.
+        Take the newest message without waiting and drop any older ones.
+        Safe to call from a thread other than the event loop thread.
+        
+        Returns:
+            Optional[Any]: Newest message, or None if the mailbox is empty
+        """
+        with self.lock:
+            if not self.mailbox:
+                return None
+            
+            data = self.mailbox.pop()
+            self.dropped_count += len(self.mailbox)
+            self.mailbox.clear()
+            return data
+    
+    def __aiter__(self) -> "AsyncZMQStreamer":
+        return self
+    
+    async def __anext__(self) -> Any:
+        data = await self.receive()
+        if data is None:
+            raise StopAsyncIteration
+        return data
+    
+    async def __aenter__(self) -> "AsyncZMQStreamer":
+        if not await self.start():
+            raise RuntimeError("Failed to start async ZMQ streamer")
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.stop()
+    
+    async def send_message(self, data: Any, topic: Optional[str] = None) -> bool:
+        """
+        Send a message through the ZMQ socket.
         
         Args:
-            result: MediaPipe detection result
+            data: Data to send
+            topic: Topic for PUB sockets, or None for the streamer topic
+        
+        Returns:
+            bool: True if successfully sent, False otherwise
+        """
+        if not self.is_running or self.socket_type not in self.SEND_SOCKET_TYPES:
+            return False
+        
+        try:
+            topic = topic if topic is not None else self.topic
+            frames = self._get_serializer(topic).dumps_parts(data)
+            if self.socket_type == "PUB":
+                frames = [topic.encode('utf-8'), *frames]
+            await self.socket.send_multipart(frames, copy=False)
+            
+            with self.lock:
+                self.message_count += 1
+                self.message_times.append(time.time() - self.start_time)
             
+            return True
+        
+        except Exception as e:
+            print(f"Error sending message: {e}")
+            return False
+    
+    def start_background(self) -> bool:
+        """
+        Run the streamer on its own event loop in a daemon thread, for callers
+        without an event loop such as Blender; read messages with get_latest().
+        
         Returns:
-            Dict[str, Any]: Serializable dictionary
+            bool: True if successfully started, False otherwise
         """
-        # Convert faces
-        faces = []
-        for face in result.faces:
-            face_dict = {
-                'landmarks': face.landmarks,
-                'visibility': face.visibility,
-                'timestamp': face.timestamp,
-      
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+        if self.thread is not None:
+            return self.is_running
+        
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        
+        if asyncio.run_coroutine_threadsafe(self.start(), self.loop).result(timeout=5.0):
+            return True
+        
+        self.stop_background()
+        return False
+    
+    def stop_background(self) -> None:
+        """Stop a streamer started with start_background() and its event loop thread."""
+        if self.thread is None:
+            return
+        
+        try:
+            asyncio.run_coroutine_threadsafe(self.stop(), self.loop).result(timeout=5.0)
+        except Exception as e:
+            print(f"Error stopping async ZMQ streamer: {e}")
+        
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=1.0)
+        self.loop.close()
+        self.loop = None
+        self.thread = None
+    
+    def get_message_rate(self) -> float:
+        """
+        Get the current message rate in messages per second.
+        
+        Returns:
+            float: Current message rate
+        """
+        with self.lock:
+            elapsed = time.time() - self.start_time
+            if elapsed <= 0:
+                return 0.0
+            return self.message_count / elapsed
+    
+    def get_recent_message_rate(self) -> float:
+        """
+        Get the message rate over the last 30 messages in messages per second.
+        Falls back to get_message_rate() until that many messages were sent or received.
+        
+        Returns:
+            float: Recent message rate
+        """
+        with self.lock:
+            if len(self.message_times) == self.message_times.maxlen:
+                window = time.time() - self.start_time - self.message_times[0]
+                if window > 0:
+                    return len(self.message_times) / window
+        return self.get_message_rate()
+    
+    def is_connected(self) -> bool:
+        """
+        Check if the ZMQ socket is open.
+        
+        Returns:
+            bool: True if connected, False otherwise
+        """
+        return self.is_running and self.socket is not None
+
+
+class SharedMemoryStreamer(DataStreamer):
+    """
+    Shared-memory data streamer for a MediaPipe process and Blender running on
+    the same host.
+    The server writes binary wire format messages into a ring of slots in a
+    named shared memory block, each protected by a seqlock, and clients poll
+    the latest sequence number instead of going through sockets.
+    """
+    
+    MAGIC = b'MPSM'
+    VERSION = 2
+    
+    # magic, version, reserved, slot count, slot size, latest sequence,
+    # generation, owner process id (0 once the server stopped)
+    CONTROL_STRUCT = struct.Struct('<4sHHIIQQI')
+    CONTROL_SIZE = 64
+    LATEST_OFFSET = 16
+    OWNER_OFFSET = 24
+    OWNER_STRUCT = struct.Struct('<QI')
+    
+    # sequence (odd while the slot is being written), message length
+    SLOT_STRUCT = struct.Struct('<QI4x')
+    
+    def __init__(
+        self,
+        mode: str = "server",
+        name: str = "mediapipe",
+        slot_count: int = 4,
+        slot_size: int = 262144,
+        poll_interval: float = 0.0001,
+        owner_check_interval: float = 0.5
+    ):
+        """
+        Initialize the shared-memory streamer with specified parameters.
+        
+        Args:
+            mode: "server" to create the ring and write messages, "client" to read them
+            name: Name of the shared memory block
+            slot_count: Number of message slots in the ring
+            slot_size: Maximum message size in bytes
+            poll_interval: Time between polls of the latest sequence number in seconds
+            owner_check_interval: Time between checks of an idle client for a stopped
+                or restarted server in seconds
+        """
+        super().__init__()
+        self.mode = mode
+        self.name = name
+        self.slot_count = slot_count
+        self.slot_size = slot_size
+        self.poll_interval = poll_interval
+        self.owner_check_interval = owner_check_interval
+        
+        # Messages use the binary wire format
+        self.serializer = get_serializer("binary")
+        
+        self.memory = None
+        self.buffer = None
+        self.sequence = 0
+        self.lock = threading.Lock()
+        
+        # Generation of the ring, a new one is drawn every time a server creates it
+        self.generation = 0
+        self.owner_check_time = 0.0
+        
+        # 64-bit view of the block; sequence numbers are read and written through it
+        # with single aligned stores, struct would copy them byte by byte
+        self.words = None
+        
+        # Performance metrics
+        self.message_count = 0
+        self.missed_count = 0
+        self.start_time = 0
+        
+        # Callbacks
+        self.message_callbacks = []
+    
+    def start(self) -> bool:
+        """
+        Start the shared-memory streamer.
+        
+        Returns:
+            bool: True if successfully started, False otherwise
+        """
+        if self.is_running:
+            return True
+        
+        try:
+            if self.mode == "server":
+                self._create()
+            else:
+                self._attach()
+            
+            self.is_running = True
+            self.start_time = time.time()
+            self.message_count = 0
+            
+            # Start thread for polling messages if needed
+            if self.mode != "server":
+                self.thread = threading.Thread(target=self._receive_loop)
+                self.thread.daemon = True
+                self.thread.start()
+            
+            return True
+        
+        except Exception as e:
+            print(f"Error starting shared-memory streamer: {e}")
+            self._cleanup()
+            return False
+    
+    def stop(self) -> None:
+        """Stop the shared-memory streamer and release resources."""
+        self.is_running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        
+        self._cleanup()
+    
+    def _slot_stride(self) -> int:
+        """Get the distance between two slots in bytes."""
+        return self.SLOT_STRUCT.size + self.slot_size
+    
+    def _slot_offset(self, sequence: int) -> int:
+        """Get the offset of the slot holding a sequence number."""
+        return self.CONTROL_SIZE + (sequence % self.slot_count) * self._slot_stride()
+    
+    def _create(self) -> None:
+        """Create and initialize the shared memory ring."""
+        # Keep slots 8-byte aligned so sequence numbers are written in one piece
+        self.slot_size = (self.slot_size + 7) & ~7
+        size = self.CONTROL_SIZE + self.slot_count * self._slot_stride()
+        
+        try:
+            self.memory = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        except FileExistsError:
+            # Reuse a block left behind by a server that exited without unlinking it,
+            # but never one a running server is still writing
+            memory = shared_memory.SharedMemory(name=self.name)
+            try:
+                self._check_reusable(memory, size)
+            except Exception:
+                self._unregister(memory)
+                memory.close()
+                raise
+            self.memory = memory
+        
+        self.buffer = self.memory.buf
+        self.buffer[:size] = bytes(size)
+        self.sequence = 0
+        self.generation = time.time_ns()
+        self.CONTROL_STRUCT.pack_into(
+            self.buffer, 0, self.MAGIC, self.VERSION, 0, self.slot_count, self.slot_size, 0,
+            self.generation, os.getpid()
+        )
+        self.words = self.buffer[:size].cast('Q')
+    
+    def _check_reusable(self, memory: shared_memory.SharedMemory, size: int) -> None:
+        """
+        Check that an existing shared memory block can be taken over by this server.
+        
+        Args:
+            memory: Existing shared memory block of the same name
+            size: Size the ring needs in bytes
+        """
+        if memory.size < self.CONTROL_SIZE or bytes(memory.buf[:4]) != self.MAGIC:
+            raise FileExistsError(f"Shared memory block {self.name} exists and is not a landmark ring")
+        
+        owner = self.CONTROL_STRUCT.unpack_from(memory.buf, 0)[7]
+        if owner and self._is_process_alive(owner):
+            raise FileExistsError(f"Shared memory block {self.name} is in use by process {owner}")
+        
+        if memory.size < size:
+            raise FileExistsError(f"Shared memory block {self.name} is smaller than {size} bytes")
+    
+    @staticmethod
+    def _is_process_alive(pid: int) -> bool:
+        """
+        Check whether a process is still running.
+        
+        Args:
+            pid: Process id
+        
+        Returns:
+            bool: True if the process is running or its state cannot be determined
+        """
+        # Windows frees a block with its last handle, so an existing one is always in use
+        if os.name == "nt":
+            return True
+        
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+    
+    @staticmethod
+    def _unregister(memory: shared_memory.SharedMemory) -> None:
+        """Stop the resource tracker from unlinking a block this process does not own."""
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(memory._name, "shared_memory")
+        except Exception:
+            pass
+    
+    def _attach(self) -> None:
+        """Attach to a shared memory ring created by a server."""
+        memory = shared_memory.SharedMemory(name=self.name)
+        
+        # Only the server may unlink the block when it stops
+        self._unregister(memory)
+        self._map(memory)
+    
+    def _map(self, memory: shared_memory.SharedMemory) -> None:
+        """
+        Map the ring of a shared memory block opened by a client.
+        
+        Args:
+            memory: Shared memory block created by a server
+        """
+        self.memory = memory
+        self.buffer = self.memory.buf
+        magic, version, _, self.slot_count, self.slot_size, self.sequence, self.generation, _ = \
+            self.CONTROL_STRUCT.unpack_from(self.buffer, 0)
+        
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Shared memory block {self.name} is not a landmark ring")
+        
+        self.words = self.buffer[:self.CONTROL_SIZE + self.slot_count * self._slot_stride()].cast('Q')
+        self.owner_check_time = time.time()
+    
+    def _check_server(self) -> None:
+        """Re-attach an idle client when its server stopped or a new server took over the ring."""
+        now = time.time()
+        if now - self.owner_check_time < self.owner_check_interval:
+            return
+        self.owner_check_time = now
+        
+        generation, owner = self.OWNER_STRUCT.unpack_from(self.buffer, self.OWNER_OFFSET)
+        if generation == self.generation and owner and self._is_process_alive(owner):
+            return
+        
+        # A restarted server either created a new block under the name, the old
+        # one was unlinked, or reused this block with a new generation
+        try:
+            memory = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return
+        self._unregister(memory)
+        
+        magic, version, _, _, _, _, generation, _ = self.CONTROL_STRUCT.unpack_from(memory.buf, 0)
+        if magic != self.MAGIC or version != self.VERSION or generation == self.generation:
+            memory.close()
+            return
+        
+        self._release()
+        self._map(memory)
+    
+    def _release(self) -> None:
+        """Release the views and the handle of the shared memory block."""
+        if self.words is not None:
+            self.words.release()
+            self.words = None
+        
+        self.buffer = None
+        self.memory.close()
+        self.memory = None
+    
+    def _cleanup(self) -> None:
+        """Release the shared memory block."""
+        if self.memory is None:
+            return
+        
+        if self.words is not None:
+            self.words.release()
+            self.words = None
+        
+        # Mark the ring as stopped, so clients look for a restarted server
+        if self.mode == "server" and self.buffer is not None:
+            self.OWNER_STRUCT.pack_into(self.buffer, self.OWNER_OFFSET, self.generation, 0)
+        
+        
+        self.buffer = None
+        try:
+            self.memory.close()
+            if self.mode == "server":
+                self.memory.unlink()
+        except Exception as e:
+            print(f"Error releasing shared memory: {e}")
+        self.memory = None
+    
+    def send_message(self, data: Any) -> bool:
+        """
+        Write a detection result into the next slot of the ring.
+        
+        Args:
+            data: DetectionResult or dictionary in the streamer result format
+        
+        Returns:
+            bool: True if successfully written, False otherwise
+        """
+        if not self.is_running or self.buffer is None or self.mode != "server":
+            return False
+        
+        try:
+            frames = [memoryview(frame).cast('B') for frame in self.serializer.dumps_parts(data)]
+            length = sum(frame.nbytes for frame in frames)
+            if length > self.slot_size:
+                print(f"Message of {length} bytes does not fit in a {self.slot_size} byte slot")
+                return False
+            
+            with self.lock:
+                sequence = self.sequence + 1
+                offset = self._slot_offset(sequence)
+                
+                # An odd sequence number marks the slot as being written
+                self.words[offset // 8] = 2 * sequence - 1
+                
+                position = offset + self.SLOT_STRUCT.size
+                for frame in frames:
+                    self.buffer[position:position + frame.nbytes] = frame
+                    position += frame.nbytes
+                
+                struct.pack_into('<I', self.buffer, offset + 8, length)
+                self.words[offset // 8] = 2 * sequence
+                self.words[self.LATEST_OFFSET // 8] = sequence
+                
+                self.sequence = sequence
+                self.message_count += 1
+            
+            return True
+        
+        except Exception as e:
+            print(f"Error writing shared-memory message: {e}")
+            return False
+    
+    def receive_latest(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the newest message if one arrived since the last read.
+        Intermediate messages are skipped, so this can be polled from a timer.
+        
+        Returns:
+            Optional[Dict[str, Any]]: Result dictionary, or None if there is no new message
+        """
+        if self.words is None:
+            return None
+        
+        for _ in range(self.slot_count):
+            latest = self.words[self.LATEST_OFFSET // 8]
+            if latest <= self.sequence:
+                if latest < self.sequence:
+                    # The server restarted and its sequence numbers start over
+                    self.sequence = latest
+                self._check_server()
+                return None
+            
+            
+            offset = self._slot_offset(latest)
+            slot_sequence = self.words[offset // 8]
+            _, length = self.SLOT_STRUCT.unpack_from(self.buffer, offset)
+            if slot_sequence != 2 * latest or length > self.slot_size:
+                continue
+            
+            start = offset + self.SLOT_STRUCT.size
+            message = bytes(self.buffer[start:start + length])
+            
+            # The copy is only valid if the slot was not rewritten meanwhile
+            if self.words[offset // 8] != slot_sequence:
+                continue
+            
+            self.missed_count += max(latest - self.sequence - 1, 0)
+            self.sequence = latest
+            
+            with self.lock:
+                self.message_count += 1
+            
+            return self.serializer.loads(message)
+        
+        return None
+    
+    def _receive_loop(self) -> None:
+        """Main polling loop that runs in a separate thread."""
+        while self.is_running:
+            try:
+                data = self.receive_latest()
+                if data is None:
+                    time.sleep(self.poll_interval)
+                    continue
+                
+                for callback in self.message_callbacks:
+                    try:
+                        callback(data)
+                    except Exception as e:
+                        print(f"Error in message callback: {e}")
+            
+            except Exception as e:
+                print(f"Error in shared-memory receive loop: {e}")
+                time.sleep(0.1)
+    
+    def add_message_callback(self, callback: Callable[[Any], Optional[Any]]) -> None:
+        """
+        Add a callback function that will be called for each received message.
+        
+        Args:
+            callback: Function that takes message data as argument
+        """
+        self.message_callbacks.append(callback)
+    
+    def remove_message_callback(self, callback: Callable[[Any], Optional[Any]]) -> None:
+        """
+        Remove a previously added callback function.
+        
+        Args:
+            callback: Function to remove
+        """
+        if callback in self.message_callbacks:
+            self.message_callbacks.remove(callback)
+    
+    def get_message_rate(self) -> float:
+        """
+        Get the current message rate in messages per second.
+        
+        Returns:
+            float: Current message rate
+        """
+        with self.lock:
+            elapsed = time.time() - self.start_time
+            if elapsed <= 0:
+                return 0.0
+            return self.message_count / elapsed
+    
+    def is_connected(self) -> bool:
+        """
+        Check if the shared memory block is attached.
+        
+        Returns:
+            bool: True if attached, False otherwise
+        """
+        return self.is_running and self.buffer is not None
+    
+    def __del__(self):
+        """Ensure resources are released when object is destroyed."""
+        self.stop()
+
+
+class ChannelMerger:
+    """
+    Reassembles results published as separate channel topics.
+    Channel messages of the same frame share its frame index, and each one only
+    fills its own channel, so the messages of a frame are merged by joining
+    their channel lists once every subscribed channel has arrived.
+    """
+    
+    def __init__(self, channel_count: int, max_lag: int = 30):
+        """
+        Initialize the channel merger.
+        
+        Args:
+            channel_count: Number of channel topics subscribed to
+            max_lag: Largest number of frames a message may lag behind the current
+                frame; larger backward steps mean the publisher restarted its frame counter
+        """
+        self.channel_count = channel_count
+        self.max_lag = max_lag
+        self.frame_index = None
+        self.frame_timestamp = 0.0
+        self.parts = []
+        
+        # Frames replaced by a newer frame before all channels arrived
+        self.incomplete_count = 0
+        
+        # Publisher restarts detected from the frame index going backwards
+        self.restart_count = 0
+    
+    def add(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Add a received channel message.
+        
+        Args:
+            data: Channel message in the streamer result format
+        
+        Returns:
+            Optional[Dict[str, Any]]: Merged result once all channels of the frame have arrived, None otherwise
+        """
+        frame_index = data['frame_index']
+        frame_timestamp = data.get('frame_timestamp', 0.0)
+        
+        if self.frame_index is not None and frame_index < self.frame_index:
+            # A large step back, or a lower index with a newer timestamp, is a restarted publisher
+            if self.frame_index - frame_index > self.max_lag or frame_timestamp > self.frame_timestamp:
+                self.restart_count += 1
+            else:
+                # Messages of older frames arrive too late to be merged
+                return None
+        
+        if frame_index != self.frame_index:
+            if self.parts:
+                self.incomplete_count += 1
+            self.frame_index = frame_index
+            self.frame_timestamp = frame_timestamp
+            self.parts = []
+        
+        self.parts.append(data)
+        if len(self.parts) < self.channel_count:
+            return None
+        
+        merged = dict(self.parts[0])
+        for key in CHANNEL_TOPICS:
+            merged[key] = [entry for part in self.parts for entry in part[key]]
+        
+        self.parts = []
+        return merged
+
+
+class MediaPipeStreamer:
+    """
+    MediaPipe data streamer.
+    Streams MediaPipe detection results to Blender.
+    """
+    
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 5556,
+        mode: str = "server",
+        socket_type: str = "PUB",
+        topic: str = "mediapipe",
+        serializer: Union[str, Any] = "pickle",
+        transport: str = "zmq",
+        processor: Optional[Any] = None,
+        channel_topics: bool = False
+    ):
+        """
+        Initialize the MediaPipe streamer with specified parameters.
+        
+        Args:
+            host: Host address
+            port: Port number
+            mode: "server" or "client"
+            socket_type: ZMQ socket type ("PUB", "PUSH", "REQ")
+            topic: Topic for PUB/SUB sockets, or shared memory block name
+            serializer: Message serializer ("pickle", "binary" or "delta") or serializer instance
+            transport: "zmq" for sockets, "shared_memory" for a same-host shared memory ring
+            processor: Source of detection results with the MediaPipeProcessor interface,
+                e.g. a ResultReplayer, or None for the global MediaPipe processor
+            channel_topics: Publish faces, hands and pose as separate messages on
+                "<topic>/face", "<topic>/hands" and "<topic>/pose" (PUB sockets only)
+        """
+        if channel_topics and (transport != "zmq" or socket_type != "PUB"):
+            raise ValueError("Channel topics require the zmq transport with a PUB socket")
+        
+        self.host = host
+        self.port = port
+        self.mode = mode
+        self.socket_type = socket_type
+        self.topic = topic
+        self.transport = transport
+        self.channel_topics = channel_topics
+        
+        # Initialize data streamer
+        if transport == "shared_memory":
+            self.streamer = SharedMemoryStreamer(mode=mode, name=topic)
+        else:
+            self.streamer = ZMQStreamer(
+                mode=mode,
+                host=host,
+                port=port,
+                socket_type=socket_type,
+                topic=topic,
+                serializer=serializer
+            )
+        
+        # Initialize MediaPipe processor
+        self.processor = processor if processor is not None else get_mediapipe_processor()
+        
+        # Processing state
+        self.is_streaming = False
+        self.frame_count = 0
+        self.last_frame_time = 0
+        
+        # Take recording
+        self.take_writer = None
+        self.recording_lock = threading.Lock()
+    
+    def start(self) -> bool:
+        """
+        Start MediaPipe processing and data streaming.
+        
+        Returns:
+            bool: True if successfully started, False otherwise
+        """
+        if self.is_streaming:
+            return True
+        
+        # Start data streamer
+        if not self.streamer.start():
+            print("Failed to start data streamer")
+            return False
+        
+        # Reset counters first, results may arrive as soon as the processor starts
+        self.frame_count = 0
+        self.last_frame_time = time.time()
+        
+        # Set result callback for MediaPipe processor
+        self.processor.set_result_callback(self._result_callback)
+        
+        # Start MediaPipe processor
+        if not self.processor.start():
+            print("Failed to start MediaPipe processor")
+            self.streamer.stop()
+            return False
+        
+        self.is_streaming = True
+        
+        return True
+    
+    def stop(self) -> None:
+        """Stop MediaPipe processing and data streaming."""
+        if not self.is_streaming:
+            return
+        
+        # Stop MediaPipe processor
+        self.processor.set_result_callback(None)
+        self.processor.stop()
+        
+        # Stop data streamer
+        self.streamer.stop()
+        
+        self.stop_recording()
+        
+        self.is_streaming = False
+    
+    def start_recording(self, path: str, chunk_size: int = 256, metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Start recording the streamed results to a take.
+        
+        Args:
+            path: Take directory
+            chunk_size: Number of frames per take chunk
+            metadata: JSON-serializable values stored in the take manifest
+        
+        Returns:
+            bool: True if recording started, False otherwise
+        """
+        try:
+            take_writer = TakeWriter(path, chunk_size, metadata)
+        except Exception as e:
+            print(f"Error starting take recording: {e}")
+            return False
+        
+        self.stop_recording()
+        with self.recording_lock:
+            self.take_writer = take_writer
+        return True
+    
+    def stop_recording(self) -> Optional[str]:
+        """
+        Stop recording and finish the take.
+        
+        Returns:
+            Optional[str]: Take directory, or None if no take was being recorded
+        """
+        with self.recording_lock:
+            take_writer = self.take_writer
+            self.take_writer = None
+            if take_writer is None:
+                return None
+            
+            take_writer.close()
+            return take_writer.path
+    
+    def _result_callback(self, result: DetectionResult) -> None:
+        """
+        Callback function for MediaPipe detection results.
+        
+        Args:
+            result: MediaPipe detection result
+        """
+        # Convert result to serializable format unless the serializer encodes results directly
+        if self.streamer.serializer.accepts_detection_results:
+            data = result
+        else:
+            data = self._convert_result_to_dict(result)
+        
+        # Send data through the data streamer, one message per channel topic if enabled
+        if self.channel_topics:
+            for channel, message in self._split_channels(data).items():
+                self.streamer.send_message(message, topic=f"{self.topic}/{CHANNEL_TOPICS[channel]}")
+        else:
+            self.streamer.send_message(data)
+        
+        # Append to the take being recorded
+        if self.take_writer is not None:
+            with self.recording_lock:
+                if self.take_writer is not None:
+                    try:
+                        self.take_writer.write(result)
+                    except Exception as e:
+                        print(f"Error recording take: {e}")
+        
+        # Update state
+        self.frame_count += 1
+        self.last_frame_time = time.time()
+    
+    def _split_channels(self, data: Union[DetectionResult, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Split a result into one message per channel.
+        Each message keeps the result format and frame header with only its own
+        channel filled, so subscribers can merge channels by frame index.
+        
+        Args:
+            data: DetectionResult or dictionary in the streamer result format
+        
+        Returns:
+            Dict[str, Any]: Message for each channel in CHANNEL_TOPICS
+        """
+        empty = {key: [] for key in CHANNEL_TOPICS}
+        
+        if isinstance(data, DetectionResult):
+            return {key: replace(data, **{**empty, key: getattr(data, key)}) for key in CHANNEL_TOPICS}
+        return {key: {**data, **empty, key: data[key]} for key in CHANNEL_TOPICS}
+    
+    def _convert_result_to_dict(self, result: DetectionResult) -> Dict[str, Any]:
+        """
+        Convert DetectionResult to a serializable dictionary.
+        Landmark arrays are converted to plain lists so receivers do not need NumPy.
+        
+        Args:
+            result: MediaPipe detection result
+        
+        Returns:
+            Dict[str, Any]: Serializable dictionary
+        """
+        # Convert faces
+        faces = []
+        for face in result.faces:
+            face_dict = {
+                'landmarks': face.landmarks.to_dicts(),
+                'visibility': face.landmarks.visibility.tolist(),
+                'timestamp': face.timestamp,
+                'detection_confidence': face.detection_confidence,
+                'tracking_id': face.tracking_id
+            }
+            
+            if face.blendshapes is not None:
+                face_dict['blendshapes'] = face.blendshapes
+            
+            faces.append(face_dict)
+        
+        # Convert hands
+        hands = []
+        for hand in result.hands:
+            hand_dict = {
+                'landmarks': hand.landmarks.to_dicts(),
+                'visibility': hand.landmarks.visibility.tolist(),
+                'timestamp': hand.timestamp,
+                'detection_confidence': hand.detection_confidence,
+                'tracking_id': hand.tracking_id,
+                'handedness': hand.handedness,
+                'hand_flag': hand.hand_flag
+            }
+            
+            if hand.world_landmarks is not None:
+                hand_dict['world_landmarks'] = hand.world_landmarks.to_dicts()
+            
+            hands.append(hand_dict)
+        
+        # Convert pose
+        pose = []
+        for p in result.pose:
+            pose_dict = {
+                'landmarks': p.landmarks.to_dicts(),
+                'visibility': p.landmarks.visibility.tolist(),
+                'timestamp': p.timestamp,
+                'detection_confidence': p.detection_confidence,
+                'tracking_id': p.tracking_id
+            }
+            
+            if p.world_landmarks is not None:
+                pose_dict['world_landmarks'] = p.world_landmarks.to_dicts()
+            
+            # Segmentation mask cannot be easily serialized, so we skip it
+            
+            pose.append(pose_dict)
+        
+        # Create result dictionary
+        return {
+            'faces': faces,
+            'hands': hands,
+            'pose': pose,
+            'frame_timestamp': result.frame_timestamp,
+            'frame_index': result.frame_index,
+            'source_dimensions': result.source_dimensions
+        }
+    
+    def get_streaming_stats(self) -> Dict[str, Any]:
+        """
+        Get streaming statistics.
+        
+        Returns:
+            Dict[str, Any]: Dictionary with streaming statistics
+        """
+        elapsed = time.time() - self.last_frame_time if self.last_frame_time > 0 else 0
+        take_writer = self.take_writer
+        
+        return {
+            'is_streaming': self.is_streaming,
+            'frame_count': self.frame_count,
+            'message_rate': self.streamer.get_message_rate(),
+            'process_fps': self.processor.get_fps(),
+            'average_process_time': self.processor.get_average_process_time(),
+            'average_latency': self.processor.get_average_latency(),
+            'performance': self.processor.get_performance_stats(),
+            'dropped_frames': self.processor.get_dropped_frames(),
+            'recorded_frames': len(take_writer) if take_writer is not None else 0,
+            'last_frame_age': elapsed
+        }
+    
+    def is_available(self) -> bool:
+        """
+        Check if all required components are available.
+        
+        Returns:
+            bool: True if all required components are available, False otherwise
+        """
+        return self.processor.is_available()
+    
+    def __del__(self):
+        """Ensure resources are released when object is destroyed."""
+        self.stop()
+
+
+# Global MediaPipe streamer instance
+mediapipe_streamer = None
+
+def get_mediapipe_streamer() -> MediaPipeStreamer:
+    """
+    Get the global MediaPipe streamer instance.
+    Creates a new instance if one doesn't exist.
+    
+    Returns:
+        MediaPipeStreamer: Global MediaPipe streamer instance
+    """
+    global mediapipe_streamer
+    if mediapipe_streamer is None:
+        mediapipe_streamer = MediaPipeStreamer()
+    return mediapipe_streamer
+
+
+if __name__ == "__main__":
+    """Test the MediaPipe streamer functionality."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Test MediaPipe streamer")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host address")
+    parser.add_argument("--port", type=int, default=5556, help="Port number")
+    parser.add_argument("--mode", type=str, default="server", choices=["server", "client"], help="Server or client mode")
+    parser.add_argument("--socket-type", type=str, default="PUB", choices=["PUB", "PUSH", "REQ"], help="ZMQ socket type")
+    parser.add_argument("--topic", type=str, default="mediapipe", help="Topic for PUB/SUB sockets")
+    parser.add_argument("--serializer", type=str, default="pickle", choices=["pickle", "binary", "delta"], help="Message serializer")
+    parser.add_argument("--transport", type=str, default="zmq", choices=["zmq", "shared_memory"], help="Data transport")
+    parser.add_argument("--broker", action="store_true", help="Publish into a stream broker at --host instead of binding")
+    parser.add_argument("--channel-topics", action="store_true", help="Publish face, hands and pose on separate topics")
+    parser.add_argument("--no-face", action="store_true", help="Disable face detection")
+    parser.add_argument("--no-hands", action="store_true", help="Disable hand detection")
+    parser.add_argument("--no-pose", action="store_true", help="Disable pose detection")
+    args = parser.parse_args()
+    
+    # Configure MediaPipe processor
+    processor = get_mediapipe_processor()
+    processor.enable_face = not args.no_face
+    processor.enable_hands = not args.no_hands
+    processor.enable_pose = not args.no_pose
+    
+    # A broker takes the subscribers, so connect to its frontend as a client
+    if args.broker:
+        args.mode, args.socket_type, args.port = "client", "PUB", BROKER_FRONTEND_PORT
+    
+    # Create and start MediaPipe streamer
+    streamer = MediaPipeStreamer(
+        host=args.host,
+        port=args.port,
+        mode=args.mode,
+        socket_type=args.socket_type,
+        topic=args.topic,
+        serializer=args.serializer,
+        transport=args.transport,
+        channel_topics=args.channel_topics
+    )
+    
+    if not streamer.start():
+        print("Failed to start MediaPipe streamer")
+        exit(1)
+    
+    try:
+        print("Press ESC to exit")
+        print(f"Streaming MediaPipe data to {args.host}:{args.port}")
+        
+        while True:
+            # Get the current frame
+            frame, timestamp = processor.capture.get_frame()
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            
+            # Draw landmarks on the frame
+            annotated_frame = processor.draw_landmarks(frame)
+            
+            # Display streaming stats
+            stats = streamer.get_streaming_stats()
+            cv2.putText(annotated_frame, f"FPS: {stats['process_fps']:.1f}", (10, 30), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            cv2.putText(annotated_frame, f"Msg Rate: {stats['message_rate']:.1f}/s", (10, 70), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            cv2.putText(annotated_frame, f"Frames: {stats['frame_count']}", (10, 110), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            
+            # Display the frame
+            cv2.imshow("MediaPipe Streamer Test", annotated_frame)
+            
+            key = cv2.waitKey(1) & 0xFF
+            if key == 27:  # ESC key
+                break
+    
+    finally:
+        streamer.stop()
+        cv2.destroyAllWindows()
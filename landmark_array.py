@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Landmark array module for MediaPipe to Blender live animation add-on.
+This module provides a compact NumPy-backed landmark container shared by the
+MediaPipe module and the Blender add-on.
+"""
+
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Union
+
+
+class LandmarkArray:
+    """
+    Compact landmark storage backed by a contiguous float32 (N, 4) array
+    holding x, y, z and visibility per landmark.
+    Indexing and iteration return landmark dictionaries, so code written
+    against the list-of-dicts format keeps working.
+    """
+    
+    FIELDS = ('x', 'y', 'z', 'visibility')
+    
+    __slots__ = ('data',)
+    
+    def __init__(self, data: np.ndarray):
+        """
+        Initialize the landmark array.
+        
+        Args:
+            data: Array of shape (N, 4) with x, y, z and visibility columns
+        """
+        data = np.ascontiguousarray(data, dtype=np.float32)
+        if data.ndim != 2 or data.shape[1] != 4:
+            raise ValueError(f"Landmark data must have shape (N, 4), got {data.shape}")
+        self.data = data
+    
+    @classmethod
+    def empty(cls, count: int) -> "LandmarkArray":
+        """
+        Create an uninitialized landmark array.
+        
+        Args:
+            count: Number of landmarks
+        
+        Returns:
+            LandmarkArray: New landmark array
+        """
+        return cls(np.empty((count, 4), dtype=np.float32))
+    
+    @classmethod
+    def from_dicts(cls, landmarks: List[Dict[str, float]]) -> "LandmarkArray":
+        """
+        Create a landmark array from a list of landmark dictionaries.
+        Missing visibility values default to 1.0.
+        
+        Args:
+            landmarks: List of landmarks with x, y, z and optional visibility
+        
+        Returns:
+            LandmarkArray: New landmark array
+        """
+        data = np.empty((len(landmarks), 4), dtype=np.float32)
+        for i, lm in enumerate(landmarks):
+            data[i] = (lm['x'], lm['y'], lm['z'], lm.get('visibility', 1.0))
+        return cls(data)
+    
+    @property
+    def x(self) -> np.ndarray:
+        """View of the x coordinates."""
+        return self.data[:, 0]
+    
+    @property
+    def y(self) -> np.ndarray:
+        """View of the y coordinates."""
+        return self.data[:, 1]
+    
+    @property
+    def z(self) -> np.ndarray:
+        """View of the z coordinates."""
+        return self.data[:, 2]
+    
+    @property
+    def visibility(self) -> np.ndarray:
+        """View of the visibility scores."""
+        return self.data[:, 3]
+    
+    @property
+    def xyz(self) -> np.ndarray:
+        """View of the (N, 3) coordinates."""
+        return self.data[:, :3]
+    
+    def to_dicts(self) -> List[Dict[str, float]]:
+        """
+        Convert the landmarks to a list of dictionaries.
+        
+        Returns:
+            List[Dict[str, float]]: Landmarks with x, y, z and visibility
+        """
+        fields = self.FIELDS
+        return [dict(zip(fields, row)) for row in self.data.tolist()]
+    
+    def copy(self) -> "LandmarkArray":
+        """
+        Create a copy that does not share memory with this array.
+        
+        Returns:
+            LandmarkArray: Copied landmark array
+        """
+        return LandmarkArray(self.data.copy())
+    
+    def __len__(self) -> int:
+        return self.data.shape[0]
+    
+    def __getitem__(self, index: Union[int, slice]) -> Union[Dict[str, float], "LandmarkArray"]:
+        if isinstance(index, slice):
+            return LandmarkArray(self.data[index])
+        return dict(zip(self.FIELDS, self.data[index].tolist()))
+    
+    def __iter__(self) -> Iterator[Dict[str, float]]:
+        return iter(self.to_dicts())
+    
+    def __repr__(self) -> str:
+        return f"LandmarkArray({len(self)} landmarks)"
+
+
+def as_landmark_array(landmarks: Optional[Union[LandmarkArray, List[Dict[str, float]]]]) -> Optional[LandmarkArray]:
+    """
+    Convert landmarks in either supported format to a LandmarkArray.
+    
+    Args:
+        landmarks: LandmarkArray, list of landmark dictionaries or None
+    
+    Returns:
+        Optional[LandmarkArray]: Landmark array or None
+    """
+    if landmarks is None or isinstance(landmarks, LandmarkArray):
+        return landmarks
+    return LandmarkArray.from_dicts(landmarks)
@@ -6,24 +6,162 @@ This module handles detection of face, hand, and body landmarks using MediaPipe.
 
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 import numpy as np
 import time
+from collections import deque
+from itertools import chain
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple, Optional, Any, Union, Callable
 from dataclasses import dataclass, field
 
 # Import video capture module
-from .video_capture import VideoCapture, get_video_manager
+from .video_capture import VideoCapture, FrameRing, FrameRef, get_video_manager
+
+# Import processing pipeline module
+from .processing_pipeline import StageQueue, PipelineStage
+
+# Import landmark array module
+from .landmark_array import LandmarkArray, as_landmark_array
+
+# Import ring buffer module
+from .ring_buffer import get_window_stats
 
 
 @dataclass
 class LandmarkData:
     """Data class for storing landmark information."""
-    landmarks: List[Dict[str, float]]  # List of landmarks with x, y, z coordinates
-    world_landmarks: Optional[List[Dict[str, float]]] = None  # 3D world landmarks if available
-    visibility: Optional[List[float]] = None  # Visibility scores for landmarks
+    landmarks: LandmarkArray  # Landmarks with x, y, z coordinates and visibility
+    world_landmarks: Optional[LandmarkArray] = None  # 3D world landmarks if available
+    visibility: Optional[np.ndarray] = None  # Visibility scores for landmarks (view of landmarks)
     timestamp: float = 0.0  # Timestamp in milliseconds
     detection_confidence: float = 0.0  # Confidence score for the detection
     tracking_id: Optional[int] = None  # Tracking ID for the detection
+    
+    def __post_init__(self):
+        """Accept landmark dictionaries and share visibility with the landmark array."""
+        self.landmarks = as_landmark_array(self.landmarks)
+        self.world_landmarks = as_landmark_array(self.world_landmarks)
+        if self.visibility is None:
+            self.visibility = self.landmarks.visibility
+
+
+# Wire tags of the float fields of a serialized (Normalized)Landmark and the
+# LandmarkArray column each one is stored in
+_LANDMARK_FIELD_COLUMNS = {0x0D: 0, 0x15: 1, 0x1D: 2, 0x25: 3}
+_LANDMARK_LIST_TAG = 0x0A
+_LANDMARK_FIELD_SIZE = 5  # One tag byte followed by a little-endian float32
+
+# Record dtypes for the landmark layouts seen so far, keyed by record header
+_landmark_record_dtypes: Dict[bytes, Tuple[np.dtype, List[int]]] = {}
+
+_get_landmark_values = attrgetter('x', 'y', 'z', 'visibility')
+
+
+def _get_landmark_record_dtype(header: bytes) -> Optional[Tuple[np.dtype, List[int]]]:
+    """
+    Get the structured dtype describing one serialized landmark record.
+    
+    Args:
+        header: Record bytes up to and including the first field tag, followed by the remaining field tags
+    
+    Returns:
+        Optional[Tuple[np.dtype, List[int]]]: Record dtype and the column of each of its fields,
+            or None if the record is not a list entry made of float fields
+    """
+    record_dtype = _landmark_record_dtypes.get(header)
+    if record_dtype is not None:
+        return record_dtype
+    
+    payload_size = header[1]
+    tags = header[2:]
+    if header[0] != _LANDMARK_LIST_TAG or payload_size != len(tags) * _LANDMARK_FIELD_SIZE:
+        return None
+    
+    names, offsets, columns = [], [], []
+    for index, tag in enumerate(tags):
+        column = _LANDMARK_FIELD_COLUMNS.get(tag)
+        if column is not None:
+            names.append(LandmarkArray.FIELDS[column])
+            offsets.append(3 + index * _LANDMARK_FIELD_SIZE)
+            columns.append(column)
+    
+    dtype = np.dtype({
+        'names': names,
+        'formats': ['<f4'] * len(names),
+        'offsets': offsets,
+        'itemsize': payload_size + 2
+    })
+    record_dtype = _landmark_record_dtypes[header] = (dtype, columns)
+    return record_dtype
+
+
+def _parse_serialized_landmarks(raw: bytes, count: int) -> Optional[np.ndarray]:
+    """
+    Decode a serialized landmark list directly with NumPy.
+    This only handles the layout MediaPipe produces, where every landmark sets
+    the same fields, so all records have the same size and field order.
+    
+    Args:
+        raw: Serialized landmark list
+        count: Number of landmarks in the list
+    
+    Returns:
+        Optional[np.ndarray]: Array of shape (count, 4), or None if the layout is not uniform
+    """
+    stride = len(raw) // count
+    if stride * count != len(raw) or stride < 2 or stride > 129:
+        return None
+    
+    header = raw[:2] + raw[2:stride:_LANDMARK_FIELD_SIZE]
+    record_dtype = _get_landmark_record_dtype(header)
+    if record_dtype is None:
+        return None
+    
+    # Every record must start with the same tag, size and field tags
+    for offset in (0, 1, *range(2, stride, _LANDMARK_FIELD_SIZE)):
+        if raw[offset::stride] != raw[offset:offset + 1] * count:
+            return None
+    
+    dtype, columns = record_dtype
+    records = np.frombuffer(raw, dtype=dtype)
+    
+    # Fields that are not set keep the protobuf default of 0.0
+    data = np.zeros((count, 4), dtype=np.float32)
+    for name, column in zip(dtype.names, columns):
+        data[:, column] = records[name]
+    
+    return data
+
+
+def landmarks_to_array(landmark_list: Any, with_visibility: bool = True) -> LandmarkArray:
+    """
+    Convert a MediaPipe landmark list to a LandmarkArray.
+    The list is serialized once and decoded in bulk; lists with an irregular
+    layout fall back to reading the landmark attributes in a single pass.
+    
+    Args:
+        landmark_list: MediaPipe NormalizedLandmarkList or LandmarkList
+        with_visibility: Whether to copy visibility scores (1.0 is used otherwise)
+    
+    Returns:
+        LandmarkArray: Converted landmarks
+    """
+    landmarks = landmark_list.landmark
+    count = len(landmarks)
+    
+    data = None
+    if count > 0:
+        data = _parse_serialized_landmarks(landmark_list.SerializeToString(), count)
+    if data is None:
+        values = chain.from_iterable(map(_get_landmark_values, landmarks))
+        data = np.fromiter(values, dtype=np.float32, count=4 * count).reshape(count, 4)
+    
+    if not with_visibility:
+        data[:, 3] = 1.0
+    
+    return LandmarkArray(data)
 
 
 @dataclass
@@ -76,8 +214,7 @@ class MediaPipeDetector:
         self.is_initialized = False
         
         # Performance metrics
-        self.process_times = []
-        self.max_process_times = 30  # Keep track of last 30 processing times
+        self.process_times = deque(maxlen=30)  # Keep track of last 30 processing times
         
         # Drawing utilities
         self.mp_drawing = mp.solutions.drawing_utils
@@ -94,17 +231,35 @@ class MediaPipeDetector:
     
     def process_frame(self, frame: np.ndarray, timestamp_ms: float) -> Any:
         """
-        Process a frame with the detector.
-        Must be implemented by subclasses.
+        Process a BGR frame with the detector.
+        Converts the frame to RGB and passes it to process_image().
         
         Args:
-            frame: Input frame as numpy array
+            frame: Input frame as numpy array (BGR)
             timestamp_ms: Timestamp of the frame in milliseconds
-            
+        
         Returns:
             Any: Detection results
         """
-        raise NotImplementedError("Subclasses must implement process_frame()")
+        # Convert the image to RGB, read-only so MediaPipe can use it without copying
+        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image_rgb.flags.writeable = False
+        
+        return self.process_image(image_rgb, timestamp_ms)
+    
+    def process_image(self, image_rgb: np.ndarray, timestamp_ms: float) -> Any:
+        """
+        Process an RGB image with the detector.
+        Must be implemented by subclasses.
+        
+        Args:
+            image_rgb: Input image as numpy array (RGB)
+            timestamp_ms: Timestamp of the image in milliseconds
+        
+        Returns:
+            Any: Detection results
+        """
+        raise NotImplementedError("Subclasses must implement process_image()")
     
     def draw_landmarks(self, frame: np.ndarray, results: Any) -> np.ndarray:
         """
@@ -114,7 +269,7 @@ class MediaPipeDetector:
         Args:
             frame: Input frame as numpy array
             results: Detection results from process_frame()
-            
+        
         Returns:
             np.ndarray: Frame with landmarks drawn
         """
@@ -194,14 +349,14 @@ class FaceDetector(MediaPipeDetector):
             print(f"Error initializing face detector: {e}")
             return False
     
-    def process_frame(self, frame: np.ndarray, timestamp_ms: float) -> List[FaceData]:
+    def process_image(self, image_rgb: np.ndarray, timestamp_ms: float) -> List[FaceData]:
         """
-        Process a frame with the face detector.
+        Process an RGB image with the face detector.
         
         Args:
-            frame: Input frame as numpy array
-            timestamp_ms: Timestamp of the frame in milliseconds
-            
+            image_rgb: Input image as numpy array (RGB)
+            timestamp_ms: Timestamp of the image in milliseconds
+        
         Returns:
             List[FaceData]: List of detected faces with landmarks
         """
@@ -209,9 +364,6 @@ class FaceDetector(MediaPipeDetector):
             if not self.initialize():
                 return []
         
-        # Convert the image to RGB
-        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
         # Process the frame
         start_time = time.time()
         results = self.detector.process(image_rgb)
@@ -219,31 +371,18 @@ class FaceDetector(MediaPipeDetector):
         
         # Update process times
         self.process_times.append(process_time)
-        if len(self.process_times) > self.max_process_times:
-            self.process_times.pop(0)
         
         # Extract face landmarks
         face_data_list = []
         
         if results.multi_face_landmarks:
             for i, face_landmarks in enumerate(results.multi_face_landmarks):
-                # Convert landmarks to a list of dictionaries
-                landmarks = []
-                for landmark in face_landmarks.landmark:
-                    landmarks.append({
-                        'x': landmark.x,
-                        'y': landmark.y,
-                        'z': landmark.z,
-                        'visibility': getattr(landmark, 'visibility', 1.0)
-                    })
-                
-                # Extract visibility scores
-                visibility = [lm.get('visibility', 1.0) for lm in landmarks]
+                # Convert landmarks to an array
+                landmarks = landmarks_to_array(face_landmarks)
                 
                 # Create face data
                 face_data = FaceData(
                     landmarks=landmarks,
-                    visibility=visibility,
                     timestamp=timestamp_ms,
                     detection_confidence=1.0,  # Face mesh doesn't provide confidence scores
                     tracking_id=i
@@ -271,7 +410,7 @@ class FaceDetector(MediaPipeDetector):
         Args:
             frame: Input frame as numpy array
             results: List of FaceData objects
-            
+        
         Returns:
             np.ndarray: Frame with landmarks drawn
         """
@@ -315,24 +454,19 @@ class FaceDetector(MediaPipeDetector):
         
         return annotated_frame
     
-    def _convert_to_landmark_proto(self, landmarks: List[Dict[str, float]]) -> Any:
+    def _convert_to_landmark_proto(self, landmarks: LandmarkArray) -> Any:
         """
         Convert landmarks from our format to MediaPipe's format.
         
         Args:
-            landmarks: List of landmark dictionaries
-            
+            landmarks: Landmark array
+        
         Returns:
             Any: MediaPipe landmark protocol buffer
         """
-        landmark_list = mp.framework.formats.landmark_pb2.NormalizedLandmarkList()
-        for lm in landmarks:
-            landmark = landmark_list.landmark.add()
-            landmark.x = lm['x']
-            landmark.y = lm['y']
-            landmark.z = lm['z']
-            if 'visibility' in lm:
-                landmark.visibility = lm['visibility']
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, visibility in landmarks.data.tolist():
+            landmark_list.landmark.add(x=x, y=y, z=z, visibility=visibility)
         
         return landmark_list
 
@@ -388,14 +522,14 @@ class HandDetector(MediaPipeDetector):
             print(f"Error initializing hand detector: {e}")
             return False
     
-    def process_frame(self, frame: np.ndarray, timestamp_ms: float) -> List[HandData]:
+    def process_image(self, image_rgb: np.ndarray, timestamp_ms: float) -> List[HandData]:
         """
-        Process a frame with the hand detector.
+        Process an RGB image with the hand detector.
         
         Args:
-            frame: Input frame as numpy array
-            timestamp_ms: Timestamp of the frame in milliseconds
-            
+            image_rgb: Input image as numpy array (RGB)
+            timestamp_ms: Timestamp of the image in milliseconds
+        
         Returns:
             List[HandData]: List of detected hands with landmarks
         """
@@ -403,9 +537,6 @@ class HandDetector(MediaPipeDetector):
             if not self.initialize():
                 return []
         
-        # Convert the image to RGB
-        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
         # Process the frame
         start_time = time.time()
         results = self.detector.process(image_rgb)
@@ -413,22 +544,980 @@ class HandDetector(MediaPipeDetector):
         
         # Update process times
         self.process_times.append(process_time)
-        if len(self.process_times) > self.max_process_times:
-            self.process_times.pop(0)
         
         # Extract hand landmarks
         hand_data_list = []
         
         if results.multi_hand_landmarks and results.multi_handedness:
             for i, (hand_landmarks, handedness) in enumerate(zip(results.multi_hand_landmarks, results.multi_handedness)):
-                # Convert landmarks to a list of dictionaries
-                landmarks = []
-                for landmark in hand_landmarks.landmark:
-                    landmarks.append({
-                        'x': landmark.x,
-                        'y': landmark.y,
-                        'z': landmark.z
-                    })
+                # Convert landmarks to an array, hand landmarks carry no visibility
+                landmarks = landmarks_to_array(hand_landmarks, with_visibility=False)
+                
+                # Get handedness
+                handedness_label = handedness.classification[0].label
+                handedness_score = handedness.classification[0].score
+                hand_flag = 1 if handedness_label == "Right" else 0
+                
+                # Create hand data
+                hand_data = HandData(
+                    landmarks=landmarks,
+                    timestamp=timestamp_ms,
+                    detection_confidence=handedness_score,
+                    tracking_id=i,
+                    handedness=handedness_label,
+                    hand_flag=hand_flag
+                )
+                
+                # Add world landmarks if available
+                if hasattr(results, 'multi_hand_world_landmarks') and results.multi_hand_world_landmarks:
+                    if i < len(results.multi_hand_world_landmarks):
+                        hand_data.world_landmarks = landmarks_to_array(
+                            results.multi_hand_world_landmarks[i], with_visibility=False)
+                
+                hand_data_list.append(hand_data)
+        
+        return hand_data_list
+    
+    def draw_landmarks(self, frame: np.ndarray, results: List[HandData]) -> np.ndarray:
+        """
+        Draw hand landmarks on the frame.
+        
+        Args:
+            frame: Input frame as numpy array
+            results: List of HandData objects
+        
+        Returns:
+            np.ndarray: Frame with landmarks drawn
+        """
+        if not results:
+            return frame
+        
+        # Create a copy of the frame
+        annotated_frame = frame.copy()
+        
+        for hand_data in results:
+            # Convert landmarks to MediaPipe format
+            hand_landmarks_proto = self._convert_to_landmark_proto(hand_data.landmarks)
+            
+            # Draw the hand landmarks
+            self.mp_drawing.draw_landmarks(
+                image=annotated_frame,
+                landmark_list=hand_landmarks_proto,
+                connections=self.mp_hands.HAND_CONNECTIONS,
+                landmark_drawing_spec=self.mp_drawing_styles.get_default_hand_landmarks_style(),
+                connection_drawing_spec=self.mp_drawing_styles.get_default_hand_connections_style()
+            )
+            
+            # Add handedness label
+            height, width, _ = annotated_frame.shape
+            x_min = hand_data.landmarks.x.min() * width
+            y_min = hand_data.landmarks.y.min() * height
+            cv2.putText(
+                annotated_frame,
+                f"{hand_data.handedness} ({hand_data.detection_confidence:.2f})",
+                (int(x_min), int(y_min - 10)),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                (0, 255, 0),
+                1,
+                cv2.LINE_AA
+            )
+        
+        return annotated_frame
+    
+    def _convert_to_landmark_proto(self, landmarks: LandmarkArray) -> Any:
+        """
+        Convert landmarks from our format to MediaPipe's format.
+        
+        Args:
+            landmarks: Landmark array
+        
+        Returns:
+            Any: MediaPipe landmark protocol buffer
+        """
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in landmarks.xyz.tolist():
+            landmark_list.landmark.add(x=x, y=y, z=z)
+        
+        return landmark_list
+
+
+class PoseDetector(MediaPipeDetector):
+    """
+    MediaPipe pose landmark detector.
+    Detects body pose landmarks.
+    """
+    
+    def __init__(
+        self, 
+        min_detection_confidence: float = 0.5, 
+        min_tracking_confidence: float = 0.5,
+        model_complexity: int = 1,
+        enable_segmentation: bool = False
+    ):
+        """
+        Initialize the pose detector with specified parameters.
+        
+        Args:
+            min_detection_confidence: Minimum confidence for detection to be considered successful
+            min_tracking_confidence: Minimum confidence for tracking to be considered successful
+            model_complexity: Model complexity (0, 1, or 2)
+            enable_segmentation: Whether to enable segmentation
+        """
+        super().__init__(min_detection_confidence, min_tracking_confidence)
+        self.model_complexity = model_complexity
+        self.enable_segmentation = enable_segmentation
+        
+        # MediaPipe pose solution
+        self.mp_pose = mp.solutions.pose
+        self.mp_drawing_styles = mp.solutions.drawing_styles
+    
+    def initialize(self) -> bool:
+        """
+        Initialize the pose detector.
+        
+        Returns:
+            bool: True if initialization was successful, False otherwise
+        """
+        try:
+            self.detector = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=self.model_complexity,
+                enable_segmentation=self.enable_segmentation,
+                min_detection_confidence=self.min_detection_confidence,
+                min_tracking_confidence=self.min_tracking_confidence
+            )
+            self.is_initialized = True
+            return True
+        except Exception as e:
+            print(f"Error initializing pose detector: {e}")
+            return False
+    
+    def process_image(self, image_rgb: np.ndarray, timestamp_ms: float) -> List[PoseData]:
+        """
+        Process an RGB image with the pose detector.
+        
+        Args:
+            image_rgb: Input image as numpy array (RGB)
+            timestamp_ms: Timestamp of the image in milliseconds
+        
+        Returns:
+            List[PoseData]: List of detected poses with landmarks
+        """
+        if not self.is_initialized:
+            if not self.initialize():
+                return []
+        
+        # Process the frame
+        start_time = time.time()
+        results = self.detector.process(image_rgb)
+        process_time = (time.time() - start_time) * 1000  # Convert to ms
+        
+        # Update process times
+        self.process_times.append(process_time)
+        
+        # Extract pose landmarks
+        pose_data_list = []
+        
+        if results.pose_landmarks:
+            # Convert landmarks to an array
+            landmarks = landmarks_to_array(results.pose_landmarks)
+            
+            # Create pose data
+            pose_data = PoseData(
+                landmarks=landmarks,
+                timestamp=timestamp_ms,
+                detection_confidence=1.0,  # Pose doesn't provide overall confidence scores
+                tracking_id=0
+            )
+            
+            # Add world landmarks if available
+            if results.pose_world_landmarks:
+                pose_data.world_landmarks = landmarks_to_array(results.pose_world_landmarks)
+            
+            # Add segmentation mask if enabled
+            if self.enable_segmentation and results.segmentation_mask is not None:
+                pose_data.segmentation_mask = results.segmentation_mask
+            
+            pose_data_list.append(pose_data)
+        
+        return pose_data_list
+    
+    def draw_landmarks(self, frame: np.ndarray, results: List[PoseData]) -> np.ndarray:
+        """
+        Draw pose landmarks on the frame.
+        
+        Args:
+            frame: Input frame as numpy array
+            results: List of PoseData objects
+        
+        Returns:
+            np.ndarray: Frame with landmarks drawn
+        """
+        if not results:
+            return frame
+        
+        # Create a copy of the frame
+        annotated_frame = frame.copy()
+        
+        for pose_data in results:
+            # Convert landmarks to MediaPipe format
+            pose_landmarks_proto = self._convert_to_landmark_proto(pose_data.landmarks)
+            
+            # Draw the pose landmarks
+            self.mp_drawing.draw_landmarks(
+                image=annotated_frame,
+                landmark_list=pose_landmarks_proto,
+                connections=self.mp_pose.POSE_CONNECTIONS,
+                landmark_drawing_spec=self.mp_drawing_styles.get_default_pose_landmarks_style()
+            )
+            
+            # Draw segmentation mask if available
+            if self.enable_segmentation and pose_data.segmentation_mask is not None:
+                segmentation_mask = pose_data.segmentation_mask
+                
+                # Create a colored mask
+                bg_image = np.zeros(annotated_frame.shape, dtype=np.uint8)
+                bg_image[:] = (192, 192, 192)  # Light gray background
                 
-              
-(Content truncated due to size limit. Use line ranges to read in chunks)
\ No newline at end of file
+                condition = np.stack((segmentation_mask,) * 3, axis=-1) > 0.1
+                annotated_frame = np.where(condition, annotated_frame, bg_image)
+        
+        return annotated_frame
+    
+    def _convert_to_landmark_proto(self, landmarks: LandmarkArray) -> Any:
+        """
+        Convert landmarks from our format to MediaPipe's format.
+        
+        Args:
+            landmarks: Landmark array
+        
+        Returns:
+            Any: MediaPipe landmark protocol buffer
+        """
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z, visibility in landmarks.data.tolist():
+            landmark_list.landmark.add(x=x, y=y, z=z, visibility=visibility)
+        
+        return landmark_list
+
+
+class FramePreprocessor:
+    """
+    Prepares captured frames for the MediaPipe detectors.
+    Crops, resizes and converts each BGR frame to RGB once into reusable,
+    read-only buffers so that every detector shares the same image.
+    """
+    
+    def __init__(
+        self,
+        input_size: Optional[Tuple[int, int]] = None,
+        crop_region: Optional[Tuple[int, int, int, int]] = None,
+        num_buffers: int = 4
+    ):
+        """
+        Initialize the frame preprocessor with specified parameters.
+        
+        Args:
+            input_size: (width, height) to resize frames to, or None to keep the frame size
+            crop_region: (x, y, width, height) region of the frame to keep, or None for the full frame
+            num_buffers: Number of reusable RGB buffers (at least 2)
+        """
+        self.input_size = input_size
+        self.crop_region = crop_region
+        
+        # RGB images are handed out as borrowed, read-only views of these buffers
+        self.ring = FrameRing(num_buffers)
+        self.resize_buffer = None
+        
+        # Frames dropped because every buffer was still in use
+        self.dropped_frames = 0
+    
+    def get_source_dimensions(self, frame: np.ndarray) -> Tuple[int, int]:
+        """
+        Get the dimensions of the region landmarks are normalized to.
+        
+        Args:
+            frame: Input frame as numpy array
+        
+        Returns:
+            Tuple[int, int]: (width, height) of the crop region or of the frame
+        """
+        if self.crop_region is not None:
+            return self.crop_region[2], self.crop_region[3]
+        return frame.shape[1], frame.shape[0]
+    
+    def process(self, frame: np.ndarray, timestamp_ms: float) -> Optional[FrameRef]:
+        """
+        Convert a BGR frame into a shared RGB image.
+        
+        Args:
+            frame: Input frame as numpy array (BGR)
+            timestamp_ms: Timestamp of the frame in milliseconds
+        
+        Returns:
+            Optional[FrameRef]: Borrowed read-only RGB image, or None if every buffer is in use.
+                The reference must be released once all detectors are done with it.
+        """
+        # Crop by slicing, which does not copy
+        if self.crop_region is not None:
+            x, y, width, height = self.crop_region
+            frame = frame[y:y + height, x:x + width]
+        
+        # Size the buffers on the first frame or when the output size changes
+        if self.input_size is not None:
+            shape = (self.input_size[1], self.input_size[0], 3)
+        else:
+            shape = (frame.shape[0], frame.shape[1], 3)
+        
+        if not self.ring.is_allocated() or self.ring.buffers[0].shape != shape:
+            self.ring.allocate(shape, np.uint8)
+            self.resize_buffer = None
+        
+        slot = self.ring.acquire_slot()
+        if slot is None:
+            self.dropped_frames += 1
+            return None
+        
+        buffer = self.ring.buffer(slot)
+        
+        # Resize first so the colour conversion runs on the smaller image
+        if self.input_size is not None and frame.shape[:2] != shape[:2]:
+            if self.resize_buffer is None:
+                self.resize_buffer = np.empty(shape, dtype=np.uint8)
+            frame = cv2.resize(frame, self.input_size, dst=self.resize_buffer, interpolation=cv2.INTER_AREA)
+        
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=buffer)
+        
+        self.ring.publish(slot, timestamp_ms)
+        return self.ring.borrow()
+
+
+class MediaPipeProcessor:
+    """
+    Main processor class that combines all MediaPipe detectors.
+    Handles video capture and processing with all detectors.
+    """
+    
+    def __init__(
+        self,
+        enable_face: bool = True,
+        enable_hands: bool = True,
+        enable_pose: bool = True,
+        camera_index: int = 0,
+        width: int = 640,
+        height: int = 480,
+        fps: int = 30,
+        pipelined: bool = False,
+        queue_size: int = 1,
+        drop_policy: str = "latest",
+        parallel_detectors: bool = False,
+        input_size: Optional[Tuple[int, int]] = None,
+        crop_region: Optional[Tuple[int, int, int, int]] = None
+    ):
+        """
+        Initialize the MediaPipe processor with specified parameters.
+        
+        Args:
+            enable_face: Whether to enable face detection
+            enable_hands: Whether to enable hand detection
+            enable_pose: Whether to enable pose detection
+            camera_index: Index of the camera to use
+            width: Desired frame width
+            height: Desired frame height
+            fps: Desired frames per second
+            pipelined: Whether to run inference and publishing on their own threads
+                instead of inside the capture callback
+            queue_size: Capacity of the queues between pipeline stages
+            drop_policy: Pipeline queue policy when full ("latest" drops stale items,
+                "block" makes the previous stage wait)
+            parallel_detectors: Whether to run the face, hand and pose detectors
+                concurrently on a thread pool
+            input_size: (width, height) frames are resized to before detection, or None
+            crop_region: (x, y, width, height) region of the frame to run detection on, or None
+        """
+        self.enable_face = enable_face
+        self.enable_hands = enable_hands
+        self.enable_pose = enable_pose
+        
+        # Pipeline settings
+        self.pipelined = pipelined
+        self.queue_size = queue_size
+        self.drop_policy = drop_policy
+        self.frame_queue = None
+        self.image_queue = None
+        self.result_queue = None
+        self.stages = []
+        
+        # Frame callback registered with the video capture while processing
+        self.frame_callback = None
+        
+        # Shared colour conversion; enough buffers for one image being written,
+        # queue_size queued images and one in inference
+        self.preprocessor = FramePreprocessor(input_size, crop_region, num_buffers=queue_size + 3)
+        
+        # Detector thread pool, MediaPipe releases the GIL while a graph runs
+        self.parallel_detectors = parallel_detectors
+        self.executor = None
+        
+        # Initialize video capture
+        self.video_manager = get_video_manager()
+        self.capture = self.video_manager.get_capture(camera_index)
+        self.capture.width = width
+        self.capture.height = height
+        self.capture.fps = fps
+        
+        # Initialize detectors
+        self.face_detector = FaceDetector() if enable_face else None
+        self.hand_detector = HandDetector() if enable_hands else None
+        self.pose_detector = PoseDetector() if enable_pose else None
+        
+        # Processing state
+        self.is_processing = False
+        self.frame_count = 0
+        self.last_result = None
+        self.result_callback = None
+        
+        # Performance metrics
+        self.start_time = 0
+        self.process_times = deque(maxlen=30)
+        self.latency_times = deque(maxlen=30)  # Capture-to-publish latency in milliseconds
+    
+    def start(self) -> bool:
+        """
+        Start video capture and processing.
+        
+        Returns:
+            bool: True if successfully started, False otherwise
+        """
+        if self.is_processing:
+            return True
+        
+        # Initialize detectors
+        if self.enable_face and self.face_detector:
+            self.face_detector.initialize()
+        
+        if self.enable_hands and self.hand_detector:
+            self.hand_detector.initialize()
+        
+        if self.enable_pose and self.pose_detector:
+            self.pose_detector.initialize()
+        
+        # Start detector thread pool
+        if self.parallel_detectors:
+            self.executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="detector")
+        
+        # Start pipeline stages before frames start arriving
+        if self.pipelined:
+            self._start_pipeline()
+        
+        self.start_time = time.time()
+        self.frame_count = 0
+        
+        # Add frame callback before capture starts, so a video file loses no frames.
+        # Keep it, the processing mode may be reconfigured before stop()
+        self.frame_callback = self._get_frame_callback()
+        self.capture.add_frame_callback(self.frame_callback)
+        
+        # Start video capture
+        if not self.capture.start():
+            print("Failed to start video capture")
+            self._remove_frame_callback()
+            self._stop_pipeline()
+            self._stop_executor()
+            return False
+        
+        self.is_processing = True
+        
+        return True
+    
+    def stop(self) -> None:
+        """Stop video capture and processing."""
+        if not self.is_processing:
+            return
+        
+        # Remove frame callback
+        self._remove_frame_callback()
+        
+        # Stop video capture
+        self.capture.stop()
+        
+        # Stop pipeline stages and release any queued frames
+        self._stop_pipeline()
+        
+        # Stop detector thread pool
+        self._stop_executor()
+        
+        # Close detectors
+        if self.face_detector:
+            self.face_detector.close()
+        
+        if self.hand_detector:
+            self.hand_detector.close()
+        
+        if self.pose_detector:
+            self.pose_detector.close()
+        
+        self.is_processing = False
+    
+    def _get_frame_callback(self) -> Callable[[np.ndarray, float], None]:
+        """
+        Get the frame callback matching the processing mode.
+        
+        Returns:
+            Callable: Frame callback registered with the video capture
+        """
+        return self._enqueue_frame_callback if self.pipelined else self._process_frame_callback
+    
+    def _remove_frame_callback(self) -> None:
+        """Remove the frame callback registered by start() from the video capture."""
+        if self.frame_callback is not None:
+            self.capture.remove_frame_callback(self.frame_callback)
+            self.frame_callback = None
+    
+    def _start_pipeline(self) -> None:
+        """Create the stage queues and start the preprocess, inference and publish stages."""
+        # Capture -> preprocess: queued frames are borrowed from the capture ring
+        # and must be released when they are dropped
+        self.frame_queue = StageQueue(self.queue_size, self.drop_policy, on_drop=FrameRef.release)
+        
+        # Preprocess -> inference: queued images are borrowed from the preprocessor
+        self.image_queue = StageQueue(self.queue_size, self.drop_policy, on_drop=lambda item: item[0].release())
+        
+        # Inference -> publish
+        self.result_queue = StageQueue(self.queue_size, self.drop_policy)
+        
+        self.stages = [
+            PipelineStage("preprocess", self._preprocess_stage, self.frame_queue, self.image_queue),
+            PipelineStage("inference", self._inference_stage, self.image_queue, self.result_queue),
+            PipelineStage("publish", self._publish_stage, self.result_queue)
+        ]
+        
+        for stage in self.stages:
+            stage.start()
+    
+    def _stop_pipeline(self) -> None:
+        """Stop the pipeline stages and release queued frames."""
+        for stage in self.stages:
+            stage.stop()
+        self.stages = []
+        
+        if self.frame_queue is not None:
+            self.frame_queue.clear()
+            self.frame_queue = None
+        
+        if self.image_queue is not None:
+            self.image_queue.clear()
+            self.image_queue = None
+        
+        if self.result_queue is not None:
+            self.result_queue.clear()
+            self.result_queue = None
+    
+    def _stop_executor(self) -> None:
+        """Shut down the detector thread pool."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+    
+    def _enqueue_frame_callback(self, frame: np.ndarray, timestamp_ms: float) -> None:
+        """
+        Hand a captured frame to the inference stage without blocking capture.
+        
+        Args:
+            frame: Input frame as numpy array
+            timestamp_ms: Timestamp of the frame in milliseconds
+        """
+        frame_queue = self.frame_queue
+        if frame_queue is None:
+            return
+        
+        # Borrow the frame so its ring slot stays untouched while it is queued
+        frame_ref = self.capture.borrow_frame()
+        if frame_ref is None:
+            return
+        
+        if frame_queue.drop_policy == "block":
+            frame_queue.put(frame_ref, timeout=1.0)
+        else:
+            frame_queue.put(frame_ref)
+    
+    def _preprocess_stage(self, frame_ref: FrameRef) -> Optional[Tuple[FrameRef, Tuple[int, int]]]:
+        """
+        Pipeline stage that converts a borrowed frame into the shared RGB image.
+        The capture slot is released as soon as the conversion is done.
+        
+        Args:
+            frame_ref: Borrowed reference to the captured frame
+        
+        Returns:
+            Optional[Tuple]: Borrowed RGB image and source dimensions, or None if dropped
+        """
+        with frame_ref:
+            image_ref = self.preprocessor.process(frame_ref.frame, frame_ref.timestamp)
+            if image_ref is None:
+                return None
+            return image_ref, self.preprocessor.get_source_dimensions(frame_ref.frame)
+    
+    def _inference_stage(self, item: Tuple[FrameRef, Tuple[int, int]]) -> Optional[DetectionResult]:
+        """
+        Pipeline stage that runs all enabled detectors on a preprocessed image.
+        
+        Args:
+            item: Borrowed RGB image and source dimensions
+        
+        Returns:
+            Optional[DetectionResult]: Detection result for the frame
+        """
+        image_ref, source_dimensions = item
+        with image_ref:
+            return self._detect(image_ref.frame, image_ref.timestamp, source_dimensions)
+    
+    def _publish_stage(self, result: DetectionResult) -> None:
+        """
+        Pipeline stage that delivers detection results to the result callback.
+        
+        Args:
+            result: Detection result to publish
+        """
+        self._publish_result(result)
+    
+    def _process_frame_callback(self, frame: np.ndarray, timestamp_ms: float) -> None:
+        """
+        Process a frame with all enabled detectors.
+        
+        Args:
+            frame: Input frame as numpy array
+            timestamp_ms: Timestamp of the frame in milliseconds
+        """
+        start_time = time.time()
+        
+        # Convert once for all detectors
+        image_ref = self.preprocessor.process(frame, timestamp_ms)
+        if image_ref is None:
+            return
+        
+        with image_ref:
+            result = self._detect(image_ref.frame, timestamp_ms,
+                                  self.preprocessor.get_source_dimensions(frame), start_time)
+        
+        self._publish_result(result)
+    
+    def _detect(
+        self,
+        image_rgb: np.ndarray,
+        timestamp_ms: float,
+        source_dimensions: Tuple[int, int],
+        start_time: Optional[float] = None
+    ) -> DetectionResult:
+        """
+        Run all enabled detectors on a preprocessed image.
+        
+        Args:
+            image_rgb: Preprocessed image as read-only numpy array (RGB)
+            timestamp_ms: Timestamp of the frame in milliseconds
+            source_dimensions: (width, height) of the region landmarks are normalized to
+            start_time: Time processing of the frame started, or None for now
+        
+        Returns:
+            DetectionResult: Combined detection result
+        """
+        if start_time is None:
+            start_time = time.time()
+        
+        # Process with each detector
+        face_results, hand_results, pose_results = self._run_detectors(image_rgb, timestamp_ms)
+        
+        # Create detection result
+        result = DetectionResult(
+            faces=face_results,
+            hands=hand_results,
+            pose=pose_results,
+            frame_timestamp=timestamp_ms,
+            frame_index=self.frame_count,
+            source_dimensions=source_dimensions
+        )
+        
+        # Update state
+        self.last_result = result
+        self.frame_count += 1
+        
+        # Calculate process time
+        process_time = (time.time() - start_time) * 1000  # Convert to ms
+        self.process_times.append(process_time)
+        
+        return result
+    
+    def _run_detectors(
+        self,
+        image_rgb: np.ndarray,
+        timestamp_ms: float
+    ) -> Tuple[List[FaceData], List[HandData], List[PoseData]]:
+        """
+        Run all enabled detectors on an RGB image, concurrently if a thread pool is active.
+        
+        Args:
+            image_rgb: Preprocessed image as read-only numpy array (RGB)
+            timestamp_ms: Timestamp of the frame in milliseconds
+        
+        Returns:
+            Tuple containing the face, hand and pose results
+        """
+        detectors = []
+        if self.enable_face and self.face_detector:
+            detectors.append(('faces', self.face_detector))
+        
+        if self.enable_hands and self.hand_detector:
+            detectors.append(('hands', self.hand_detector))
+        
+        if self.enable_pose and self.pose_detector:
+            detectors.append(('pose', self.pose_detector))
+        
+        executor = self.executor
+        if executor is not None and len(detectors) > 1:
+            # Dispatch every detector and join, so latency is that of the slowest model
+            futures = [(key, executor.submit(detector.process_image, image_rgb, timestamp_ms))
+                       for key, detector in detectors]
+            results = {key: future.result() for key, future in futures}
+        else:
+            results = {key: detector.process_image(image_rgb, timestamp_ms) for key, detector in detectors}
+        
+        return results.get('faces', []), results.get('hands', []), results.get('pose', [])
+    
+    def _publish_result(self, result: DetectionResult) -> None:
+        """
+        Deliver a detection result to the result callback.
+        
+        Args:
+            result: Detection result to deliver
+        """
+        # Call result callback if set
+        if self.result_callback:
+            try:
+                self.result_callback(result)
+            except Exception as e:
+                print(f"Error in result callback: {e}")
+        
+        # Track end-to-end latency from capture to publish; file sources
+        # timestamp frames with their position in the video instead
+        if self.capture.is_live:
+            latency = time.time() * 1000 - result.frame_timestamp
+            self.latency_times.append(latency)
+    
+    def get_last_result(self) -> Optional[DetectionResult]:
+        """
+        Get the last detection result.
+        
+        Returns:
+            Optional[DetectionResult]: Last detection result or None if not available
+        """
+        return self.last_result
+    
+    def set_result_callback(self, callback: Callable[[DetectionResult], None]) -> None:
+        """
+        Set a callback function that will be called for each detection result.
+        
+        Args:
+            callback: Function that takes a DetectionResult as argument
+        """
+        self.result_callback = callback
+    
+    def draw_landmarks(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Draw all landmarks on the frame.
+        
+        Args:
+            frame: Input frame as numpy array
+        
+        Returns:
+            np.ndarray: Frame with landmarks drawn
+        """
+        if self.last_result is None:
+            return frame
+        
+        # Create a copy of the frame
+        annotated_frame = frame.copy()
+        
+        # Draw face landmarks
+        if self.enable_face and self.face_detector and self.last_result.faces:
+            annotated_frame = self.face_detector.draw_landmarks(annotated_frame, self.last_result.faces)
+        
+        # Draw hand landmarks
+        if self.enable_hands and self.hand_detector and self.last_result.hands:
+            annotated_frame = self.hand_detector.draw_landmarks(annotated_frame, self.last_result.hands)
+        
+        # Draw pose landmarks
+        if self.enable_pose and self.pose_detector and self.last_result.pose:
+            annotated_frame = self.pose_detector.draw_landmarks(annotated_frame, self.last_result.pose)
+        
+        return annotated_frame
+    
+    def get_average_process_time(self) -> float:
+        """
+        Get the average processing time in milliseconds.
+        
+        Returns:
+            float: Average processing time in milliseconds
+        """
+        if not self.process_times:
+            return 0.0
+        return sum(self.process_times) / len(self.process_times)
+    
+    def get_average_latency(self) -> float:
+        """
+        Get the average capture-to-publish latency in milliseconds.
+        
+        Returns:
+            float: Average latency in milliseconds
+        """
+        if not self.latency_times:
+            return 0.0
+        return sum(self.latency_times) / len(self.latency_times)
+    
+    def get_performance_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get statistics of the recent processing times and latencies.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Count, mean, min, max and percentiles in milliseconds
+                for 'process_time' and 'latency'
+        """
+        return {
+            'process_time': get_window_stats(self.process_times),
+            'latency': get_window_stats(self.latency_times)
+        }
+    
+    def get_dropped_frames(self) -> int:
+        """
+        Get the number of frames dropped by the pipeline queues and the capture ring.
+        
+        Returns:
+            int: Number of dropped frames
+        """
+        dropped = self.capture.frame_ring.dropped_frames + self.preprocessor.dropped_frames
+        if self.frame_queue is not None:
+            dropped += self.frame_queue.dropped_count
+        if self.image_queue is not None:
+            dropped += self.image_queue.dropped_count
+        if self.result_queue is not None:
+            dropped += self.result_queue.dropped_count
+        return dropped
+    
+    def get_fps(self) -> float:
+        """
+        Get the current processing FPS.
+        
+        Returns:
+            float: Current processing FPS
+        """
+        if not self.process_times:
+            return 0.0
+        avg_process_time = self.get_average_process_time()
+        if avg_process_time <= 0:
+            return 0.0
+        return 1000.0 / avg_process_time
+    
+    def is_available(self) -> bool:
+        """
+        Check if all required components are available.
+        
+        Returns:
+            bool: True if all required components are available, False otherwise
+        """
+        # Check camera availability
+        camera_available = self.capture.is_available()
+        
+        # Check detector availability
+        face_available = not self.enable_face or (self.face_detector and self.face_detector.is_initialized)
+        hands_available = not self.enable_hands or (self.hand_detector and self.hand_detector.is_initialized)
+        pose_available = not self.enable_pose or (self.pose_detector and self.pose_detector.is_initialized)
+        
+        return camera_available and face_available and hands_available and pose_available
+    
+    def __del__(self):
+        """Ensure resources are released when object is destroyed."""
+        self.stop()
+
+
+# Global MediaPipe processor instance
+mediapipe_processor = None
+
+def get_mediapipe_processor() -> MediaPipeProcessor:
+    """
+    Get the global MediaPipe processor instance.
+    Creates a new instance if one doesn't exist.
+    
+    Returns:
+        MediaPipeProcessor: Global MediaPipe processor instance
+    """
+    global mediapipe_processor
+    if mediapipe_processor is None:
+        mediapipe_processor = MediaPipeProcessor()
+    return mediapipe_processor
+
+
+if __name__ == "__main__":
+    """Test the MediaPipe processor functionality."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Test MediaPipe processor")
+    parser.add_argument("--camera", type=int, default=0, help="Camera index")
+    parser.add_argument("--width", type=int, default=640, help="Frame width")
+    parser.add_argument("--height", type=int, default=480, help="Frame height")
+    parser.add_argument("--fps", type=int, default=30, help="Target FPS")
+    parser.add_argument("--no-face", action="store_true", help="Disable face detection")
+    parser.add_argument("--no-hands", action="store_true", help="Disable hand detection")
+    parser.add_argument("--no-pose", action="store_true", help="Disable pose detection")
+    parser.add_argument("--pipelined", action="store_true", help="Run inference and publishing on separate threads")
+    parser.add_argument("--drop-policy", type=str, default="latest", choices=["latest", "block"], help="Pipeline queue policy")
+    parser.add_argument("--parallel-detectors", action="store_true", help="Run detectors concurrently on a thread pool")
+    args = parser.parse_args()
+    
+    # Create and start MediaPipe processor
+    processor = MediaPipeProcessor(
+        enable_face=not args.no_face,
+        enable_hands=not args.no_hands,
+        enable_pose=not args.no_pose,
+        camera_index=args.camera,
+        width=args.width,
+        height=args.height,
+        fps=args.fps,
+        pipelined=args.pipelined,
+        drop_policy=args.drop_policy,
+        parallel_detectors=args.parallel_detectors
+    )
+    
+    if not processor.start():
+        print("Failed to start MediaPipe processor")
+        exit(1)
+    
+    try:
+        print("Press ESC to exit")
+        while True:
+            # Get the current frame
+            frame, timestamp = processor.capture.get_frame()
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            
+            # Draw landmarks on the frame
+            annotated_frame = processor.draw_landmarks(frame)
+            
+            # Display performance metrics
+            fps = processor.get_fps()
+            avg_process_time = processor.get_average_process_time()
+            cv2.putText(annotated_frame, f"FPS: {fps:.1f}", (10, 30), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            cv2.putText(annotated_frame, f"Process time: {avg_process_time:.1f} ms", (10, 70), 
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            
+            # Display the frame
+            cv2.imshow("MediaPipe Processor Test", annotated_frame)
+            
+            key = cv2.waitKey(1) & 0xFF
+            if key == 27:  # ESC key
+                break
+    
+    finally:
+        processor.stop()
+        cv2.destroyAllWindows()
@@ -0,0 +1,143 @@
+"""
+MediaPipe Motion Capture - Mapping Plan Module
+This module compiles bone mappings into cached, array-based plans for the Blender add-on.
+"""
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+from typing import Dict, List, Tuple, Optional, Any, Union
+
+# Import bone groups module
+from .bone_groups import get_landmark_source, get_influence_group
+
+class MappingPlan:
+    """
+    Compiled form of a bone mapping for one armature.
+    Holds the pose bone rows of the mapped bones, their landmark sources,
+    influence groups and rest-pose matrices, so per-frame code such as the
+    pose recorder needs no bone name lookups.
+    """
+    
+    def __init__(self, armature, bone_mapping):
+        """
+        Compile the mapping plan.
+        
+        Args:
+            armature: Blender armature object
+            bone_mapping: Bone mapping dictionary (bone name to landmark indices)
+        """
+        self.armature_name = armature.name
+        self.bone_mapping = {name: landmarks[:] for name, landmarks in bone_mapping.items()}
+        self.is_stale = False
+        
+        pose_bones = armature.pose.bones
+        self.pose_bone_count = len(pose_bones)
+        
+        # Rest matrices of all bones in armature space, read in bulk (stored column-major)
+        bones = armature.data.bones
+        rest_matrices = np.empty(len(bones) * 16, dtype=np.float32)
+        bones.foreach_get('matrix_local', rest_matrices)
+        rest_matrices = rest_matrices.reshape(-1, 4, 4).transpose(0, 2, 1).astype(np.float64)
+        
+        # Per-bone data of the mapped bones the armature has
+        rows = {pose_bone.name: i for i, pose_bone in enumerate(pose_bones)}
+        bone_rows = {bone.name: i for i, bone in enumerate(bones)}
+        self.bone_names = [name for name in self.bone_mapping if name in rows]
+        self.pose_bone_rows = np.array([rows[name] for name in self.bone_names], dtype=np.int64)
+        self.sources = [get_landmark_source(name) for name in self.bone_names]
+        self.influence_groups = [get_influence_group(name) for name in self.bone_names]
+        self.rest_matrices = rest_matrices[[bone_rows[name] for name in self.bone_names]].reshape(-1, 4, 4)
+    
+    def __len__(self):
+        return len(self.bone_names)
+    
+    def is_valid(self, armature, bone_mapping):
+        """
+        Check if the plan still matches an armature and bone mapping.
+        
+        Args:
+            armature: Blender armature object
+            bone_mapping: Bone mapping dictionary
+        
+        Returns:
+            bool: True if the plan can be used, False if it must be recompiled
+        """
+        return (
+            not self.is_stale
+            and armature.name == self.armature_name
+            and len(armature.pose.bones) == self.pose_bone_count
+            and bone_mapping == self.bone_mapping
+        )
+
+# Compiled plans keyed by armature object and data name; objects sharing
+# armature data can use different bone mappings
+mapping_plans = {}
+
+def get_mapping_plan(armature, bone_mapping):
+    """
+    Get the mapping plan for an armature, compiling it if there is no valid cached plan.
+    
+    Args:
+        armature: Blender armature object
+        bone_mapping: Bone mapping dictionary
+    
+    Returns:
+        MappingPlan: Mapping plan for the armature
+    """
+    register()
+    
+    key = (armature.name_full, armature.data.name_full)
+    plan = mapping_plans.get(key)
+    if plan is None or not plan.is_valid(armature, bone_mapping):
+        plan = MappingPlan(armature, bone_mapping)
+        mapping_plans[key] = plan
+    return plan
+
+def invalidate_mapping_plans(armature_data=None):
+    """
+    Invalidate cached mapping plans.
+    
+    Args:
+        armature_data: Blender armature data whose plans are invalidated (None for all)
+    """
+    if armature_data is None:
+        keys = list(mapping_plans)
+    else:
+        keys = [key for key in mapping_plans if key[1] == armature_data.name_full]
+    
+    for key in keys:
+        plan = mapping_plans.pop(key, None)
+        if plan is not None:
+            plan.is_stale = True
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    """Invalidate the plans of armatures whose bones were edited."""
+    if not mapping_plans:
+        return
+    
+    # Posing only updates the object; bone edits update the armature data
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Armature):
+            invalidate_mapping_plans(update.id)
+
+@persistent
+def on_load_post(*args):
+    """Drop all plans when a file is loaded."""
+    invalidate_mapping_plans()
+
+def register():
+    """Register the handlers that keep the plan cache up to date."""
+    if on_depsgraph_update not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(on_depsgraph_update)
+    if on_load_post not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(on_load_post)
+
+def unregister():
+    """Unregister the plan cache handlers and drop all plans."""
+    if on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(on_depsgraph_update)
+    if on_load_post in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(on_load_post)
+    invalidate_mapping_plans()
@@ -0,0 +1,230 @@
+"""
+MediaPipe Motion Capture - Pose Take Module
+This module stores recorded bone channels in NumPy arrays and reduces their
+keyframes for the Blender add-on.
+It does not depend on Blender, so takes can be built and checked outside it.
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple, Optional, Any, Union
+
+# Number of channels of every recorded pose bone property
+CHANNEL_COUNTS = {
+    'location': 3,
+    'rotation_quaternion': 4,
+    'rotation_axis_angle': 4,
+    'rotation_euler': 3
+}
+
+def get_rotation_property(rotation_mode):
+    """
+    Get the rotation property keyed for a bone's rotation mode.
+    
+    Args:
+        rotation_mode: Pose bone rotation mode ('QUATERNION', 'AXIS_ANGLE' or an Euler order)
+    
+    Returns:
+        str: Property name
+    """
+    if rotation_mode == 'QUATERNION':
+        return 'rotation_quaternion'
+    if rotation_mode == 'AXIS_ANGLE':
+        return 'rotation_axis_angle'
+    return 'rotation_euler'
+
+class PoseTake:
+    """
+    Recorded keyframe channels of one take.
+    Every bone records its location and the rotation property of its rotation
+    mode, the channels keyframing a posed bone keys. Frames are stored as rows
+    of growing NumPy arrays with one column per channel.
+    """
+    
+    def __init__(self, bone_names, pose_bone_rows, rotation_modes, capacity=1024):
+        """
+        Initialize the pose take.
+        
+        Args:
+            bone_names: Names of the recorded bones
+            pose_bone_rows: Index of every recorded bone in armature.pose.bones
+            rotation_modes: Rotation mode of every recorded bone
+            capacity: Number of frames allocated up front
+        """
+        self.bone_names = list(bone_names)
+        self.rotation_modes = list(rotation_modes)
+        
+        # One (bone, property, array index) entry per column
+        self.channels = []
+        self.bone_columns = []
+        for b, rotation_mode in enumerate(self.rotation_modes):
+            self.bone_columns.append(len(self.channels))
+            for name in ('location', get_rotation_property(rotation_mode)):
+                self.channels.extend((b, name, index) for index in range(CHANNEL_COUNTS[name]))
+        
+        # Columns, pose bone rows and components of every recorded property
+        pose_bone_rows = np.asarray(pose_bone_rows, dtype=np.int64)
+        self.properties = {}
+        for column, (b, name, index) in enumerate(self.channels):
+            columns, rows, components = self.properties.setdefault(name, ([], [], []))
+            columns.append(column)
+            rows.append(pose_bone_rows[b])
+            components.append(index)
+        self.properties = {
+            name: tuple(np.array(part, dtype=np.int64) for part in parts)
+            for name, parts in self.properties.items()
+        }
+        
+        # First column of every quaternion, whose sign is made continuous
+        self.quaternion_columns = np.array(
+            [column for column, (_, name, index) in enumerate(self.channels)
+             if name == 'rotation_quaternion' and index == 0],
+            dtype=np.int64
+        )
+        
+        self.frames = np.zeros(capacity)
+        self.values = np.zeros((capacity, len(self.channels)), dtype=np.float32)
+        self.count = 0
+    
+    def __len__(self):
+        return self.count
+    
+    def record(self, frame, pose_values):
+        """
+        Record the channels of one frame.
+        
+        Args:
+            frame: Frame number (may be fractional)
+            pose_values: Property name to array of shape (pose bone count, channels) with the
+                current values of all pose bones, for every property in self.properties
+        """
+        if self.count == len(self.frames):
+            self.frames = np.concatenate((self.frames, np.zeros_like(self.frames)))
+            self.values = np.concatenate((self.values, np.zeros_like(self.values)))
+        
+        row = self.values[self.count]
+        for name, (columns, rows, components) in self.properties.items():
+            row[columns] = pose_values[name][rows, components]
+        
+        self.frames[self.count] = frame
+        self.count += 1
+    
+    def get_take(self):
+        """
+        Get the recorded take.
+        
+        Returns:
+            Tuple[numpy.ndarray, numpy.ndarray]: Frames of shape (F,) and values of shape
+                (F, channels) with quaternion signs made continuous over time
+        """
+        frames = self.frames[:self.count].copy()
+        values = self.values[:self.count].copy()
+        
+        # q and -q are the same rotation, but interpolating between them spins the bone
+        if len(values) > 1 and len(self.quaternion_columns) > 0:
+            columns = self.quaternion_columns[:, None] + np.arange(4)
+            quaternions = values[:, columns]
+            dots = np.einsum('fbi,fbi->fb', quaternions[1:], quaternions[:-1])
+            signs = np.cumprod(np.where(dots < 0, -1.0, 1.0), axis=0)
+            quaternions[1:] *= signs[:, :, None].astype(np.float32)
+            values[:, columns] = quaternions
+        
+        return frames, values
+
+def simplify_curve(frames, values, tolerance, keep=None):
+    """
+    Select the keys of a sampled curve needed to stay within a tolerance
+    (Ramer-Douglas-Peucker). Every pass splits all segments that are still
+    out of tolerance at once, at their worst key, so the work is a few array
+    operations per level of the split tree instead of one call per segment.
+    
+    Args:
+        frames: Array of shape (F,) with increasing frame numbers
+        values: Array of shape (F,) or (F, C); channels are simplified together
+        tolerance: Maximum absolute difference from the linearly interpolated keys
+        keep: Boolean array of shape (F,) with keys that must be kept, which splits the
+            curve into independent pieces (None to keep only the first and last key)
+    
+    Returns:
+        numpy.ndarray: Boolean array of shape (F,) marking the kept keys
+    """
+    frames = np.asarray(frames, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64).reshape(len(frames), -1)
+    count = len(frames)
+    
+    keep = np.zeros(count, dtype=bool) if keep is None else np.array(keep, dtype=bool)
+    keep[[0, -1]] = True
+    if count <= 2:
+        return keep
+    
+    # Segments between kept keys that have not been checked yet
+    keys = np.flatnonzero(keep)
+    starts = keys[:-1]
+    ends = keys[1:]
+    
+    while len(starts) > 0:
+        lengths = ends - starts - 1
+        inner = lengths > 0
+        starts, ends, lengths = starts[inner], ends[inner], lengths[inner]
+        if len(starts) == 0:
+            break
+        
+        # Interior keys of all open segments, grouped by segment
+        offsets = np.cumsum(lengths) - lengths
+        segment = np.repeat(np.arange(len(starts)), lengths)
+        points = np.arange(lengths.sum()) - offsets[segment] + starts[segment] + 1
+        start = starts[segment]
+        end = ends[segment]
+        
+        t = ((frames[points] - frames[start]) / (frames[end] - frames[start]))[:, None]
+        interpolated = values[start] + (values[end] - values[start]) * t
+        error = np.abs(values[points] - interpolated).max(axis=1)
+        
+        # Split every segment that is out of tolerance at its first worst key
+        worst_error = np.maximum.reduceat(error, offsets)
+        candidates = np.flatnonzero(error == worst_error[segment])
+        worst = points[candidates[np.diff(segment[candidates], prepend=-1) != 0]]
+        
+        split = worst_error > tolerance
+        worst = worst[split]
+        keep[worst] = True
+        starts = np.concatenate((starts[split], worst))
+        ends = np.concatenate((worst, ends[split]))
+    
+    return keep
+
+def reduce_keyframes(frames, values, bone_columns, tolerance):
+    """
+    Select the keyframes of every recorded bone needed to stay within a tolerance.
+    All channels of a bone keep the same keys.
+    
+    Args:
+        frames: Array of shape (F,) with frame numbers
+        values: Array of shape (F, channels) with the recorded channels
+        bone_columns: First column of every bone's channels
+        tolerance: Maximum channel error
+    
+    Returns:
+        numpy.ndarray: Boolean array of shape (F, bones) marking the kept keys
+    """
+    count = len(frames)
+    bones = len(bone_columns)
+    if count <= 2:
+        return np.ones((count, bones), dtype=bool)
+    
+    # Bones with fewer channels are padded with zeros, which add no error
+    ends = list(bone_columns[1:]) + [values.shape[1]]
+    width = max(end - start for start, end in zip(bone_columns, ends))
+    curves = np.zeros((bones, count, width))
+    for b, (start, end) in enumerate(zip(bone_columns, ends)):
+        curves[b, :, :end - start] = values[:, start:end]
+    
+    # Simplify all bones as one curve, with the ends of every bone's curve kept
+    boundaries = np.zeros((bones, count), dtype=bool)
+    boundaries[:, [0, -1]] = True
+    keep = simplify_curve(
+        np.tile(frames, bones),
+        curves.reshape(-1, width),
+        tolerance,
+        boundaries.ravel()
+    )
+    return keep.reshape(bones, count).T
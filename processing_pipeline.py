@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Processing pipeline module for MediaPipe to Blender live animation add-on.
+This module provides bounded queues and worker stages used to decouple capture,
+inference and publishing so that a slow stage never throttles the camera.
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+
+
+class StageQueue:
+    """
+    Bounded queue connecting two pipeline stages.
+    When full, the "latest" drop policy discards the oldest item so the consumer
+    always works on the most recent data, while the "block" policy makes the
+    producer wait for space.
+    """
+    
+    DROP_POLICIES = ("latest", "block")
+    
+    def __init__(
+        self,
+        maxsize: int = 1,
+        drop_policy: str = "latest",
+        on_drop: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        Initialize the stage queue.
+        
+        Args:
+            maxsize: Maximum number of queued items (at least 1)
+            drop_policy: "latest" to drop the oldest item when full, "block" to wait for space
+            on_drop: Function called with every item that is dropped or cleared
+        """
+        if maxsize < 1:
+            raise ValueError("StageQueue maxsize must be at least 1")
+        if drop_policy not in self.DROP_POLICIES:
+            raise ValueError(f"Unsupported drop policy: {drop_policy}")
+        
+        self.maxsize = maxsize
+        self.drop_policy = drop_policy
+        self.on_drop = on_drop
+        
+        self.items = deque()
+        self.condition = threading.Condition()
+        
+        # Statistics
+        self.put_count = 0
+        self.dropped_count = 0
+    
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Add an item to the queue.
+        
+        Args:
+            item: Item to add
+            timeout: Maximum time to wait for space with the "block" policy (None waits forever)
+        
+        Returns:
+            bool: True if the item was queued, False if it was dropped
+        """
+        dropped = None
+        
+        with self.condition:
+            if len(self.items) >= self.maxsize:
+                if self.drop_policy == "latest":
+                    dropped = self.items.popleft()
+                    self.dropped_count += 1
+                elif not self.condition.wait_for(lambda: len(self.items) < self.maxsize, timeout):
+                    self.dropped_count += 1
+                    dropped = item
+                    item = None
+            
+            if item is not None:
+                self.items.append(item)
+                self.put_count += 1
+                self.condition.notify_all()
+        
+        # Drop callbacks run outside the lock so they may release resources freely
+        if dropped is not None:
+            self._drop(dropped)
+        
+        return item is not None
+    
+    def get(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Remove and return the oldest item.
+        
+        Args:
+            timeout: Maximum time to wait for an item (None waits forever)
+        
+        Returns:
+            Optional[Any]: Oldest item or None if the timeout expired
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: len(self.items) > 0, timeout):
+                return None
+            
+            item = self.items.popleft()
+            self.condition.notify_all()
+            return item
+    
+    def clear(self) -> None:
+        """Remove all queued items, passing each one to the drop callback."""
+        with self.condition:
+            items = list(self.items)
+            self.items.clear()
+            self.condition.notify_all()
+        
+        for item in items:
+            self._drop(item)
+    
+    def _drop(self, item: Any) -> None:
+        """
+        Pass a dropped item to the drop callback.
+        
+        Args:
+            item: Dropped item
+        """
+        if self.on_drop is not None:
+            try:
+                self.on_drop(item)
+            except Exception as e:
+                print(f"Error in drop callback: {e}")
+    
+    def __len__(self) -> int:
+        with self.condition:
+            return len(self.items)
+
+
+class PipelineStage:
+    """
+    Worker thread that takes items from an input queue, processes them and
+    forwards non-None results to an optional output queue.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        input_queue: StageQueue,
+        output_queue: Optional[StageQueue] = None
+    ):
+        """
+        Initialize the pipeline stage.
+        
+        Args:
+            name: Stage name used for the thread and error messages
+            func: Function applied to every item
+            input_queue: Queue the stage consumes from
+            output_queue: Queue results are forwarded to, or None for a final stage
+        """
+        self.name = name
+        self.func = func
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        
+        self.is_running = False
+        self.thread = None
+        
+        # Performance metrics
+        self.item_count = 0
+        self.process_times = deque(maxlen=30)
+    
+    def start(self) -> None:
+        """Start the stage worker thread."""
+        if self.is_running:
+            return
+        
+        self.is_running = True
+        self.item_count = 0
+        self.thread = threading.Thread(target=self._run, name=f"pipeline-{self.name}")
+        self.thread.daemon = True
+        self.thread.start()
+    
+    def stop(self) -> None:
+        """Stop the stage worker thread."""
+        self.is_running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+    
+    def _run(self) -> None:
+        """Main loop that runs in a separate thread."""
+        while self.is_running:
+            item = self.input_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            
+            start_time = time.time()
+            try:
+                result = self.func(item)
+            except Exception as e:
+                print(f"Error in {self.name} stage: {e}")
+                continue
+            
+            # Update process times
+            self.item_count += 1
+            self.process_times.append((time.time() - start_time) * 1000)
+            
+            if result is not None and self.output_queue is not None:
+                self.output_queue.put(result, timeout=0.1)
+    
+    def get_average_process_time(self) -> float:
+        """
+        Get the average processing time in milliseconds.
+        
+        Returns:
+            float: Average processing time in milliseconds
+        """
+        if not self.process_times:
+            return 0.0
+        return sum(self.process_times) / len(self.process_times)
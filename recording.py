@@ -0,0 +1,127 @@
+"""
+MediaPipe Motion Capture - Recording Module
+This module records bone channels in memory and bakes them into F-curves for the Blender add-on.
+"""
+
+import bpy
+import numpy as np
+from typing import Dict, List, Tuple, Optional, Any, Union
+
+# Import pose take module
+from .pose_take import PoseTake, CHANNEL_COUNTS
+
+class PoseRecorder(PoseTake):
+    """
+    In-memory recording of the keyframe channels of one take.
+    Recording a frame costs one foreach_get per recorded property and no
+    keyframe insertion; the channels are stored by PoseTake.
+    """
+    
+    def __init__(self, armature, bone_names, pose_bone_rows, capacity=1024):
+        """
+        Initialize the pose recorder.
+        
+        Args:
+            armature: Blender armature object whose bone rotation modes select the channels
+            bone_names: Names of the recorded bones
+            pose_bone_rows: Index of every recorded bone in armature.pose.bones
+            capacity: Number of frames allocated up front
+        """
+        pose_bones = armature.pose.bones
+        rotation_modes = [pose_bones[name].rotation_mode for name in bone_names]
+        super().__init__(bone_names, pose_bone_rows, rotation_modes, capacity)
+        self.pose_values = {}
+    
+    def record_pose(self, frame, armature):
+        """
+        Record the current pose channels of an armature.
+        
+        Args:
+            frame: Frame number (may be fractional)
+            armature: Blender armature object
+        """
+        pose_bones = armature.pose.bones
+        for name in self.properties:
+            size = len(pose_bones) * CHANNEL_COUNTS[name]
+            values = self.pose_values.get(name)
+            if values is None or len(values) != size:
+                values = self.pose_values[name] = np.empty(size, dtype=np.float32)
+            pose_bones.foreach_get(name, values)
+        
+        self.record(frame, {
+            name: values.reshape(-1, CHANNEL_COUNTS[name]) for name, values in self.pose_values.items()
+        })
+
+def write_keys(fcurve, frames, values, frame_range):
+    """
+    Write keys into an F-curve, replacing its keys in the recorded frame range.
+    Keyframe points are allocated with keyframe_points.add() and filled with
+    a single foreach_set('co', ...) instead of one keyframe_insert() per key.
+    
+    Args:
+        fcurve: Blender F-curve
+        frames: Array of shape (K,) with key frame numbers
+        values: Array of shape (K,) with key values
+        frame_range: First and last frame of the take
+    """
+    points = fcurve.keyframe_points
+    
+    # Keys outside the take are kept
+    if len(points) > 0:
+        co = np.empty(len(points) * 2, dtype=np.float32)
+        points.foreach_get('co', co)
+        replaced = np.flatnonzero((co[0::2] >= frame_range[0]) & (co[0::2] <= frame_range[1]))
+        for i in replaced[::-1]:
+            points.remove(points[int(i)], fast=True)
+    
+    start = len(points)
+    points.add(len(frames))
+    co = np.empty(len(points) * 2, dtype=np.float32)
+    points.foreach_get('co', co)
+    co[start * 2::2] = frames
+    co[start * 2 + 1::2] = values
+    points.foreach_set('co', co)
+
+def bake_action(armature, take, frames, values, action_name="MediaPipe Take", keep=None):
+    """
+    Write a recorded take into the armature's current action in one pass per F-curve.
+    A new action is created only if the armature has none; keys of the current
+    action inside the take's frame range are replaced, all other keys are kept.
+    
+    Args:
+        armature: Blender armature object
+        take: PoseTake whose channels were recorded
+        frames: Array of shape (F,) with frame numbers
+        values: Array of shape (F, channels) with the recorded channels
+        action_name: Name of the action created if the armature has none
+        keep: Boolean array of shape (F, bones) with the keys to write (None for all)
+    
+    Returns:
+        bpy.types.Action: Action the take was written to
+    """
+    animation_data = armature.animation_data
+    if animation_data is None:
+        animation_data = armature.animation_data_create()
+    action = animation_data.action
+    if action is None:
+        action = bpy.data.actions.new(action_name)
+        animation_data.action = action
+    
+    if len(frames) == 0:
+        return action
+    
+    frame_range = (frames[0], frames[-1])
+    
+    for column, (b, name, index) in enumerate(take.channels):
+        bone_name = take.bone_names[b]
+        keys = slice(None) if keep is None else keep[:, b]
+        
+        data_path = f'pose.bones["{bpy.utils.escape_identifier(bone_name)}"].{name}'
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve is None:
+            fcurve = action.fcurves.new(data_path, index=index, action_group=bone_name)
+        
+        write_keys(fcurve, frames[keys], values[keys, column], frame_range)
+        fcurve.update()
+    
+    return action
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Replay module for MediaPipe to Blender live animation add-on.
+This module plays recorded detection results back through the result callback
+interface of the MediaPipe processor, so streaming and animation can run
+without a camera.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# Import landmark detection module
+from .landmark_detection import DetectionResult, FaceData, HandData, PoseData
+
+# Import ring buffer module
+from .ring_buffer import get_window_stats
+
+# Import batch processing module
+from .batch_processing import read_result_stream
+
+# Import take format module
+from .take_format import TakeReader, MANIFEST_NAME
+
+
+def to_detection_result(data: Dict[str, Any]) -> DetectionResult:
+    """
+    Convert a result dictionary into a DetectionResult.
+    
+    Args:
+        data: Dictionary in the streamer result format
+    
+    Returns:
+        DetectionResult: Detection result with LandmarkArray landmarks
+    """
+    def common_fields(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'landmarks': entry['landmarks'],
+            'world_landmarks': entry.get('world_landmarks'),
+            'timestamp': entry.get('timestamp', 0.0),
+            'detection_confidence': entry.get('detection_confidence', 0.0),
+            'tracking_id': entry.get('tracking_id')
+        }
+    
+    return DetectionResult(
+        faces=[FaceData(blendshapes=face.get('blendshapes'), **common_fields(face))
+               for face in data.get('faces', [])],
+        hands=[HandData(handedness=hand.get('handedness', 'UNKNOWN'), hand_flag=hand.get('hand_flag', 0),
+                        **common_fields(hand))
+               for hand in data.get('hands', [])],
+        pose=[PoseData(**common_fields(pose)) for pose in data.get('pose', [])],
+        frame_timestamp=data.get('frame_timestamp', 0.0),
+        frame_index=data.get('frame_index', 0),
+        source_dimensions=tuple(data.get('source_dimensions', (0, 0)))
+    )
+
+
+class ResultReplayer:
+    """
+    Result source that replays a recorded take or result stream.
+    It has the result callback interface of MediaPipeProcessor, so it can be
+    handed to MediaPipeStreamer in place of the live processor. Results are
+    emitted at their original timing, scaled by a speed factor, or as fast as
+    the callback returns them, which makes runs reproducible without a camera.
+    """
+    
+    def __init__(
+        self,
+        source: str,
+        speed: Optional[float] = 1.0,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None
+    ):
+        """
+        Initialize the replayer with specified parameters.
+        
+        Args:
+            source: Take directory or result stream file
+            speed: Playback speed relative to the recorded timing (2.0 plays twice as fast),
+                or None to emit results as fast as possible
+            start_frame: Index of the first recorded frame to replay
+            end_frame: Index of the recorded frame to stop before, or None to replay to the end
+        """
+        self.source = source
+        self.speed = speed
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        
+        # Playback state
+        self.is_processing = False
+        self.thread = None
+        self.finished = threading.Event()
+        self.frame_count = 0
+        self.last_result = None
+        self.result_callback = None
+        
+        # Performance metrics
+        self.start_time = 0
+        self.process_times = deque(maxlen=30)  # Time spent in the result callback
+        self.latency_times = deque(maxlen=30)  # Time results were emitted after they were due (timed replay)
+    
+    def _read_results(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read the recorded results of the replayed frame range.
+        
+        Returns:
+            Iterator[Dict[str, Any]]: Result dictionaries in recorded order
+        """
+        if os.path.isdir(self.source):
+            reader = TakeReader(self.source)
+            end_frame = len(reader) if self.end_frame is None else min(self.end_frame, len(reader))
+            return (reader.get_result(frame) for frame in range(self.start_frame, end_frame))
+        
+        return islice(read_result_stream(self.source), self.start_frame, self.end_frame)
+    
+    def start(self) -> bool:
+        """
+        Start replaying in a separate thread.
+        
+        Returns:
+            bool: True if successfully started, False otherwise
+        """
+        if self.is_processing:
+            return True
+        
+        try:
+            results = self._read_results()
+        except Exception as e:
+            print(f"Error opening replay source {self.source}: {e}")
+            return False
+        
+        self.is_processing = True
+        self.finished.clear()
+        self.start_time = time.time()
+        self.frame_count = 0
+        self.thread = threading.Thread(target=self._replay_loop, args=(results,))
+        self.thread.daemon = True
+        self.thread.start()
+        
+        return True
+    
+    def stop(self) -> None:
+        """Stop replaying."""
+        self.is_processing = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1.0)
+            self.thread = None
+    
+    def _replay_loop(self, results: Iterator[Dict[str, Any]]) -> None:
+        """
+        Main replay loop that runs in a separate thread.
+        
+        Args:
+            results: Result dictionaries to replay
+        """
+        first_timestamp = None
+        clock_start = 0.0
+        
+        try:
+            for data in results:
+                if not self.is_processing:
+                    break
+                
+                result = to_detection_result(data)
+                
+                # Wait until the result is due on the scaled recording clock
+                if first_timestamp is None:
+                    first_timestamp = result.frame_timestamp
+                    clock_start = time.time()
+                
+                if self.speed:
+                    due = clock_start + (result.frame_timestamp - first_timestamp) / 1000.0 / self.speed
+                    delay = due - time.time()
+                    if delay > 0:
+                        time.sleep(delay)
+                    self.latency_times.append((time.time() - due) * 1000)
+                
+                start_time = time.time()
+                
+                self.last_result = result
+                self.frame_count += 1
+                
+                if self.result_callback:
+                    try:
+                        self.result_callback(result)
+                    except Exception as e:
+                        print(f"Error in result callback: {e}")
+                
+                self.process_times.append((time.time() - start_time) * 1000)
+        
+        except Exception as e:
+            print(f"Error replaying {self.source}: {e}")
+        
+        finally:
+            self.is_processing = False
+            self.finished.set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every result has been replayed.
+        
+        Args:
+            timeout: Maximum time to wait in seconds (None waits forever)
+        
+        Returns:
+            bool: True if finished, False if the timeout expired
+        """
+        return self.finished.wait(timeout)
+    
+    def get_last_result(self) -> Optional[DetectionResult]:
+        """
+        Get the last replayed result.
+        
+        Returns:
+            Optional[DetectionResult]: Last replayed result or None if not available
+        """
+        return self.last_result
+    
+    def set_result_callback(self, callback: Callable[[DetectionResult], None]) -> None:
+        """
+        Set a callback function that will be called for each replayed result.
+        
+        Args:
+            callback: Function that takes a DetectionResult as argument
+        """
+        self.result_callback = callback
+    
+    def get_average_process_time(self) -> float:
+        """
+        Get the average time spent in the result callback in milliseconds.
+        
+        Returns:
+            float: Average callback time in milliseconds
+        """
+        if not self.process_times:
+            return 0.0
+        return sum(self.process_times) / len(self.process_times)
+    
+    def get_average_latency(self) -> float:
+        """
+        Get the average time results were emitted after they were due in milliseconds.
+        
+        Returns:
+            float: Average lateness in milliseconds
+        """
+        if not self.latency_times:
+            return 0.0
+        return sum(self.latency_times) / len(self.latency_times)
+    
+    def get_performance_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get summary statistics of recent callback times and lateness.
+        
+        Returns:
+            Dict[str, Dict[str, float]]: Snapshots of the process time and latency windows
+        """
+        return {
+            'process_time': get_window_stats(self.process_times),
+            'latency': get_window_stats(self.latency_times)
+        }
+    
+    def get_dropped_frames(self) -> int:
+        """
+        Get the number of dropped frames; replay never drops results.
+        
+        Returns:
+            int: Always 0
+        """
+        return 0
+    
+    def get_fps(self) -> float:
+        """
+        Get the average replay rate since start.
+        
+        Returns:
+            float: Results emitted per second
+        """
+        elapsed = time.time() - self.start_time
+        if self.frame_count == 0 or elapsed <= 0:
+            return 0.0
+        return self.frame_count / elapsed
+    
+    def is_available(self) -> bool:
+        """
+        Check if the replay source exists.
+        
+        Returns:
+            bool: True if the source is a take or a result stream file, False otherwise
+        """
+        if os.path.isdir(self.source):
+            return os.path.exists(os.path.join(self.source, MANIFEST_NAME))
+        return os.path.isfile(self.source)
+    
+    def __del__(self):
+        """Ensure the replay thread is stopped when the object is destroyed."""
+        self.stop()
+
+
+if __name__ == "__main__":
+    """Replay a recorded take or result stream to Blender."""
+    import argparse
+    from .data_streaming import MediaPipeStreamer
+    
+    parser = argparse.ArgumentParser(description="Replay recorded MediaPipe results")
+    parser.add_argument("source", type=str, help="Take directory or result stream file")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed, 0 for as fast as possible")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Host address")
+    parser.add_argument("--port", type=int, default=5556, help="Port number")
+    parser.add_argument("--serializer", type=str, default="pickle", choices=["pickle", "binary", "delta"], help="Message serializer")
+    args = parser.parse_args()
+    
+    replayer = ResultReplayer(args.source, speed=args.speed or None)
+    streamer = MediaPipeStreamer(host=args.host, port=args.port, serializer=args.serializer, processor=replayer)
+    
+    if not streamer.start():
+        print("Failed to start replay")
+        exit(1)
+    
+    try:
+        replayer.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = streamer.get_streaming_stats()
+        streamer.stop()
+        print(f"Replayed {stats['frame_count']} results at {replayer.get_fps():.1f} FPS")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Ring buffer module for MediaPipe to Blender live animation add-on.
+This module provides a fixed-capacity ring buffer of NumPy arrays used for
+smoothing buffers, and summary statistics of scalar timing windows.
+"""
+
+import numpy as np
+from typing import Dict, Sequence, Tuple, Union
+
+
+class RingBuffer:
+    """
+    Fixed-capacity ring buffer of equally shaped arrays with O(1) push.
+    Keeps a running sum, so the mean never rescans the buffer. Used for
+    buffers of whole frames, e.g. one (N, 3) array of landmark positions per
+    frame; scalar timing windows use collections.deque(maxlen=...).
+    """
+    
+    def __init__(self, capacity: int, shape: Tuple[int, ...] = (), dtype: np.dtype = np.float64):
+        """
+        Initialize the ring buffer.
+        
+        Args:
+            capacity: Maximum number of items (at least 1)
+            shape: Shape of every item
+            dtype: Item data type
+        """
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be at least 1")
+        
+        self.capacity = capacity
+        self.shape = tuple(shape)
+        self.head = 0  # Slot written next
+        self.count = 0  # Number of valid items
+        self.push_count = 0  # Total number of pushed items
+        
+        self.data = np.zeros((capacity,) + self.shape, dtype=dtype)
+        self.total = np.zeros(self.shape)
+    
+    def is_full(self) -> bool:
+        """
+        Check if the buffer holds capacity items.
+        
+        Returns:
+            bool: True if full, False otherwise
+        """
+        return self.count == self.capacity
+    
+    def push(self, value: np.ndarray) -> None:
+        """
+        Add an item, replacing the oldest one when full.
+        
+        Args:
+            value: Array of the item shape
+        """
+        head = self.head
+        if self.count == self.capacity:
+            self.total -= self.data[head]
+        else:
+            self.count += 1
+        
+        self.data[head] = value
+        self.total += self.data[head]
+        
+        self.head = head + 1 if head + 1 < self.capacity else 0
+        self.push_count += 1
+        
+        # Recompute the sum now and then so rounding errors cannot accumulate
+        if self.push_count % (64 * self.capacity) == 0:
+            self.total = self.ordered().sum(axis=0)
+    
+    def clear(self) -> None:
+        """Remove all items."""
+        self.head = 0
+        self.count = 0
+        self.total = np.zeros(self.shape)
+    
+    def ordered(self) -> np.ndarray:
+        """
+        Get the items from oldest to newest.
+        
+        Returns:
+            np.ndarray: Array of shape (count,) + item shape
+        """
+        if self.count < self.capacity:
+            return self.data[:self.count].copy()
+        return np.concatenate((self.data[self.head:], self.data[:self.head]))
+    
+    def last(self) -> Union[np.ndarray, None]:
+        """
+        Get the newest item.
+        
+        Returns:
+            Union[np.ndarray, None]: Newest item or None if empty
+        """
+        if self.count == 0:
+            return None
+        return self.data[self.head - 1]
+    
+    def sum(self) -> np.ndarray:
+        """
+        Get the sum of all items.
+        
+        Returns:
+            np.ndarray: Running sum
+        """
+        return self.total.copy()
+    
+    def mean(self) -> np.ndarray:
+        """
+        Get the mean of all items.
+        
+        Returns:
+            np.ndarray: Running mean, zeros if empty
+        """
+        if self.count == 0:
+            return np.zeros(self.shape)
+        return self.total / self.count
+    
+    def weighted_mean(self, weights: Sequence[float]) -> np.ndarray:
+        """
+        Get the weighted mean of all items.
+        
+        Args:
+            weights: One weight per item, from oldest to newest
+        
+        Returns:
+            np.ndarray: Weighted mean
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        if len(weights) != self.count:
+            raise ValueError(f"Expected {self.count} weights, got {len(weights)}")
+        
+        # Spread the weights over the storage slots instead of reordering the items
+        slots = (self.head - self.count + np.arange(self.count)) % self.capacity
+        slot_weights = np.zeros(self.capacity)
+        slot_weights[slots] = weights
+        
+        return np.tensordot(slot_weights, self.data, axes=1) / weights.sum()
+    
+    def __len__(self) -> int:
+        """Get the number of items."""
+        return self.count
+
+
+def get_window_stats(values: Sequence[float]) -> Dict[str, float]:
+    """
+    Get summary statistics of a window of scalar measurements.
+    
+    Args:
+        values: Recent measurements, e.g. a deque of processing times
+    
+    Returns:
+        Dict[str, float]: Count, mean, min, max and 50th, 95th and 99th percentiles,
+            0.0 for an empty window
+    """
+    if not values:
+        return {'count': 0, 'mean': 0.0, 'min': 0.0, 'max': 0.0, 'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    
+    p50, p95, p99 = np.percentile(np.fromiter(values, dtype=np.float64, count=len(values)), [50, 95, 99]).tolist()
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values),
+        'min': min(values),
+        'max': max(values),
+        'p50': p50,
+        'p95': p95,
+        'p99': p99
+    }
@@ -0,0 +1,416 @@
+"""
+MediaPipe Motion Capture - Smoothing Module
+This module provides NumPy-based landmark smoothing for the Blender add-on.
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple, Optional, Any, Union
+
+# Import landmark array module
+from .landmark_array import LandmarkArray
+
+# Import ring buffer module
+from .ring_buffer import RingBuffer
+
+# Landmark coordinate keys
+COORDINATE_KEYS = ('x', 'y', 'z')
+
+def landmarks_to_positions(landmarks, count=None):
+    """
+    Convert landmarks to an array of positions.
+    
+    Args:
+        landmarks: LandmarkArray or list of landmark dictionaries
+        count: Number of leading landmarks to convert (None for all)
+    
+    Returns:
+        numpy.ndarray: Array of shape (count, 3) with x, y, z coordinates
+    """
+    if count is None:
+        count = len(landmarks)
+    
+    if isinstance(landmarks, LandmarkArray):
+        return landmarks.xyz[:count].astype(np.float64)
+    
+    positions = np.empty((count, 3))
+    for i in range(count):
+        lm = landmarks[i]
+        positions[i] = (lm['x'], lm['y'], lm['z'])
+    return positions
+
+def positions_to_landmarks(landmarks, positions):
+    """
+    Replace the leading landmark positions, keeping all other properties.
+    
+    Args:
+        landmarks: LandmarkArray or list of landmark dictionaries
+        positions: Array of shape (count, 3) with the new x, y, z coordinates
+    
+    Returns:
+        LandmarkArray or list: New landmarks in the same format as the input
+    """
+    count = len(positions)
+    
+    if isinstance(landmarks, LandmarkArray):
+        result = landmarks.copy()
+        result.data[:count, :3] = positions
+        return result
+    
+    result = []
+    for lm, (x, y, z) in zip(landmarks, positions.tolist()):
+        smoothed_lm = {'x': x, 'y': y, 'z': z}
+        
+        # Copy additional properties
+        for key, value in lm.items():
+            if key not in COORDINATE_KEYS:
+                smoothed_lm[key] = value
+        
+        result.append(smoothed_lm)
+    
+    result.extend(landmarks[count:])
+    return result
+
+class LandmarkSmoother:
+    """
+    Weighted moving average smoothing for whole landmark sets.
+    Keeps one ring buffer of (N, 3) positions per tracked subject and smooths
+    all of its landmarks with a few array operations per frame.
+    """
+    
+    def __init__(self, buffer_size=5):
+        """
+        Initialize the landmark smoother.
+        
+        Args:
+            buffer_size: Number of frames to buffer for smoothing
+        """
+        self.buffer_size = buffer_size
+        self.rings = {}
+    
+    def reset(self):
+        """Clear all smoothing buffers."""
+        self.rings = {}
+    
+    def set_buffer_size(self, buffer_size):
+        """
+        Set the number of buffered frames, clearing the buffers if it changed.
+        
+        Args:
+            buffer_size: Number of frames to buffer for smoothing
+        """
+        if buffer_size != self.buffer_size:
+            self.buffer_size = buffer_size
+            self.reset()
+    
+    def smooth_landmarks(self, key, landmarks, previous_count, smoothing):
+        """
+        Smooth a landmark set.
+        Only landmarks that also existed in the previous frame are buffered and
+        smoothed; the others are returned unchanged. The buffer of the subject
+        starts over when the number of smoothed landmarks changes.
+        
+        Args:
+            key: Hashable key identifying the tracked subject
+            landmarks: LandmarkArray or list of landmark dictionaries
+            previous_count: Number of landmarks in the previous frame
+            smoothing: Blend factor
+ between the raw (0.0) and averaged (1.0) positions
+        
+        Returns:
+            LandmarkArray or list: Smoothed landmarks in the same format as the input
+        """
+        count = min(len(landmarks), previous_count)
+        if count == 0:
+            return landmarks
+        
+        ring = self.rings.get(key)
+        if ring is None or ring.shape[0] != count or ring.capacity != self.buffer_size:
+            ring = RingBuffer(self.buffer_size, shape=(count, 3))
+            self.rings[key] = ring
+        
+        positions = landmarks_to_positions(landmarks, count)
+        ring.push(positions)
+        
+        # The j-th oldest of L frames has weight (j + 1) / L, so recent frames count more
+        length = len(ring)
+        average = ring.weighted_mean(np.arange(1, length + 1) / length)
+        
+        # Blend from the raw positions towards the weighted average
+        smoothed = positions * (1.0 - smoothing) + average * smoothing
+        
+        return positions_to_landmarks(landmarks, smoothed)
+
+class OneEuroFilter:
+    """
+    One-Euro filter for an array of positions.
+    A low-pass filter whose cutoff frequency rises with speed, giving low
+    jitter at rest and low lag during fast motion.
+    """
+    
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0):
+        """
+        Initialize the One-Euro filter.
+        
+        Args:
+            min_cutoff: Cutoff frequency at rest in Hz
+            beta: Increase of the cutoff frequency per unit of speed
+            d_cutoff: Cutoff frequency for the speed estimate in Hz
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+    
+    def reset(self):
+        """Clear the filter state."""
+        self.position = None
+        self.velocity = None
+    
+    @staticmethod
+    def _alpha(cutoff, dt):
+        """Get the smoothing factor of a low-pass filter."""
+        tau = 1.0 / (2.0 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+    
+    def filter(self, positions, dt):
+        """
+        Filter a frame of positions.
+        
+        Args:
+            positions: Array of shape (N, 3)
+            dt: Time since the previous frame in seconds
+        
+        Returns:
+            numpy.ndarray: Filtered positions
+        """
+        if self.position is None:
+            self.position = positions.copy()
+            self.velocity = np.zeros_like(positions)
+            return self.position.copy()
+        
+        velocity = (positions - self.position) / dt
+        self.velocity += self._alpha(self.d_cutoff, dt) * (velocity - self.velocity)
+        
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        self.position += self._alpha(cutoff, dt) * (positions - self.position)
+        
+        return self.position.copy()
+
+class SpringFilter:
+    """
+    Critically damped spring following an array of positions.
+    The exact solution of the spring equation is used, so the filter is
+    stable for any frame time and never overshoots.
+    """
+    
+    def __init__(self, frequency=4.0):
+        """
+        Initialize the spring filter.
+        
+        Args:
+            frequency: Natural frequency of the spring in Hz (higher follows faster)
+        """
+        self.frequency = frequency
+        self.reset()
+    
+    def reset(self):
+        """Clear the filter state."""
+        self.position = None
+        self.velocity = None
+    
+    def filter(self, positions, dt):
+        """
+        Filter a frame of positions.
+        
+        Args:
+            positions: Array of shape (N, 3)
+            dt: Time since the previous frame in seconds
+        
+        Returns:
+            numpy.ndarray: Filtered positions
+        """
+        if self.position is None:
+            self.position = positions.copy()
+            self.velocity = np.zeros_like(positions)
+            return self.position.copy()
+        
+        omega = 2.0 * np.pi * self.frequency
+        decay = np.exp(-omega * dt)
+        
+        offset = self.position - positions
+        change = (self.velocity + omega * offset) * dt
+        
+        self.position = positions + (offset + change) * decay
+        self.velocity = (self.velocity - omega * change) * decay
+        
+        return self.position.copy()
+
+class KalmanFilter:
+    """
+    Constant-velocity Kalman filter for an array of positions.
+    Every coordinate is tracked independently with a position and velocity
+    state, driven by white-noise acceleration.
+    """
+    
+    def __init__(self, process_noise=0.01, measurement_noise=1e-5):
+        """
+        Initialize the Kalman filter.
+        
+        Args:
+            process_noise: Acceleration noise spectral density (higher follows faster)
+            measurement_noise: Variance of the measured positions
+        """
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.reset()
+    
+    def reset(self):
+        """Clear the filter state."""
+        self.position = None
+        self.velocity = None
+        
+        # Covariance entries of every coordinate
+        self.p_pp = None
+        self.p_pv = None
+        self.p_vv = None
+    
+    def filter(self, positions, dt):
+        """
+        Filter a frame of positions.
+        
+        Args:
+            positions: Array of shape (N, 3)
+            dt: Time since the previous frame in seconds
+        
+        Returns:
+            numpy.ndarray: Filtered positions
+        """
+        if self.position is None:
+            self.position = positions.copy()
+            self.velocity = np.zeros_like(positions)
+            self.p_pp = np.full_like(positions, self.measurement_noise)
+            self.p_pv = np.zeros_like(positions)
+            self.p_vv = np.full_like(positions, self.measurement_noise)
+            return self.position.copy()
+        
+        q = self.process_noise
+        
+        # Predict
+        self.position += self.velocity * dt
+        self.p_pp += dt * (2.0 * self.p_pv + dt * self.p_vv) + q * dt ** 3 / 3.0
+        self.p_pv += dt * self.p_vv + q * dt ** 2 / 2.0
+        self.p_vv += q * dt
+        
+        # Update
+        innovation = positions - self.position
+        variance = self.p_pp + self.measurement_noise
+        gain_p = self.p_pp / variance
+        gain_v = self.p_pv / variance
+        
+        self.position += gain_p * innovation
+        self.velocity += gain_v * innovation
+        
+        self.p_vv -= gain_v * self.p_pv
+        self.p_pv *= 1.0 - gain_p
+        self.p_pp *= 1.0 - gain_p
+        
+        return self.position.copy()
+
+# Filter classes by smoothing mode
+FILTER_TYPES = {
+    'one_euro': OneEuroFilter,
+    'spring': SpringFilter,
+    'kalman': KalmanFilter,
+}
+
+# Default filter parameters per body part
+DEFAULT_FILTER_PARAMETERS = {
+    'one_euro': {
+        'face': {'min_cutoff': 1.0, 'beta': 5.0, 'd_cutoff': 1.0},
+        'hand': {'min_cutoff': 1.5, 'beta': 20.0, 'd_cutoff': 1.0},
+        'pose': {'min_cutoff': 1.0, 'beta': 10.0, 'd_cutoff': 1.0},
+    },
+    'spring': {
+        'face': {'frequency': 3.0},
+        'hand': {'frequency': 6.0},
+        'pose': {'frequency': 4.0},
+    },
+    'kalman': {
+        'face': {'process_noise': 0.002, 'measurement_noise': 1e-5},
+        'hand': {'process_noise': 0.02, 'measurement_noise': 1e-5},
+        'pose': {'process_noise': 0.01, 'measurement_noise': 1e-5},
+    },
+}
+
+class LandmarkFilterBank:
+    """
+    Adaptive filtering for whole landmark sets.
+    Keeps one filter per tracked subject, created with the parameters of the
+    subject's body part, and filters all of its landmarks at once.
+    """
+    
+    def __init__(self, filter_type='one_euro', parameters=None, default_dt=1.0 / 30.0):
+        """
+        Initialize the filter bank.
+        
+        Args:
+            filter_type: 'one_euro', 'spring' or 'kalman'
+            parameters: Filter parameters per body part ('face', 'hand', 'pose'),
+                merged over the defaults
+            default_dt: Frame time in seconds used when timestamps are missing
+        """
+        if filter_type not in FILTER_TYPES:
+            raise ValueError(f"Unsupported filter type: {filter_type}")
+        
+        self.filter_type = filter_type
+        self.parameters = {
+            body_part: dict(values)
+            for body_part, values in DEFAULT_FILTER_PARAMETERS[filter_type].items()
+        }
+        for body_part, values in (parameters or {}).items():
+            self.parameters.setdefault(body_part, {}).update(values)
+        
+        self.default_dt = default_dt
+        self.filters = {}
+        self.timestamps = {}
+    
+    def reset(self):
+        """Clear all filter states."""
+        self.filters = {}
+        self.timestamps = {}
+    
+    def filter_landmarks(self, key, body_part, landmarks, previous_count, timestamp=None):
+        """
+        Filter a landmark set.
+        Only landmarks that also existed in the previous frame are filtered; the
+        others are returned unchanged.
+        
+        Args:
+            key: Hashable key identifying the tracked subject
+            body_part: 'face', 'hand' or 'pose'
+            landmarks: LandmarkArray or list of landmark dictionaries
+            previous_count: Number of landmarks in the previous frame
+            timestamp: Frame time in seconds (None to assume default_dt)
+        
+        Returns:
+            LandmarkArray or list: Filtered landmarks in the same format as the input
+        """
+        count = min(len(landmarks), previous_count)
+        if count == 0:
+            return landmarks
+        
+        landmark_filter, filter_count = self.filters.get(key, (None, 0))
+        if landmark_filter is None or filter_count != count:
+            parameters = self.parameters.get(body_part, {})
+            landmark_filter = FILTER_TYPES[self.filter_type](**parameters)
+            self.filters[key] = (landmark_filter, count)
+        
+        # Use the real frame time so filters behave the same at any frame rate
+        dt = self.default_dt
+        previous_timestamp = self.timestamps.get(key)
+        if timestamp is not None and previous_timestamp is not None and timestamp > previous_timestamp:
+            dt = timestamp - previous_timestamp
+        self.timestamps[key] = timestamp
+        
+        positions = landmarks_to_positions(landmarks, count)
+        return positions_to_landmarks(landmarks, landmark_filter.filter(positions, dt))
@@ -0,0 +1,439 @@
+#!/usr/bin/env python3
+"""
+Take format module for MediaPipe to Blender live animation add-on.
+This module stores sessions of detection results on disk in a columnar
+format and reads them back with random access.
+"""
+
+import os
+import json
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .landmark_array import LandmarkArray, as_landmark_array
+from .wire_format import get_field
+
+
+# A take is a directory holding a JSON manifest and numbered chunk directories.
+# Every chunk stores up to chunk_size frames as one .npy file per column:
+#
+#   timestamps          (F,) float64 frame timestamps in milliseconds
+#   frame_index         (F,) int64 source frame indices
+#   <channel>           (F, N, 4) float32 landmarks (x, y, z, visibility)
+#   <channel>_world     (F, N, 4) float32 world landmarks, if any frame had them
+#   <channel>_present   (F,) bool, False where the channel was not detected
+#   <channel>_confidence  (F,) float32 detection confidence
+#   face_blendshapes    (F, B) float32 scores, names are listed in the manifest;
+#                       blendshapes missing from a frame are stored as 0
+#
+# Chunks are written once and never modified, and the manifest is replaced
+# atomically after every chunk, so a take can be read while it is recorded.
+TAKE_VERSION = 1
+MANIFEST_NAME = 'take.json'
+CHUNK_NAME = 'chunk_{:06d}'
+
+# Channels and the result key they are taken from
+CHANNELS = ('face', 'left_hand', 'right_hand', 'pose')
+CHANNEL_KEYS = {'face': 'faces', 'left_hand': 'hands', 'right_hand': 'hands', 'pose': 'pose'}
+
+
+def _select_entries(data: Any) -> Dict[str, Any]:
+    """
+    Pick the entry of every channel from a detection result.
+    Only the first face and pose are stored; hands are assigned by handedness.
+    
+    Args:
+        data: DetectionResult or dictionary in the streamer result format
+    
+    Returns:
+        Dict[str, Any]: Channel name to face, hand or pose entry
+    """
+    entries = {}
+    
+    faces = get_field(data, 'faces') or []
+    if faces:
+        entries['face'] = faces[0]
+    
+    for hand in get_field(data, 'hands') or []:
+        handedness = get_field(hand, 'handedness', 'UNKNOWN')
+        if handedness not in ('Left', 'Right'):
+            handedness = 'Right' if get_field(hand, 'hand_flag', 0) == 1 else 'Left'
+        entries.setdefault('left_hand' if handedness == 'Left' else 'right_hand', hand)
+    
+    pose = get_field(data, 'pose') or []
+    if pose:
+        entries['pose'] = pose[0]
+    
+    return entries
+
+
+class TakeWriter:
+    """
+    Append-only writer of a take directory.
+    Frames are collected into preallocated column arrays and written as one
+    chunk of .npy files whenever chunk_size frames have been added.
+    """
+    
+    def __init__(self, path: str, chunk_size: int = 256, metadata: Optional[Dict[str, Any]] = None):
+        """
+        Create a take directory for writing.
+        
+        Args:
+            path: Take directory; must not contain a take already
+            chunk_size: Number of frames per chunk
+            metadata: JSON-serializable values stored in the manifest
+        """
+        if chunk_size < 1:
+            raise ValueError("TakeWriter chunk_size must be at least 1")
+        if os.path.exists(os.path.join(path, MANIFEST_NAME)):
+            raise FileExistsError(f"Take already exists: {path}")
+        
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_size = chunk_size
+        
+        self.manifest = {
+            'version': TAKE_VERSION,
+            'chunk_size': chunk_size,
+            'frame_count': 0,
+            'source_dimensions': [0, 0],
+            'landmark_counts': {},
+            'blendshape_names': [],
+            'chunks': [],
+            'metadata': metadata or {}
+        }
+        
+        # Columns of the chunk being filled, allocated when first needed
+        self.columns = {}
+        self.count = 0  # Frames in the current chunk
+        self.frame_count = 0
+        self.is_closed = False
+    
+    def _column(self, name: str, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+        """
+        Get a column of the current chunk, allocating it zero-filled if needed.
+        
+        Args:
+            name: Column name
+            shape: Shape of one frame of the column
+            dtype: Data type of the column
+        
+        Returns:
+            np.ndarray: Column array of shape (chunk_size,) + shape
+        """
+        column = self.columns.get(name)
+        if column is None:
+            column = np.zeros((self.chunk_size,) + shape, dtype=dtype)
+            self.columns[name] = column
+        return column
+    
+    def write(self, result: Any) -> None:
+        """
+        Append a detection result to the take.
+        
+        Args:
+            result: DetectionResult or dictionary in the streamer result format
+        """
+        if self.is_closed:
+            raise ValueError("Cannot write to a closed take")
+        
+        row = self.count
+        self._column('timestamps', (), np.float64)[row] = get_field(result, 'frame_timestamp', 0.0)
+        self._column('frame_index', (), np.int64)[row] = get_field(result, 'frame_index', self.frame_count)
+        self.manifest['source_dimensions'] = list(get_field(result, 'source_dimensions', (0, 0)))
+        
+        counts = self.manifest['landmark_counts']
+        for channel, entry in _select_entries(result).items():
+            landmarks = as_landmark_array(get_field(entry, 'landmarks'))
+            count = counts.setdefault(channel, len(landmarks))
+            if len(landmarks) != count:
+                raise ValueError(f"{channel} landmark count changed from {count} to {len(landmarks)}")
+            
+            self._column(channel, (count, 4), np.float32)[row] = landmarks.data
+            self._column(f'{channel}_present', (), bool)[row] = True
+            self._column(f'{channel}_confidence', (), np.float32)[row] = get_field(entry, 'detection_confidence', 0.0)
+            
+            world_landmarks = as_landmark_array(get_field(entry, 'world_landmarks'))
+            if world_landmarks is not None:
+                self._column(f'{channel}_world', (count, 4), np.float32)[row] = world_landmarks.data
+            
+            blendshapes = get_field(entry, 'blendshapes') if channel == 'face' else None
+            if blendshapes:
+                names = self.manifest['blendshape_names']
+                if not names:
+                    names.extend(shape['name'] for shape in blendshapes)
+                scores = self._column('face_blendshapes', (len(names),), np.float32)
+                
+                # Scores are stored by name; blendshapes a frame lacks are stored as 0
+                frame_scores = {shape['name']: shape['score'] for shape in blendshapes}
+                scores[row] = [frame_scores.get(name, 0.0) for name in names]
+        
+        self.count += 1
+        self.frame_count += 1
+        if self.count == self.chunk_size:
+            self.flush()
+    
+    def flush(self) -> None:
+        """Write the frames added since the last chunk as a new chunk."""
+        if self.count == 0:
+            return
+        
+        name = CHUNK_NAME.format(len(self.manifest['chunks']))
+        directory = os.path.join(self.path, name)
+        os.makedirs(directory, exist_ok=True)
+        
+        for column, array in self.columns.items():
+            np.save(os.path.join(directory, column + '.npy'), array[:self.count])
+        
+        self.manifest['chunks'].append({'name': name, 'frame_count': self.count})
+        self.manifest['frame_count'] = self.frame_count
+        self._write_manifest()
+        
+        self.columns = {}
+        self.count = 0
+    
+    def _write_manifest(self) -> None:
+        """Replace the manifest file atomically."""
+        path = os.path.join(self.path, MANIFEST_NAME)
+        with open(path + '.tmp', 'w') as file:
+            json.dump(self.manifest, file, indent=2)
+        os.replace(path + '.tmp', path)
+    
+    def close(self) -> None:
+        """Write the remaining frames and the final manifest."""
+        if self.is_closed:
+            return
+        
+        self.flush()
+        if not self.manifest['chunks']:
+            self._write_manifest()
+        self.is_closed = True
+    
+    def __len__(self) -> int:
+        return self.frame_count
+    
+    def __enter__(self) -> "TakeWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class TakeReader:
+    """
+    Random-access reader of a take directory.
+    Chunk columns are memory-mapped on first use, so opening a take and
+    reading a few frames or one channel does not load the whole take.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open a take directory.
+        
+        Args:
+            path: Take directory
+        """
+        with open(os.path.join(path, MANIFEST_NAME)) as file:
+            manifest = json.load(file)
+        
+        if manifest.get('version') != TAKE_VERSION:
+            raise ValueError(f"Unsupported take version: {manifest.get('version')}")
+        
+        self.path = path
+        self.manifest = manifest
+        self.chunks = manifest['chunks']
+        self.landmark_counts = manifest['landmark_counts']
+        self.blendshape_names = manifest['blendshape_names']
+        self.source_dimensions = tuple(manifest['source_dimensions'])
+        self.metadata = manifest['metadata']
+        
+        # First frame of every chunk, for locating frames
+        counts = [chunk['frame_count'] for chunk in self.chunks]
+        self.chunk_starts = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.frame_count = int(self.chunk_starts[-1])
+        
+        self.loaded_columns = {}
+        self.timestamps = self.get_column('timestamps')
+        self.frame_indices = self.get_column('frame_index')
+    
+    def __len__(self) -> int:
+        return self.frame_count
+    
+    def _load(self, chunk: int, column: str) -> Optional[np.ndarray]:
+        """
+        Memory-map a column of a chunk.
+        
+        Args:
+            chunk: Chunk index
+            column: Column name
+        
+        Returns:
+            Optional[np.ndarray]: Read-only column array, or None if the chunk does not have it
+        """
+        key = (chunk, column)
+        if key not in self.loaded_columns:
+            path = os.path.join(self.path, self.chunks[chunk]['name'], column + '.npy')
+            self.loaded_columns[key] = np.load(path, mmap_mode='r') if os.path.exists(path) else None
+        return self.loaded_columns[key]
+    
+    def _column_shape(self, column: str) -> Tuple[Tuple[int, ...], Any]:
+        """
+        Get the per-frame shape and data type of a column.
+        
+        Args:
+            column: Column name
+        
+        Returns:
+            Tuple: Shape of one frame and data type
+        """
+        if column == 'timestamps':
+            return (), np.float64
+        if column == 'frame_index':
+            return (), np.int64
+        if column == 'face_blendshapes':
+            return (len(self.blendshape_names),), np.float32
+        if column.endswith('_present'):
+            return (), bool
+        if column.endswith('_confidence'):
+            return (), np.float32
+        
+        channel = column[:-len('_world')] if column.endswith('_world') else column
+        if channel not in CHANNELS:
+            raise KeyError(f"Unknown take column: {column}")
+        return (self.landmark_counts.get(channel, 0), 4), np.float32
+    
+    def get_column(self, column: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """
+        Read a column for a range of frames.
+        Frames of chunks that do not have the column read as zeros (False for masks).
+        
+        Args:
+            column: Column name, e.g. "timestamps", "pose", "pose_world" or "left_hand_present"
+            start: First frame
+            stop: Frame to stop before, or None for the end of the take
+        
+        Returns:
+            np.ndarray: Column values of shape (frames,) + frame shape
+        """
+        start, stop, _ = slice(start, stop).indices(self.frame_count)
+        shape, dtype = self._column_shape(column)
+        
+        # A range within one chunk is returned as a view of the memory map
+        first = int(np.searchsorted(self.chunk_starts, start, side='right')) - 1
+        if stop > start and stop <= self.chunk_starts[first + 1]:
+            array = self._load(first, column)
+            if array is not None:
+                offset = self.chunk_starts[first]
+                return array[start - offset:stop - offset]
+        
+        result = np.zeros((max(0, stop - start),) + shape, dtype=dtype)
+        for chunk in range(max(first, 0), len(self.chunks)):
+            chunk_start = self.chunk_starts[chunk]
+            chunk_stop = self.chunk_starts[chunk + 1]
+            if chunk_start >= stop:
+                break
+            
+            array = self._load(chunk, column)
+            if array is None:
+                continue
+            
+            low = max(start, chunk_start)
+            high = min(stop, chunk_stop)
+            result[low - start:high - start] = array[low - chunk_start:high - chunk_start]
+        
+        return result
+    
+    def get_channel(self, channel: str, start: int = 0, stop: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read the landmarks and presence mask of a channel for a range of frames.
+        
+        Args:
+            channel: Channel name ("face", "left_hand", "right_hand" or "pose")
+            start: First frame
+            stop: Frame to stop before, or None for the end of the take
+        
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Landmarks of shape (frames, N, 4) and boolean
+                presence mask of shape (frames,)
+        """
+        return self.get_column(channel, start, stop), self.get_column(f'{channel}_present', start, stop)
+    
+    def find_frame(self, timestamp: float) -> int:
+        """
+        Find the last frame at or before a timestamp.
+        
+        Args:
+            timestamp: Timestamp in milliseconds
+        
+        Returns:
+            int: Frame number, 0 if the timestamp is before the first frame
+        """
+        return max(0, int(np.searchsorted(self.timestamps, timestamp, side='right')) - 1)
+    
+    def get_result(self, frame: int) -> Dict[str, Any]:
+        """
+        Rebuild the detection result of one frame.
+        
+        Args:
+            frame: Frame number (negative numbers count from the end)
+        
+        Returns:
+            Dict[str, Any]: Result dictionary in the streamer result format with
+                LandmarkArray landmarks
+        """
+        if frame < 0:
+            frame += self.frame_count
+        if not 0 <= frame < self.frame_count:
+            raise IndexError(f"Frame {frame} is out of range")
+        
+        chunk = int(np.searchsorted(self.chunk_starts, frame, side='right')) - 1
+        row = frame - int(self.chunk_starts[chunk])
+        timestamp = float(self.timestamps[frame])
+        
+        result = {
+            'faces': [],
+            'hands': [],
+            'pose': [],
+            'frame_timestamp': timestamp,
+            'frame_index': int(self.frame_indices[frame]),
+            'source_dimensions': self.source_dimensions
+        }
+        
+        for channel in CHANNELS:
+            present = self._load(chunk, f'{channel}_present')
+            if present is None or not present[row]:
+                continue
+            
+            entry = {
+                'landmarks': LandmarkArray(self._load(chunk, channel)[row]),
+                'timestamp': timestamp,
+                'detection_confidence': float(self._load(chunk, f'{channel}_confidence')[row]),
+                'tracking_id': 0
+            }
+            
+            world_landmarks = self._load(chunk, f'{channel}_world')
+            if world_landmarks is not None:
+                entry['world_landmarks'] = LandmarkArray(world_landmarks[row])
+            
+            if channel == 'face':
+                scores = self._load(chunk, 'face_blendshapes')
+                if scores is not None:
+                    entry['blendshapes'] = [
+                        {'name': name, 'score': float(score)}
+                        for name, score in zip(self.blendshape_names, scores[row])
+                    ]
+            elif channel != 'pose':
+                is_right = channel == 'right_hand'
+                entry['handedness'] = 'Right' if is_right else 'Left'
+                entry['hand_flag'] = 1 if is_right else 0
+            
+            result[CHANNEL_KEYS[channel]].append(entry)
+        
+        return result
+    
+    def __getitem__(self, frame: int) -> Dict[str, Any]:
+        return self.get_result(frame)
+    
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for frame in range(self.frame_count):
+            yield self.get_result(frame)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the asyncio ZMQ streamer.
+This script publishes messages faster than an async subscriber consumes them
+and checks that the subscriber only sees recent messages and stops promptly.
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import threading
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.data_streaming import ZMQStreamer, AsyncZMQStreamer
+
+def run_publisher(port, count, interval, stop_event):
+    """Publish numbered messages until the count is reached or stopped."""
+    streamer = ZMQStreamer(mode="server", port=port, socket_type="PUB")
+    if not streamer.start():
+        print("Failed to start publisher")
+        return
+    
+    for i in range(count):
+        if stop_event.is_set():
+            break
+        streamer.send_message({'frame_index': i})
+        time.sleep(interval)
+    
+    streamer.stop()
+
+async def consume(port, count, consumer_delay):
+    """Consume messages slowly and return the received frame indices."""
+    received = []
+    
+    async with AsyncZMQStreamer(mode="client", port=port, socket_type="SUB") as streamer:
+        async for data in streamer:
+            received.append(data['frame_index'])
+            if data['frame_index'] >= count - 1:
+                break
+            await asyncio.sleep(consumer_delay)
+        
+        dropped = streamer.dropped_count
+    
+    return received, dropped
+
+def test_latest_only(port=5571, count=200, interval=0.002, consumer_delay=0.02):
+    """Test that a slow async consumer skips stale messages instead of queueing them."""
+    print("Testing latest-only mailbox...")
+    
+    stop_event = threading.Event()
+    publisher = threading.Thread(target=run_publisher, args=(port, count, interval, stop_event))
+    
+    async def run():
+        task = asyncio.ensure_future(consume(port, count, consumer_delay))
+        await asyncio.sleep(0.5)  # Let the subscriber connect before publishing
+        publisher.start()
+        return await asyncio.wait_for(task, timeout=10.0)
+    
+    try:
+        received, dropped = asyncio.run(run())
+    except asyncio.TimeoutError:
+        raise AssertionError("Consumer did not receive the last message")
+    finally:
+        stop_event.set()
+        if publisher.is_alive():
+            publisher.join()
+    
+    print(f"Received {len(received)} of {count} messages, dropped {dropped}")
+    assert received == sorted(received) and received[-1] == count - 1, \
+        "Messages are out of order or the last message is missing"
+    
+    assert len(received) <= count // 2 and dropped != 0, "Stale messages were not dropped"
+    
+    print("Latest-only mailbox test passed")
+
+def test_stop(port=5572):
+    """Test that stop() ends a consumer waiting for messages immediately."""
+    print("Testing async stop...")
+    
+    async def run():
+        streamer = AsyncZMQStreamer(mode="client", port=port, socket_type="SUB")
+        if not await streamer.start():
+            return None, 0.0
+        
+        received = []
+        
+        async def iterate():
+            async for data in streamer:
+                received.append(data)
+        
+        task = asyncio.ensure_future(iterate())
+        await asyncio.sleep(0.2)
+        
+        start_time = time.time()
+        await streamer.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+        return received, time.time() - start_time
+    
+    received, duration = asyncio.run(run())
+    print(f"Stopped in {duration * 1000:.1f} ms")
+    assert received is not None and not received and duration <= 0.1, "Consumer was not stopped immediately"
+    
+    print("Async stop test passed")
+
+def test_background(port=5573):
+    """Test reading the latest message from a thread without an event loop."""
+    print("Testing background event loop...")
+    
+    streamer = AsyncZMQStreamer(mode="client", port=port, socket_type="SUB")
+    started = streamer.start_background()
+    assert started, "Failed to start background streamer"
+    
+    publisher = ZMQStreamer(mode="server", port=port, socket_type="PUB")
+    publisher.start()
+    time.sleep(0.5)
+    
+    for i in range(10):
+        publisher.send_message({'frame_index': i})
+    time.sleep(0.2)
+    
+    latest = streamer.get_latest()
+    publisher.stop()
+    streamer.stop_background()
+    
+    assert latest is not None and latest['frame_index'] == 9 and streamer.get_latest() is None, \
+        f"Wrong latest message: {latest}"
+    
+    print("Background event loop test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test asyncio ZMQ streaming")
+    parser.parse_args()
+    
+    try:
+        test_latest_only()
+        test_stop()
+        test_background()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Async streaming test passed")
+    else:
+        print("Async streaming test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Test script for offline batch processing.
+This script tests video file capture, result frame indices and result stream files.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import cv2
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.video_capture import VideoFileCapture
+from src.mediapipe_module.landmark_detection import MediaPipeProcessor, FramePreprocessor
+from src.mediapipe_module.wire_format import decode_result
+from src.mediapipe_module import batch_processing
+from src.mediapipe_module.batch_processing import (
+    BatchProcessor, ResultStreamWriter, read_result_stream, plan_segments, run_video_file
+)
+
+def write_test_video(path, frames=40, fps=25.0):
+    """Write a small video whose frames encode their index as brightness."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (160, 120))
+    for i in range(frames):
+        writer.write(np.full((120, 160, 3), i * 5, dtype=np.uint8))
+    writer.release()
+
+def test_video_file_capture(frames=40, fps=25.0):
+    """Test that every frame of two files is delivered with its source timestamp."""
+    print("Testing video file capture...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        write_test_video(os.path.join(directory, "take_a.mp4"), frames, fps)
+        write_test_video(os.path.join(directory, "take_b.mp4"), frames, fps)
+        
+        capture = VideoFileCapture(os.path.join(directory, "take_*.mp4"))
+        timestamps = []
+        
+        # A slow consumer must not make the capture drop frames
+        def on_frame(frame, timestamp):
+            timestamps.append(timestamp)
+            time.sleep(0.002)
+        
+        capture.add_frame_callback(on_frame)
+        started = capture.start()
+        assert started, "Failed to start video file capture"
+        
+        finished = capture.wait(timeout=30.0)
+        capture.stop()
+    
+    assert finished, "Video file capture did not finish"
+    
+    print(f"Read {len(timestamps)} frames from {len(capture.paths)} files")
+    assert len(timestamps) == 2 * frames and capture.frame_ring.dropped_frames == 0, "Frames were dropped"
+    
+    expected = np.arange(2 * frames) * 1000.0 / fps
+    assert np.allclose(timestamps, expected), f"Timestamps do not follow the source: {timestamps[:5]}"
+    
+    print("Video file capture test passed")
+
+def test_segment_plan(frame_count=1000, fps=25.0):
+    """Test that worker segments cover every frame once, with warm-up overlap."""
+    print("Testing segment plan...")
+    
+    for workers in [1, 4, 16]:
+        segments = plan_segments(frame_count, fps, workers, segment_seconds=10.0, overlap_seconds=1.0)
+        
+        covered = []
+        for warmup_start, start, end in segments:
+            covered.extend(range(start, frame_count if end is None else end))
+            assert warmup_start == max(0, start - 25), f"Wrong warm-up for segment starting at {start}"
+        
+        assert covered == list(range(frame_count)) and segments[-1][2] is None, \
+            f"Segments for {workers} workers do not cover every frame once"
+        assert len(segments) >= min(workers, frame_count), f"Only {len(segments)} segments for {workers} workers"
+    
+    print("Segment plan test passed")
+
+def test_video_file_range(frames=40, fps=25.0):
+    """Test reading a frame range of a video file."""
+    print("Testing video file frame range...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "take.mp4")
+        write_test_video(path, frames, fps)
+        
+        capture = VideoFileCapture(path, start_frame=10, end_frame=25)
+        timestamps = []
+        capture.add_frame_callback(lambda frame, timestamp: timestamps.append(timestamp))
+        finished = capture.start() and capture.wait(timeout=30.0)
+        capture.stop()
+        assert finished, "Video file capture did not finish"
+    
+    assert np.allclose(timestamps, np.arange(10, 25) * 1000.0 / fps), f"Wrong frames read: {timestamps}"
+    
+    print("Video file frame range test passed")
+
+def test_result_stream(count=10):
+    """Test writing and reading back a result stream file."""
+    print("Testing result stream...")
+    
+    pose = {
+        'landmarks': [{'x': 0.5, 'y': 0.25, 'z': 0.0, 'visibility': 1.0} for _ in range(33)],
+        'timestamp': 0.0,
+        'detection_confidence': 0.9,
+        'tracking_id': 0
+    }
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "take.mpr")
+        with ResultStreamWriter(path) as writer:
+            for i in range(count):
+                writer.write({
+                    'faces': [],
+                    'hands': [],
+                    'pose': [pose] if i % 2 == 0 else [],
+                    'frame_timestamp': i * 40.0,
+                    'frame_index': i,
+                    'source_dimensions': (160, 120)
+                })
+        
+        results = list(read_result_stream(path))
+    
+    assert [result['frame_index'] for result in results] == list(range(count)), "Results are missing or out of order"
+    assert results[3]['frame_timestamp'] == 120.0 and len(results[4]['pose']) == 1 and not results[5]['pose'], \
+        "Result contents do not match"
+    assert results[0]['pose'][0]['landmarks'][0]['y'] == 0.25, "Landmarks do not match"
+    
+    print("Result stream test passed")
+
+class SkippingPreprocessor(FramePreprocessor):
+    """Frame preprocessor that drops the frames at the given timestamps, like a full buffer ring."""
+    
+    def __init__(self, skipped_timestamps):
+        super().__init__()
+        self.skipped_timestamps = set(skipped_timestamps)
+    
+    def process(self, frame, timestamp_ms):
+        if round(timestamp_ms, 3) in self.skipped_timestamps:
+            self.dropped_frames += 1
+            return None
+        return super().process(frame, timestamp_ms)
+
+def create_skipping_processor(skipped, fps):
+    """Create a processor without detectors that skips the given frame indices."""
+    processor = MediaPipeProcessor(enable_face=False, enable_hands=False, enable_pose=False)
+    processor.preprocessor = SkippingPreprocessor(round(i * 1000.0 / fps, 3) for i in skipped)
+    return processor
+
+def test_frame_indices(frames=40, fps=25.0):
+    """Test that results keep their frame's index in the file when frames are skipped."""
+    print("Testing result frame indices...")
+    
+    skipped = {3, 12, 13, 27}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "take.mp4")
+        write_test_video(path, frames, fps)
+        
+        # Whole file and a frame range
+        for start_frame, end_frame in ((0, None), (5, 30)):
+            processor = create_skipping_processor(skipped, fps)
+            results = []
+            processed = run_video_file(processor, path, results.append, start_frame, end_frame)
+            assert processed, "Video file was not processed"
+            
+            expected = [i for i in range(start_frame, end_frame or frames) if i not in skipped]
+            indices = [result.frame_index for result in results]
+            assert indices == expected, f"Wrong frame indices for frames {start_frame}-{end_frame}: {indices}"
+            timestamps = [result.frame_timestamp for result in results]
+            assert np.allclose(timestamps, np.array(expected) * 1000.0 / fps), "Indices do not match the timestamps"
+        
+        # Segments drop their warm-up results by frame index
+        batch_processing.segment_processor = create_skipping_processor(skipped, fps)
+        try:
+            messages = batch_processing._process_segment(path, 5, 14, 30)
+        finally:
+            batch_processing.segment_processor = None
+        indices = [decode_result(message)['frame_index'] for message in messages]
+        assert indices == [i for i in range(14, 30) if i not in skipped], f"Wrong segment frame indices: {indices}"
+        
+        # Pipelined processors deliver results after the capture has moved on
+        processor = MediaPipeProcessor(enable_face=False, enable_hands=False, enable_pose=False, pipelined=True)
+        try:
+            run_video_file(processor, path, results.append)
+            raise AssertionError("Pipelined processor was accepted")
+        except ValueError:
+            pass
+    
+    print("Result frame indices test passed")
+
+def test_failed_file(frames=20, fps=25.0):
+    """Test that a failed file leaves no partial result stream."""
+    print("Testing failed file processing...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        output_dir = os.path.join(directory, "results")
+        batch = BatchProcessor(output_dir=output_dir, enable_face=False, enable_hands=False, enable_pose=False)
+        
+        # The video cannot be opened
+        missing = os.path.join(directory, "missing.mp4")
+        output_path = batch.process_file(missing)
+        assert output_path is None, "Missing video was processed"
+        assert not os.path.exists(batch.get_output_path(missing)), "Partial result stream was left behind"
+        
+        # Processing raises
+        path = os.path.join(directory, "take.mp4")
+        write_test_video(path, frames, fps)
+        batch.processor.pipelined = True
+        output_path = batch.process_file(path)
+        assert output_path is None, "Failed video was processed"
+        assert not os.path.exists(batch.get_output_path(path)), "Partial result stream was left behind"
+        
+        # A processed file keeps its result stream
+        batch.processor.pipelined = False
+        output_path = batch.process_file(path)
+        assert output_path is not None and os.path.exists(output_path), "Result stream was not written"
+        indices = [result['frame_index'] for result in read_result_stream(output_path)]
+        assert indices == list(range(frames)), f"Wrong frame indices in the result stream: {indices}"
+    
+    print("Failed file processing test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test offline batch processing")
+    parser.parse_args()
+    
+    try:
+        test_video_file_capture()
+        test_video_file_range()
+        test_segment_plan()
+        test_result_stream()
+        test_frame_indices()
+        test_failed_file()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Batch processing test passed")
+    else:
+        print("Batch processing test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test script for the stream broker.
+This script publishes into a broker and checks that subscribers only receive
+the topics they subscribed to.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.broker import StreamBroker
+from src.mediapipe_module.data_streaming import ZMQStreamer
+
+def test_topic_filtering(frontend_port=5575, backend_port=5576, count=20):
+    """Test fan-out through the broker with per-subscriber topic filters."""
+    print("Testing broker topic filtering...")
+    
+    broker = StreamBroker(frontend_port=frontend_port, backend_port=backend_port)
+    started = broker.start()
+    assert started, "Failed to start broker"
+    
+    # Publishers connect to the broker frontend
+    publishers = {
+        channel: ZMQStreamer(mode="client", port=frontend_port, socket_type="PUB", topic=f"mediapipe/{channel}")
+        for channel in ["face", "hands"]
+    }
+    
+    # Subscribers connect to the broker backend with different filters
+    subscribers = {
+        'face': ZMQStreamer(mode="client", port=backend_port, socket_type="SUB", subscriptions=["mediapipe/face"]),
+        'all': ZMQStreamer(mode="client", port=backend_port, socket_type="SUB", topic="mediapipe")
+    }
+    received = {name: [] for name in subscribers}
+    for name, subscriber in subscribers.items():
+        subscriber.add_message_callback(received[name].append)
+    
+    for streamer in [*publishers.values(), *subscribers.values()]:
+        streamer.start()
+    time.sleep(0.5)  # Let subscriptions reach the publishers
+    
+    subscriptions = broker.get_subscriptions()
+    
+    for i in range(count):
+        for channel, publisher in publishers.items():
+            publisher.send_message({'channel': channel, 'frame_index': i})
+        time.sleep(0.005)
+    time.sleep(0.3)
+    
+    forwarded = broker.get_broker_stats()['message_count']
+    for streamer in [*publishers.values(), *subscribers.values()]:
+        streamer.stop()
+    broker.stop()
+    
+    print(f"Subscriptions: {subscriptions}, forwarded {forwarded} messages")
+    assert subscriptions == {'mediapipe/face': 1, 'mediapipe': 1}, "Wrong subscriptions"
+    
+    face_channels = {data['channel'] for data in received['face']}
+    assert len(received['face']) == count and face_channels == {'face'}, \
+        f"Face subscriber received {len(received['face'])} messages from {face_channels}"
+    
+    assert len(received['all']) == 2 * count and forwarded == 2 * count, \
+        f"Subscriber of all topics received {len(received['all'])} messages"
+    
+    print("Broker topic filtering test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test stream broker")
+    parser.parse_args()
+    
+    try:
+        test_topic_filtering()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Broker test passed")
+    else:
+        print("Broker test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
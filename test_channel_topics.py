@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Test script for per-channel topics.
+This script replays results through a streamer that publishes each channel
+on its own topic and checks channel filtering and re-association.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.batch_processing import ResultStreamWriter
+from src.mediapipe_module.replay import ResultReplayer
+from src.mediapipe_module.data_streaming import MediaPipeStreamer, ZMQStreamer, ChannelMerger
+from src.mediapipe_module import MediaPipeModule
+
+def create_entry(i, count, **fields):
+    """Create a detection entry whose landmarks hold the frame number."""
+    return {
+        'landmarks': [{'x': i * 0.01, 'y': 0.5, 'z': 0.0, 'visibility': 1.0}] * count,
+        'detection_confidence': 0.9,
+        **fields
+    }
+
+def write_results(path, frames=60, frame_time=20.0):
+    """Write a result stream with a face, a hand and a pose in every frame."""
+    with ResultStreamWriter(path) as writer:
+        for i in range(frames):
+            writer.write({
+                'faces': [create_entry(i, 478)],
+                'hands': [create_entry(i, 21, handedness='Right', hand_flag=1)],
+                'pose': [create_entry(i, 33)],
+                'frame_timestamp': i * frame_time,
+                'frame_index': i,
+                'source_dimensions': (640, 480)
+            })
+
+def test_channel_topics(port=5577, frames=60):
+    """Test that subscribers receive only their channels and can merge them by frame."""
+    print("Testing channel topics...")
+    
+    hands_messages = []
+    merged_frames = []
+    merger = ChannelMerger(2)
+    
+    def on_face_or_pose(data):
+        merged = merger.add(data)
+        if merged is not None:
+            merged_frames.append(merged)
+    
+    subscribers = [
+        ZMQStreamer(mode="client", port=port, socket_type="SUB", serializer="delta",
+                    subscriptions=["mediapipe/hands"]),
+        ZMQStreamer(mode="client", port=port, socket_type="SUB", serializer="delta",
+                    subscriptions=["mediapipe/face", "mediapipe/pose"])
+    ]
+    subscribers[0].add_message_callback(hands_messages.append)
+    subscribers[1].add_message_callback(on_face_or_pose)
+    for subscriber in subscribers:
+        subscriber.start()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "take.mpr")
+        write_results(path, frames)
+        
+        replayer = ResultReplayer(path, speed=1.0)
+        streamer = MediaPipeStreamer(port=port, serializer="delta", processor=replayer, channel_topics=True)
+        started = streamer.start()
+        assert started, "Failed to start streamer"
+        replayer.wait(timeout=10.0)
+        time.sleep(0.2)
+        
+        topic_serializers = streamer.streamer.topic_serializers
+        streamer.stop()
+    
+    for subscriber in subscribers:
+        subscriber.stop()
+    
+    print(f"Received {len(hands_messages)} hand messages and {len(merged_frames)} merged frames")
+    assert sorted(topic_serializers) == ['mediapipe/face', 'mediapipe/hands', 'mediapipe/pose'], \
+        f"Wrong publisher topics: {sorted(topic_serializers)}"
+    
+    # Each channel keeps its own delta keyframes
+    assert all(topic_serializers[f"mediapipe/{channel}"].encoder.delta_count > 0
+               for channel in ["face", "hands", "pose"]), "Channel topics did not send deltas"
+    
+    assert len(hands_messages) >= frames // 4 and len(merged_frames) >= frames // 4, \
+        "Too few messages were received"
+    
+    assert all(not data['faces'] and not data['pose'] and len(data['hands']) == 1 for data in hands_messages), \
+        "Hands subscriber received other channels"
+    
+    for data in merged_frames:
+        assert len(data['faces']) == 1 and len(data['pose']) == 1 and not data['hands'], \
+            f"Frame {data['frame_index']} was not merged from face and pose"
+        
+        expected = data['frame_index'] * 0.01
+        assert (abs(data['faces'][0]['landmarks'].x[0] - expected) <= 0.001
+                and abs(data['pose'][0]['landmarks'].x[0] - expected) <= 0.001), \
+            f"Frame {data['frame_index']} merged channels of different frames"
+    
+    assert merged_frames[-1]['frame_index'] == frames - 1, "Last frame was not merged"
+    
+    print("Channel topics test passed")
+
+def test_merger_restart():
+    """Test that merging resumes after the publisher restarts its frame counter."""
+    print("Testing channel merger restart...")
+    
+    merger = ChannelMerger(2)
+    
+    def merge_frames(indices, timestamp_offset=0.0):
+        """Add the face and pose messages of each frame and return the merged frame indices."""
+        merged = []
+        for i in indices:
+            for key in ['faces', 'pose']:
+                data = {'faces': [], 'hands': [], 'pose': [], 'frame_index': i,
+                        'frame_timestamp': timestamp_offset + i * 20.0, 'source_dimensions': (640, 480)}
+                data[key] = [{'frame': i}]
+                result = merger.add(data)
+                if result is not None:
+                    merged.append(result['frame_index'])
+        return merged
+    
+    merged = merge_frames(range(501))
+    assert merged == list(range(501)), "Frames were not merged in order"
+    
+    # A message lagging behind the current frame is dropped
+    merged = merge_frames([499])
+    assert not merged and merger.restart_count == 0, \
+        "Late message was merged or taken for a restart"
+    
+    # Restarted counter with restarted timestamps, e.g. a take replayed again
+    merged = merge_frames(range(10))
+    assert merged == list(range(10)) and merger.restart_count == 1, \
+        "Frames after a restarted frame counter were not merged"
+    
+    # Restart by fewer frames than max_lag, recognized by the newer timestamp
+    merged = merge_frames(range(5), timestamp_offset=60000.0)
+    assert merged == list(range(5)) and merger.restart_count == 2, \
+        "Frames after a short restart were not merged"
+    
+    print("Channel merger restart test passed")
+
+def receive_pose(streamer, replayer, port, serializer):
+    """Stream a replay and return the pose messages a subscriber decodes with the serializer."""
+    received = []
+    subscriber = ZMQStreamer(mode="client", port=port, socket_type="SUB", serializer=serializer,
+                             subscriptions=["mediapipe/pose"])
+    subscriber.add_message_callback(received.append)
+    subscriber.start()
+    
+    if streamer.start():
+        replayer.wait(timeout=10.0)
+        time.sleep(0.2)
+        streamer.stop()
+    
+    subscriber.stop()
+    return received
+
+def test_configure_serializer(port=5578, frames=30):
+    """Test that a serializer changed through configure() is used for every topic."""
+    print("Testing serializer configuration...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "take.mpr")
+        write_results(path, frames)
+        
+        module = MediaPipeModule()
+        replayer = ResultReplayer(path, speed=1.0)
+        module.streamer = MediaPipeStreamer(port=port, processor=replayer, channel_topics=True)
+        
+        # Stream once with pickle so serializers are forked for the channel topics
+        pickled = receive_pose(module.streamer, replayer, port, "pickle")
+        
+        configured = module.configure({'serializer': 'binary'})
+        assert configured, "Failed to configure serializer"
+        decoded = receive_pose(module.streamer, replayer, port, "binary")
+    
+    print(f"Received {len(pickled)} pickle and {len(decoded)} binary pose messages")
+    assert pickled and decoded, "Too few messages were received"
+    
+    # Binary messages decode to LandmarkArray landmarks
+    for data in decoded:
+        landmarks = data['pose'][0]['landmarks']
+        assert hasattr(landmarks, 'x') and abs(landmarks.x[0] - data['frame_index'] * 0.01) <= 1e-6, \
+            f"Frame {data['frame_index']} was not sent with the configured serializer"
+    
+    print("Serializer configuration test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test per-channel topics")
+    parser.parse_args()
+    
+    try:
+        test_merger_restart()
+        test_channel_topics()
+        test_configure_serializer()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Per-channel topics test passed")
+    else:
+        print("Per-channel topics test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for subscriber-side conflation.
+This script publishes delta-encoded results faster than a slow subscriber
+handles them and checks that only recent results are processed.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.data_streaming import ZMQStreamer
+from src.mediapipe_module.wire_format import DeltaSerializer
+
+def create_result(i):
+    """Create a result whose pose landmarks hold the frame number."""
+    return {
+        'faces': [],
+        'hands': [],
+        'pose': [{
+            'landmarks': [{'x': i * 0.001, 'y': 0.5, 'z': 0.0, 'visibility': 1.0}] * 33,
+            'detection_confidence': 0.9
+        }],
+        'frame_timestamp': i * 5.0,
+        'frame_index': i,
+        'source_dimensions': (640, 480)
+    }
+
+def test_conflation(port=5574, count=100, interval=0.002, consumer_delay=0.05):
+    """Test that a slow subscriber skips queued results but still decodes deltas."""
+    print("Testing subscriber conflation...")
+    
+    publisher = ZMQStreamer(mode="server", port=port, socket_type="PUB",
+                            serializer=DeltaSerializer(keyframe_interval=10))
+    subscriber = ZMQStreamer(mode="client", port=port, socket_type="SUB",
+                             serializer="delta", conflate=True)
+    
+    received = []
+    done = threading.Event()
+    
+    def on_message(data):
+        received.append((data['frame_index'], float(data['pose'][0]['landmarks'].x[0])))
+        if data['frame_index'] == count - 1:
+            done.set()
+        time.sleep(consumer_delay)
+    
+    subscriber.add_message_callback(on_message)
+    started = publisher.start() and subscriber.start()
+    assert started, "Failed to start streamers"
+    time.sleep(0.5)  # Let the subscriber connect before publishing
+    
+    for i in range(count):
+        publisher.send_message(create_result(i))
+        time.sleep(interval)
+    
+    finished = done.wait(timeout=5.0)
+    skipped = subscriber.get_skipped_frames()
+    publisher.stop()
+    subscriber.stop()
+    
+    print(f"Processed {len(received)} of {count} results, skipped {skipped}")
+    assert finished, "Last result was not processed"
+    
+    indices = [index for index, _ in received]
+    assert indices == sorted(indices) and len(received) + skipped == count, \
+        f"Results are out of order or missing: {indices}"
+    
+    assert len(received) <= count // 2, "Queued results were not skipped"
+    
+    assert all(abs(x - index * 0.001) <= 0.0005 for index, x in received), \
+        "Deltas were not decoded against the right keyframe"
+    
+    print("Subscriber conflation test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test subscriber conflation")
+    parser.parse_args()
+    
+    try:
+        test_conflation()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Conflation test passed")
+    else:
+        print("Conflation test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
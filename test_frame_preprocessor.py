@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Test script for the frame preprocessor.
+This script tests cropping, resizing and colour conversion, the dimensions
+landmarks are normalized to, buffer reuse and drops, and a producer converting
+frames while consumers hold earlier images.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.landmark_detection import FramePreprocessor
+
+def create_frame(width=64, height=48):
+    """Create a BGR test frame with distinct blue, green and red gradients."""
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = np.arange(width, dtype=np.uint8)[np.newaxis, :]
+    frame[:, :, 1] = np.arange(height, dtype=np.uint8)[:, np.newaxis]
+    frame[:, :, 2] = 200
+    return frame
+
+def test_conversion():
+    """Test colour conversion, cropping, resizing and the source dimensions of each."""
+    print("Testing frame preprocessor conversion...")
+    
+    frame = create_frame()
+    
+    # Full frame: BGR to RGB at the frame size
+    preprocessor = FramePreprocessor()
+    with preprocessor.process(frame, 10.0) as image_ref:
+        assert np.array_equal(image_ref.frame, frame[:, :, ::-1]), "Frame was not converted to RGB"
+        assert not image_ref.frame.flags.writeable and image_ref.timestamp == 10.0, \
+            "Image is writable or has the wrong timestamp"
+    assert preprocessor.get_source_dimensions(frame) == (64, 48), \
+        f"Wrong source dimensions: {preprocessor.get_source_dimensions(frame)}"
+    
+    # Crop region: detection runs on the region and landmarks are normalized to it
+    preprocessor = FramePreprocessor(crop_region=(8, 4, 32, 24))
+    with preprocessor.process(frame, 20.0) as image_ref:
+        assert np.array_equal(image_ref.frame, frame[4:28, 8:40, ::-1]), "Crop region was not applied"
+    assert preprocessor.get_source_dimensions(frame) == (32, 24), \
+        f"Wrong cropped source dimensions: {preprocessor.get_source_dimensions(frame)}"
+    
+    # Input size: the image is resized, but landmarks stay normalized to the crop
+    # region, so the resize does not change their source coordinates
+    preprocessor = FramePreprocessor(input_size=(16, 12), crop_region=(8, 4, 32, 24))
+    with preprocessor.process(frame, 30.0) as image_ref:
+        assert image_ref.frame.shape == (12, 16, 3), f"Wrong resized shape: {image_ref.frame.shape}"
+        # Red channel is constant and every column of the crop region is
+        # averaged into the blue gradient, which keeps increasing left to right
+        blue = image_ref.frame[0, :, 2].astype(int)
+        assert np.all(image_ref.frame[:, :, 0] == 200) and np.all(np.diff(blue) > 0), \
+            "Resized image does not match the crop region"
+    assert preprocessor.get_source_dimensions(frame) == (32, 24), \
+        f"Resize changed the source dimensions: {preprocessor.get_source_dimensions(frame)}"
+    
+    # Changing the settings at runtime resizes the buffers on the next frame
+    preprocessor.crop_region = None
+    preprocessor.input_size = (32, 24)
+    with preprocessor.process(frame, 40.0) as image_ref:
+        assert image_ref.frame.shape == (24, 32, 3), f"Buffers were not resized: {image_ref.frame.shape}"
+    assert preprocessor.get_source_dimensions(frame) == (64, 48), \
+        "Source dimensions did not follow the new crop region"
+    
+    print("Frame preprocessor conversion test passed")
+
+def test_buffer_reuse(num_buffers=3):
+    """Test that held images keep their buffers and frames are dropped when all are held."""
+    print("Testing frame preprocessor buffer reuse...")
+    
+    preprocessor = FramePreprocessor(num_buffers=num_buffers)
+    frame = create_frame()
+    
+    # Each held image keeps its own buffer
+    held = []
+    for index in range(num_buffers):
+        frame[0, 0, 0] = index
+        image_ref = preprocessor.process(frame, float(index))
+        assert image_ref is not None, f"Frame {index} was dropped with free buffers"
+        held.append(image_ref)
+    
+    image_ref = preprocessor.process(frame, 99.0)
+    assert image_ref is None and preprocessor.dropped_frames == 1, \
+        f"Frame was not dropped with every buffer held: {preprocessor.dropped_frames} drops"
+    
+    for index, image_ref in enumerate(held):
+        assert image_ref.frame[0, 0, 2] == index, f"Held image {index} was overwritten"
+    
+    # Releasing an image frees its buffer for the next frame
+    held[0].release()
+    image_ref = preprocessor.process(frame, 100.0)
+    assert image_ref is not None and image_ref._slot == held[0]._slot and preprocessor.dropped_frames == 1, \
+        "Released buffer was not reused"
+    image_ref.release()
+    for image_ref in held[1:]:
+        image_ref.release()
+    
+    # Released images are reused without reallocating
+    buffers = list(preprocessor.ring.buffers)
+    for index in range(20):
+        preprocessor.process(frame, 200.0 + index).release()
+    reused = all(a is b for a, b in zip(buffers, preprocessor.ring.buffers))
+    assert reused and preprocessor.dropped_frames == 1, \
+        "Buffers were reallocated or frames dropped with released images"
+
+    
+    print("Frame preprocessor buffer reuse test passed")
+
+def test_concurrent_consumers(frames=1000, consumers=2, num_buffers=4):
+    """Test a producer converting frames while consumer threads hold earlier images."""
+    print("Testing frame preprocessor with concurrent consumers...")
+    
+    preprocessor = FramePreprocessor(num_buffers=num_buffers)
+    frame = create_frame()
+    images = []
+    images_lock = threading.Lock()
+    stop_event = threading.Event()
+    errors = []
+    counts = {'consumed': 0}
+    
+    def producer():
+        for index in range(frames):
+            frame[:, :, 2] = index % 256
+            image_ref = preprocessor.process(frame, float(index))
+            if image_ref is None:
+                time.sleep(0.0001)
+                continue
+            with images_lock:
+                images.append(image_ref)
+        stop_event.set()
+    
+    def consumer():
+        while not stop_event.is_set() or images:
+            with images_lock:
+                image_ref = images.pop(0) if images else None
+            if image_ref is None:
+                time.sleep(0.0001)
+                continue
+            
+            with image_ref:
+                # The image must keep the frame it was converted from while it is held
+                value = int(image_ref.timestamp) % 256
+                for _ in range(2):
+                    if not np.all(image_ref.frame[:, :, 0] == value):
+                        errors.append(f"Image of frame {int(image_ref.timestamp)} changed while held")
+                        return
+                    time.sleep(0.0002)
+            
+            with images_lock:
+                counts['consumed'] += 1
+    
+    threads = [threading.Thread(target=consumer) for _ in range(consumers)]
+    threads.append(threading.Thread(target=producer))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60.0)
+    
+    print(f"Converted {counts['consumed']} frames, dropped {preprocessor.dropped_frames} frames")
+    assert not errors, errors[0]
+    
+    assert not any(thread.is_alive() for thread in threads), "Threads did not finish"
+    
+    # Every frame is either converted and consumed or counted as dropped
+    assert counts['consumed'] + preprocessor.dropped_frames == frames, \
+        f"{frames - counts['consumed'] - preprocessor.dropped_frames} frames are unaccounted for"
+    
+    assert not any(preprocessor.ring.ref_counts), f"Buffers still referenced: {preprocessor.ring.ref_counts}"
+    
+    print("Frame preprocessor concurrent consumers test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test frame preprocessor")
+    parser.parse_args()
+    
+    try:
+        test_conversion()
+        test_buffer_reuse()
+        test_concurrent_consumers()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Frame preprocessor test passed")
+    else:
+        print("Frame preprocessor test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
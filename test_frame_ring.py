@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Test script for the zero-copy frame ring.
+This script tests slot reuse and release, exhaustion and a concurrent writer
+and readers that must never see a borrowed frame being overwritten.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.video_capture import FrameRing
+
+def write_frame(ring, value):
+    """Fill a free slot with a value and publish it; return the slot or None if every slot is busy."""
+    slot = ring.acquire_slot()
+    if slot is None:
+        return None
+    ring.buffer(slot)[:] = value
+    ring.publish(slot, float(value))
+    return slot
+
+def test_slot_reuse(size=3, shape=(4, 4, 3)):
+    """Test that borrowed slots are skipped by the writer until released."""
+    print("Testing frame ring slot reuse...")
+    
+    ring = FrameRing(size)
+    slot = ring.acquire_slot()
+    frame_ref = ring.borrow()
+    assert slot is None and frame_ref is None, "Unallocated ring returned a slot or frame"
+    
+    ring.allocate(shape)
+    write_frame(ring, 1)
+    
+    # The latest frame is borrowed read-only and keeps its contents
+    first = ring.borrow()
+    assert first is not None and first.sequence == 1 and np.all(first.frame == 1), \
+        "Latest frame was not borrowed"
+    assert not first.frame.flags.writeable, "Borrowed frame is writable"
+    
+    # The writer never picks the latest or a borrowed slot
+    for value in range(2, 20):
+        slot = write_frame(ring, value)
+        assert slot is not None and slot != first._slot, f"Writer reused the borrowed slot at frame {value}"
+    assert np.all(first.frame == 1), "Borrowed frame was overwritten"
+    
+    # Borrowing the same slot twice needs two releases, and releasing one
+    # reference twice must not free the slot borrowed by the other
+    second = ring.borrow()
+    third = ring.borrow()
+    slot = second._slot
+    second.release()
+    second.release()
+    assert third._slot == slot and ring.ref_counts[slot] == 1, \
+        f"Wrong reference count after releasing one reference: {ring.ref_counts[slot]}"
+    with third:
+        pass
+    assert ring.ref_counts[slot] == 0 and third.frame is None, "Context manager did not release the slot"
+    
+    first.release()
+    assert ring.ref_counts[first._slot] == 0, "Released slot is still referenced"
+    
+    # min_sequence filters frames that were already seen
+    latest = ring.get_latest_sequence()
+    frame_ref = ring.borrow(latest + 1)
+    assert frame_ref is None, "Borrowed a frame older than min_sequence"
+    
+    # Dropping a reference without releasing it frees the slot too
+    slot = ring.borrow()._slot
+    assert ring.ref_counts[slot] == 0, "Collected reference did not release its slot"
+    
+    print("Frame ring slot reuse test passed")
+
+def test_exhaustion(size=3, shape=(4, 4, 3)):
+    """Test that a ring with every slot borrowed reports no free slot and recovers."""
+    print("Testing frame ring exhaustion...")
+    
+    ring = FrameRing(size)
+    ring.allocate(shape)
+    
+    refs = []
+    for value in range(1, size + 1):
+        slot = write_frame(ring, value)
+        assert slot is not None, f"No free slot for frame {value}"
+        refs.append(ring.borrow())
+    
+    slot = ring.acquire_slot()
+    assert slot is None, "Writer got a slot while every slot was borrowed"
+    
+    # Releasing one older frame frees exactly that slot
+    refs[0].release()
+    slot = ring.acquire_slot()
+    assert slot == refs[0]._slot, "Released slot was not reused"
+    
+    # Reallocation starts a new generation; stale references are ignored on release
+    ring.allocate((8, 8, 3))
+    slot = ring.acquire_slot()
+    frame_ref = ring.borrow()
+    assert slot is not None and frame_ref is None, "Reallocated ring kept old slot state"
+
+    write_frame(ring, 7)
+    new_ref = ring.borrow()
+    for ref in refs[1:]:
+        ref.release()
+    assert ring.ref_counts[new_ref._slot] == 1 and new_ref.frame.shape == (8, 8, 3), \
+        "Stale release changed the new generation"
+    new_ref.release()
+    
+    print("Frame ring exhaustion test passed")
+
+def test_concurrent_access(size=4, frames=3000, readers=3, shape=(32, 32, 3)):
+    """Test a writer thread and reader threads holding frames concurrently."""
+    print("Testing concurrent frame ring access...")
+    
+    ring = FrameRing(size)
+    ring.allocate(shape, np.int32)
+    stop_event = threading.Event()
+    errors = []
+    counts = {'written': 0, 'dropped': 0, 'read': 0}
+    lock = threading.Lock()
+    
+    def writer():
+        value = 1
+        while value <= frames:
+            if write_frame(ring, value) is None:
+                ring.dropped_frames += 1
+                time.sleep(0.0001)
+                continue
+            value += 1
+        counts['written'] = frames
+        counts['dropped'] = ring.dropped_frames
+        stop_event.set()
+    
+    def reader():
+        last_sequence = 0
+        while not stop_event.is_set():
+            ref = ring.borrow(last_sequence + 1)
+            if ref is None:
+                time.sleep(0.0001)
+                continue
+            
+            with ref:
+                # Frame contents must stay intact for as long as the slot is borrowed
+                value = int(ref.timestamp)
+                for _ in range(3):
+                    if not np.all(ref.frame == value):
+                        errors.append(f"Frame {value} changed while borrowed")
+                        return
+                    time.sleep(0.0002)
+                
+                if ref.sequence <= last_sequence:
+                    errors.append("Sequence numbers went backwards")
+                    return
+                last_sequence = ref.sequence
+            
+            with lock:
+                counts['read'] += 1
+    
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads.append(threading.Thread(target=writer))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60.0)
+    
+    print(f"Wrote {counts['written']} frames, writer found every slot busy {counts['dropped']} times, "
+          f"readers borrowed {counts['read']} frames")
+    assert not errors, errors[0]
+    
+    assert not any(thread.is_alive() for thread in threads) and counts['read'] != 0, \
+        "Threads did not finish or nothing was read"
+    
+    assert not any(ring.ref_counts), f"Slots still referenced: {ring.ref_counts}"
+    
+    print("Concurrent frame ring access test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test zero-copy frame ring")
+    parser.parse_args()
+    
+    try:
+        test_slot_reuse()
+        test_exhaustion()
+        test_concurrent_access()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Frame ring test passed")
+    else:
+        print("Frame ring test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
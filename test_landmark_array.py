@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for the NumPy-backed landmark array.
+This script tests dictionary-style access, conversion from landmark
+dictionaries and which operations share memory with the array.
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.landmark_array import LandmarkArray, as_landmark_array
+from src.mediapipe_module.landmark_detection import PoseData
+
+def create_dicts(count=5):
+    """Create landmark dictionaries with distinct values, without visibility on odd landmarks."""
+    landmarks = []
+    for i in range(count):
+        landmark = {'x': i * 0.25, 'y': 1.0 - i * 0.125, 'z': -i * 0.5}
+        if i % 2 == 0:
+            landmark['visibility'] = i * 0.125
+        landmarks.append(landmark)
+    return landmarks
+
+def test_dict_access():
+    """Test that indexing, iteration and to_dicts return the landmark dictionaries."""
+    print("Testing dictionary-style access...")
+    
+    landmarks = create_dicts()
+    array = LandmarkArray.from_dicts(landmarks)
+    expected = [dict(landmark, visibility=landmark.get('visibility', 1.0)) for landmark in landmarks]
+    
+    assert len(array) == len(landmarks) and array.data.dtype == np.float32, "Wrong length or dtype"
+    assert array.to_dicts() == expected, f"to_dicts mismatch: {array.to_dicts()}"
+    assert list(array) == expected, "Iteration does not yield the landmark dictionaries"
+    assert array[2] == expected[2] and array[-1] == expected[-1], "Indexing mismatch"
+    assert array[1]['visibility'] == 1.0, "Missing visibility did not default to 1.0"
+    assert list(array[2]) == list(LandmarkArray.FIELDS), f"Wrong landmark keys: {list(array[2])}"
+    
+    # Column properties match the dictionary values
+    assert np.array_equal(array.x, [landmark['x'] for landmark in expected]), "x column mismatch"
+    assert np.array_equal(array.visibility, [landmark['visibility'] for landmark in expected]), \
+        "visibility column mismatch"
+    assert array.xyz.shape == (len(landmarks), 3), f"Wrong xyz shape: {array.xyz.shape}"
+    
+    # Slices are landmark arrays too
+    part = array[1:3]
+    assert isinstance(part, LandmarkArray) and part.to_dicts() == expected[1:3], "Slice mismatch"
+    
+    assert LandmarkArray.empty(3).data.shape == (3, 4) and len(LandmarkArray.from_dicts([])) == 0, \
+        "Empty arrays have the wrong shape"
+    
+    print("Dictionary-style access test passed")
+
+def test_conversion():
+    """Test input validation and conversion of both landmark formats."""
+    print("Testing landmark conversion...")
+    
+    # Other shapes are rejected
+    for data in (np.zeros((5, 3)), np.zeros(4), np.zeros((2, 4, 1))):
+        try:
+            LandmarkArray(data)
+        except ValueError:
+            continue
+        raise AssertionError(f"Array of shape {data.shape} was accepted")
+    
+    # as_landmark_array passes arrays and None through and converts dictionaries
+    array = LandmarkArray.from_dicts(create_dicts())
+    assert as_landmark_array(array) is array and as_landmark_array(None) is None, \
+        "Landmark array or None was converted"
+    converted = as_landmark_array(create_dicts())
+    assert isinstance(converted, LandmarkArray) and converted.to_dicts() == array.to_dicts(), \
+        "Landmark dictionaries were not converted"
+    
+    # Detection data converts dictionaries and shares visibility with the landmarks
+    pose = PoseData(landmarks=create_dicts(), world_landmarks=create_dicts())
+    assert isinstance(pose.landmarks, LandmarkArray) and isinstance(pose.world_landmarks, LandmarkArray), \
+        "Detection data kept landmark dictionaries"
+    pose.landmarks.data[0, 3] = 0.75
+    assert pose.visibility[0] == 0.75, "Visibility is not a view of the landmarks"
+    
+    print("Landmark conversion test passed")
+
+def test_copy_semantics():
+    """Test which operations share memory with the landmark array."""
+    print("Testing copy semantics...")
+    
+    # float32 (N, 4) data is wrapped without copying, other dtypes are converted
+    data = np.zeros((4, 4), dtype=np.float32)
+    array = LandmarkArray(data)
+    assert np.shares_memory(array.data, data), "float32 data was copied"
+    assert not np.shares_memory(LandmarkArray(data.astype(np.float64)).data, data), \
+        "float64 data was not converted"
+    
+    # Non-contiguous input is made contiguous
+    strided = np.zeros((4, 8), dtype=np.float32)[:, ::2]
+    assert LandmarkArray(strided).data.flags.c_contiguous, "Strided data was not made contiguous"
+    
+    # Columns and slices are views
+    array.x[1] = 2.0
+    array[2:4].data[0, 1] = 3.0
+    array.xyz[3, 2] = 4.0
+    assert data[1, 0] == 2.0 and data[2, 1] == 3.0 and data[3, 2] == 4.0, "Views did not write through"
+    
+    # Dictionaries and copies are independent of the array
+    landmark = array[1]
+    landmarks = array.to_dicts()
+    copied = array.copy()
+    array.x[1] = 5.0
+    assert landmark['x'] == 2.0 and landmarks[1]['x'] == 2.0, "Landmark dictionaries changed with the array"
+    assert copied.x[1] == 2.0 and not np.shares_memory(copied.data, array.data), "Copy shares memory"
+    
+    print("Copy semantics test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test landmark array")
+    parser.parse_args()
+    
+    try:
+        test_dict_access()
+        test_conversion()
+        test_copy_semantics()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Landmark array test passed")
+    else:
+        print("Landmark array test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
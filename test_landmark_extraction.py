@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Test script for bulk landmark extraction.
+This script compares the serialized protobuf fast path and its fallback with
+reading the landmark attributes one by one, on MediaPipe and handcrafted messages.
+"""
+
+import os
+import sys
+import struct
+import argparse
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from mediapipe.framework.formats import landmark_pb2
+
+from src.mediapipe_module.landmark_detection import landmarks_to_array, _parse_serialized_landmarks
+
+def read_attributes(landmark_list):
+    """Read the landmarks one attribute at a time, the reference for every extraction path."""
+    return np.array([[landmark.x, landmark.y, landmark.z, landmark.visibility]
+                     for landmark in landmark_list.landmark], dtype=np.float32).reshape(-1, 4)
+
+def create_landmark_list(count, fields, seed=0, list_type=landmark_pb2.NormalizedLandmarkList):
+    """Create a landmark list where every landmark sets the given fields to random values."""
+    rng = np.random.default_rng(seed)
+    landmark_list = list_type()
+    for _ in range(count):
+        landmark_list.landmark.add(**{field: float(rng.random() - 0.25) for field in fields})
+    return landmark_list
+
+def encode_record(fields):
+    """Encode one landmark list entry from (field number, wire type, value) tuples in the given order."""
+    payload = b''
+    for number, wire_type, value in fields:
+        payload += bytes([number << 3 | wire_type])
+        payload += struct.pack('<f', value) if wire_type == 5 else bytes([value])
+    return bytes([0x0A, len(payload)]) + payload
+
+def check_extraction(landmark_list, fast_path):
+    """Check landmarks_to_array against the attribute reference and which path decodes the list."""
+    expected = read_attributes(landmark_list)
+    array = landmarks_to_array(landmark_list)
+    assert np.array_equal(array.data, expected), f"Extracted landmarks differ:\n{array.data}\n{expected}"
+    
+    without_visibility = landmarks_to_array(landmark_list, with_visibility=False)
+    assert np.array_equal(without_visibility.xyz, expected[:, :3]) and np.all(without_visibility.visibility == 1.0), \
+        "Landmarks without visibility differ"
+    
+    count = len(landmark_list.landmark)
+    if count:
+        parsed = _parse_serialized_landmarks(landmark_list.SerializeToString(), count)
+        assert (parsed is not None) == fast_path, \
+            f"Expected the {'fast path' if fast_path else 'fallback'} for {count} landmarks"
+
+def test_mediapipe_layouts():
+    """Test the landmark layouts MediaPipe produces, including omitted optional fields."""
+    print("Testing MediaPipe landmark layouts...")
+    
+    layouts = [
+        ('x', 'y', 'z', 'visibility'),
+        ('x', 'y', 'z', 'visibility', 'presence'),
+        ('x', 'y', 'z'),
+        ('x', 'y'),
+        ()
+    ]
+    for count in (1, 21, 33, 478):
+        for fields in layouts:
+            check_extraction(create_landmark_list(count, fields, seed=count), fast_path=True)
+            check_extraction(create_landmark_list(count, fields, seed=count, list_type=landmark_pb2.LandmarkList),
+                             fast_path=True)
+    
+    # Optional fields set to zero are still serialized and read back as zero
+    landmark_list = create_landmark_list(5, ('x', 'y', 'z'))
+    for landmark in landmark_list.landmark:
+        landmark.visibility = 0.0
+    check_extraction(landmark_list, fast_path=True)
+    
+    check_extraction(landmark_pb2.NormalizedLandmarkList(), fast_path=False)
+    
+    print("MediaPipe landmark layouts test passed")
+
+def test_irregular_layouts():
+    """Test that lists whose landmarks set different fields fall back to the attribute loop."""
+    print("Testing irregular landmark layouts...")
+    
+    # Visibility only on some landmarks
+    landmark_list = create_landmark_list(10, ('x', 'y', 'z'))
+    for landmark in landmark_list.landmark[::3]:
+        landmark.visibility = 0.5
+    check_extraction(landmark_list, fast_path=False)
+    
+    # Record sizes that add up to a multiple of the landmark count: one 22-byte
+    # and four 17-byte records are 90 bytes, an apparent 18-byte stride
+    landmark_list = create_landmark_list(5, ('x', 'y', 'z'))
+    landmark_list.landmark[0].visibility = 0.75
+    assert len(landmark_list.SerializeToString()) == 90, "Unexpected record sizes"
+    check_extraction(landmark_list, fast_path=False)
+    
+    # Presence on one landmark only
+    landmark_list = create_landmark_list(4, ('x', 'y', 'z', 'visibility'))
+    landmark_list.landmark[3].presence = 0.25
+    check_extraction(landmark_list, fast_path=False)
+    
+    print("Irregular landmark layouts test passed")
+
+def test_handcrafted_records():
+    """Test serialized lists with field orders and fields MediaPipe does not produce."""
+    print("Testing handcrafted landmark records...")
+    
+    count = 6
+    values = np.arange(count * 4, dtype=np.float32).reshape(count, 4) / 8.0
+    
+    # Fields out of field number order and an unknown float field are decoded by tag
+    raw = b''.join(encode_record([(3, 5, z), (6, 5, 9.0), (1, 5, x), (4, 5, v), (2, 5, y)])
+                   for x, y, z, v in values)
+    expected = read_attributes(landmark_pb2.NormalizedLandmarkList.FromString(raw))
+    parsed = _parse_serialized_landmarks(raw, count)
+    assert parsed is not None and np.array_equal(parsed, expected) and np.array_equal(parsed, values), \
+        f"Reordered fields were decoded wrongly:\n{parsed}"
+    
+    # Omitted fields keep the protobuf default of zero
+    raw = b''.join(encode_record([(2, 5, y), (1, 5, x)]) for x, y, _, _ in values)
+    expected = read_attributes(landmark_pb2.NormalizedLandmarkList.FromString(raw))
+    parsed = _parse_serialized_landmarks(raw, count)
+    assert parsed is not None and np.array_equal(parsed, expected), f"Omitted fields were not zero:\n{parsed}"
+    
+    # Non-float fields, records of different lengths and entries of another field are rejected
+    rejected = {
+        'varint field': b''.join(encode_record([(1, 5, x), (6, 0, 1), (2, 5, y)]) for x, y, _, _ in values),
+        'mixed records': b''.join(encode_record([(1, 5, x)] if i % 2 else [(1, 5, x), (2, 5, y), (3, 5, z)])
+                                  for i, (x, y, z, _) in enumerate(values)),
+        'other list field': b''.join(b'\x12' + encode_record([(1, 5, x)])[1:] for x, _, _, _ in values)
+    }
+    for name, raw in rejected.items():
+        assert _parse_serialized_landmarks(raw, count) is None, f"Record layout with a {name} was accepted"
+    
+    print("Handcrafted landmark records test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test bulk landmark extraction")
+    parser.parse_args()
+    
+    try:
+        test_mediapipe_layouts()
+        test_irregular_layouts()
+        test_handcrafted_records()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Landmark extraction test passed")
+    else:
+        print("Landmark extraction test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
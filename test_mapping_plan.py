@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Test script for cached bone mapping plans.
+This script tests that plans are reused, rebuilt after mapping and armature
+changes and leave the armature untouched. Run it inside Blender:
+blender --background --python test_mapping_plan.py
+"""
+
+import os
+import sys
+import bpy
+import argparse
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.mapping_plan import get_mapping_plan, invalidate_mapping_plans, mapping_plans
+
+# Bones of the test armature: name, head, tail, parent, rotation mode
+TEST_BONES = [
+    ("Hips", (0, 0, 1), (0, 0, 1.2), None, 'QUATERNION'),
+    ("Spine", (0, 0, 1.2), (0, 0, 1.6), "Hips", 'XYZ'),
+    ("Head", (0, 0, 1.6), (0, 0, 1.9), "Spine", 'ZXY'),
+    ("LeftHand", (0.6, 0, 1.5), (0.7, 0, 1.5), "Spine", 'AXIS_ANGLE'),
+    ("LeftIndex.L", (0.7, 0, 1.5), (0.8, 0, 1.5), "LeftHand", 'XYZ')
+]
+
+TEST_MAPPING = {
+    "Hips": [23, 24],
+    "Spine": [11, 12],
+    "Head": [0],
+    "LeftHand": [15],
+    "LeftIndex.L": [5, 6],
+    "MissingBone": [1]
+}
+
+def create_test_armature(name="PlanTestArmature"):
+    """Create an armature with the test bones and their rotation modes."""
+    bpy.ops.object.select_all(action='DESELECT')
+    bpy.ops.object.armature_add(enter_editmode=True)
+    armature = bpy.context.active_object
+    armature.name = name
+    
+    edit_bones = armature.data.edit_bones
+    for bone in list(edit_bones):
+        edit_bones.remove(bone)
+    for bone_name, head, tail, parent, _ in TEST_BONES:
+        bone = edit_bones.new(bone_name)
+        bone.head = head
+        bone.tail = tail
+        if parent is not None:
+            bone.parent = edit_bones[parent]
+    
+    bpy.ops.object.mode_set(mode='OBJECT')
+    
+    for bone_name, _, _, _, rotation_mode in TEST_BONES:
+        armature.pose.bones[bone_name].rotation_mode = rotation_mode
+    
+    return armature
+
+def edit_armature(armature, edit):
+    """Run a function on the armature's edit bones and return to object mode."""
+    bpy.context.view_layer.objects.active = armature
+    bpy.ops.object.mode_set(mode='EDIT')
+    edit(armature.data.edit_bones)
+    bpy.ops.object.mode_set(mode='OBJECT')
+    bpy.context.view_layer.update()
+
+def get_rotation_state(armature):
+    """Get the rotation mode and rotation values of every pose bone."""
+    return {
+        pose_bone.name: (
+            pose_bone.rotation_mode,
+            tuple(pose_bone.rotation_quaternion),
+            tuple(pose_bone.rotation_euler),
+            tuple(pose_bone.rotation_axis_angle)
+        )
+        for pose_bone in armature.pose.bones
+    }
+
+def test_plan_contents():
+    """Test the per-bone data of a compiled plan."""
+    print("Testing plan contents...")
+    
+    armature = create_test_armature()
+    plan = get_mapping_plan(armature, TEST_MAPPING)
+    
+    expected_names = [bone_name for bone_name, _, _, _, _ in TEST_BONES]
+    assert plan.bone_names == expected_names, f"Wrong planned bones: {plan.bone_names}"
+    
+    pose_bones = armature.pose.bones
+    assert [pose_bones[row].name for row in plan.pose_bone_rows] == expected_names, "Wrong pose bone rows"
+    assert plan.influence_groups == ['pose', 'pose', 'face', 'hands', 'hands'], \
+        f"Wrong influence groups: {plan.influence_groups}"
+    assert plan.sources == ['pose', 'pose', 'pose', 'pose', 'left_hand'], f"Wrong landmark sources: {plan.sources}"
+    
+    for bone_name, rest_matrix in zip(plan.bone_names, plan.rest_matrices):
+        expected = np.array(armature.data.bones[bone_name].matrix_local)
+        assert np.allclose(rest_matrix, expected, atol=1e-6), f"Wrong rest matrix for {bone_name}"
+    
+    assert get_mapping_plan(armature, TEST_MAPPING) is plan, "Cached plan was not reused"
+    
+    print("Plan contents test passed")
+
+def test_mapping_change():
+    """Test that changing the bone mapping rebuilds the plan."""
+    print("Testing mapping changes...")
+    
+    armature = create_test_armature()
+    mapping = {name: indices[:] for name, indices in TEST_MAPPING.items()}
+    plan = get_mapping_plan(armature, mapping)
+    
+    # Changed landmark indices
+    mapping["Spine"] = [11]
+    changed = get_mapping_plan(armature, mapping)
+    assert changed is not plan and changed.bone_mapping["Spine"] == [11], "Changed landmarks did not rebuild the plan"
+    assert not plan.is_valid(armature, mapping), "Old plan is still valid for the changed mapping"
+    
+    # Landmark lists edited in place; the plan keeps its own copy
+    mapping["Spine"].append(12)
+    edited = get_mapping_plan(armature, mapping)
+    assert edited is not changed and edited.bone_mapping["Spine"] == [11, 12], "Edited landmarks did not rebuild the plan"
+    changed = edited
+    
+    # Removed bone
+    del mapping["Head"]
+    removed = get_mapping_plan(armature, mapping)
+    assert removed is not changed and "Head" not in removed.bone_names, "Removed bone is still planned"
+    
+    # Unchanged mapping reuses the plan
+    assert get_mapping_plan(armature, dict(mapping)) is removed, "Equal mapping rebuilt the plan"
+    
+    print("Mapping change test passed")
+
+def test_armature_change():
+    """Test that editing the armature's bones or using another armature rebuilds the plan."""
+    print("Testing armature changes...")
+    
+    armature = create_test_armature()
+    mapping = dict(TEST_MAPPING, NewBone=[2])
+    plan = get_mapping_plan(armature, mapping)
+    assert "NewBone" not in plan.bone_names, "Missing bone was planned"
+    
+    # Moving a bone keeps the bone count; the depsgraph handler drops the plan
+    def move_head(bones):
+        bones["Head"].tail = (0, 0.5, 1.9)
+    edit_armature(armature, move_head)
+    moved = get_mapping_plan(armature, mapping)
+    assert plan.is_stale and moved is not plan, "Moving a bone did not rebuild the plan"
+    head_row = moved.bone_names.index("Head")
+    expected = np.array(armature.data.bones["Head"].matrix_local)
+    assert np.allclose(moved.rest_matrices[head_row], expected, atol=1e-6), "Rebuilt plan has the old rest matrix"
+    
+    # Adding a mapped bone
+    def add_bone(bones):
+        bone = bones.new("NewBone")
+        bone.head = (0, 0, 1.9)
+        bone.tail = (0, 0, 2.1)
+        bone.parent = bones["Head"]
+    edit_armature(armature, add_bone)
+    added = get_mapping_plan(armature, mapping)
+    assert added is not moved and "NewBone" in added.bone_names, "Added bone is not planned"
+    
+    # Plans are kept per armature object
+    other = create_test_armature("PlanTestArmature.Other")
+    other_plan = get_mapping_plan(other, mapping)
+    assert other_plan is not added and get_mapping_plan(armature, mapping) is added, \
+        "Armatures share a mapping plan"
+    
+    # Invalidation drops the plans of one armature
+    invalidate_mapping_plans(armature.data)
+    assert added.is_stale and not other_plan.is_stale, "Invalidation dropped the wrong plans"
+    assert get_mapping_plan(other, mapping) is other_plan, "Other armature's plan was rebuilt"
+    
+    invalidate_mapping_plans()
+    assert not mapping_plans and other_plan.is_stale, "Not all plans were invalidated"
+    
+    print("Armature change test passed")
+
+def test_rotation_modes():
+    """Test that building plans leaves rotation modes and rotations alone."""
+    print("Testing rotation modes...")
+    
+    armature = create_test_armature()
+    pose_bones = armature.pose.bones
+    pose_bones["Spine"].rotation_euler = (0.1, 0.2, 0.3)
+    pose_bones["Hips"].rotation_quaternion = (0.9, 0.1, 0.2, 0.3)
+    state = get_rotation_state(armature)
+    
+    get_mapping_plan(armature, TEST_MAPPING)
+    assert get_rotation_state(armature) == state, "Building a plan changed the pose"
+    
+    # Rebuilding after a mapping change and an invalidation
+    get_mapping_plan(armature, dict(TEST_MAPPING, Spine=[11]))
+    invalidate_mapping_plans()
+    get_mapping_plan(armature, TEST_MAPPING)
+    assert get_rotation_state(armature) == state, "Rebuilding a plan changed the pose"
+    
+    expected_modes = {bone_name: rotation_mode for bone_name, _, _, _, rotation_mode in TEST_BONES}
+    modes = {pose_bone.name: pose_bone.rotation_mode for pose_bone in pose_bones}
+    assert modes == expected_modes, f"Rotation modes changed: {modes}"
+    
+    print("Rotation modes test passed")
+
+def main():
+    """Main function."""
+    # Blender passes its own arguments before '--'
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+    parser = argparse.ArgumentParser(description="Test mapping plans")
+    parser.parse_args(argv)
+    
+    try:
+        test_plan_contents()
+        test_mapping_change()
+        test_armature_change()
+        test_rotation_modes()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Mapping plan test passed")
+    else:
+        print("Mapping plan test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
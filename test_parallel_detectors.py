@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for parallel detector execution.
+This script runs stand-in detectors on the MediaPipe processor with and without
+the detector thread pool and checks that both give the same results.
+"""
+
+import os
+import sys
+import argparse
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.landmark_detection import MediaPipeProcessor
+
+class StubDetector:
+    """Stand-in detector that records the calling thread and summarizes the image."""
+    
+    def __init__(self, name, barrier=None):
+        self.name = name
+        self.barrier = barrier
+        self.threads = []
+        self.errors = []
+    
+    def process_image(self, image_rgb, timestamp_ms):
+        self.threads.append(threading.current_thread().name)
+        if image_rgb.flags.writeable:
+            self.errors.append(f"{self.name} detector got a writable image")
+        
+        # Every detector waits for the others, which only succeeds when they run concurrently
+        if self.barrier is not None:
+            self.barrier.wait()
+        
+        return [(self.name, timestamp_ms, int(image_rgb.sum()), image_rgb.shape)]
+
+def create_processor(barrier=None, parallel=False):
+    """Create a processor with stand-in detectors and, if parallel, the detector thread pool."""
+    processor = MediaPipeProcessor(enable_face=False, enable_hands=False, enable_pose=False,
+                                   parallel_detectors=parallel)
+    processor.enable_face = processor.enable_hands = processor.enable_pose = True
+    processor.face_detector = StubDetector('face', barrier)
+    processor.hand_detector = StubDetector('hands', barrier)
+    processor.pose_detector = StubDetector('pose', barrier)
+    
+    # Same pool start() creates, without starting the video capture
+    if parallel:
+        processor.executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="detector")
+    return processor
+
+def get_detectors(processor):
+    """Get the stand-in detectors of a processor."""
+    return [processor.face_detector, processor.hand_detector, processor.pose_detector]
+
+def create_frame(index, width=64, height=48):
+    """Create a BGR test frame whose contents depend on its index."""
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = index % 256
+    frame[:height // 2, :, 2] = (index * 7) % 256
+    return frame
+
+def test_serial_detectors():
+    """Test that detectors run inline on the calling thread without a thread pool."""
+    print("Testing serial detectors...")
+    
+    processor = create_processor()
+    image = np.ones((8, 8, 3), dtype=np.uint8)
+    image.flags.writeable = False
+    
+    faces, hands, pose = processor._run_detectors(image, 40.0)
+    assert [faces[0][0], hands[0][0], pose[0][0]] == ['face', 'hands', 'pose'], \
+        f"Results were assigned to the wrong detectors: {faces}, {hands}, {pose}"
+    
+    caller = threading.current_thread().name
+    assert all(detector.threads == [caller] for detector in get_detectors(processor)), \
+        "Serial detectors did not run once on the calling thread"
+    
+    # Disabled detectors report no results and are not called
+    processor.enable_hands = False
+    faces, hands, pose = processor._run_detectors(image, 80.0)
+    assert hands == [] and len(processor.hand_detector.threads) == 1 and faces and pose, \
+        "Disabled detector was run"
+    
+    print("Serial detectors test passed")
+
+def test_parallel_detectors():
+    """Test that the thread pool runs all detectors concurrently and joins their results."""
+    print("Testing parallel detectors...")
+    
+    # The barrier breaks after a timeout unless all three detectors are running at the same time
+    barrier = threading.Barrier(3, timeout=5.0)
+    processor = create_processor(barrier, parallel=True)
+    try:
+        image = np.ones((8, 8, 3), dtype=np.uint8)
+        image.flags.writeable = False
+        
+        for frame_index in range(20):
+            timestamp = frame_index * 40.0
+            faces, hands, pose = processor._run_detectors(image, timestamp)
+            expected = [('face', timestamp), ('hands', timestamp), ('pose', timestamp)]
+            assert [faces[0][:2], hands[0][:2], pose[0][:2]] == expected, \
+                f"Wrong results for frame {frame_index}: {faces}, {hands}, {pose}"
+        
+        caller = threading.current_thread().name
+        for detector in get_detectors(processor):
+            assert len(detector.threads) == 20 and caller not in detector.threads, \
+                f"{detector.name} detector did not run on the thread pool"
+        
+        # A single enabled detector runs inline, there is nothing to overlap
+        processor.enable_face = processor.enable_hands = False
+        processor.pose_detector.barrier = None
+        processor._run_detectors(image, 1000.0)
+        assert processor.pose_detector.threads[-1] == caller, \
+            "Single detector was dispatched to the thread pool"
+    
+    except threading.BrokenBarrierError:
+        raise AssertionError("Detectors did not run concurrently")
+
+    
+    finally:
+        processor._stop_executor()
+    
+    print("Parallel detectors test passed")
+
+def test_same_results(frames=30):
+    """Test that serial and parallel processing of the same frames give the same results."""
+    print("Testing serial and parallel results...")
+    
+    serial = create_processor()
+    parallel = create_processor(threading.Barrier(3, timeout=5.0), parallel=True)
+    serial_results = []
+    parallel_results = []
+    serial.set_result_callback(serial_results.append)
+    parallel.set_result_callback(parallel_results.append)
+    
+    try:
+        for index in range(frames):
+            frame = create_frame(index)
+            serial._process_frame_callback(frame, index * 33.0)
+            parallel._process_frame_callback(frame, index * 33.0)
+    finally:
+        parallel._stop_executor()
+    
+    assert len(serial_results) == frames and len(parallel_results) == frames, \
+        f"Expected {frames} results, got {len(serial_results)} and {len(parallel_results)}"
+    
+    for serial_result, parallel_result in zip(serial_results, parallel_results):
+        for key in ['faces', 'hands', 'pose', 'frame_timestamp', 'frame_index', 'source_dimensions']:
+            serial_value = getattr(serial_result, key)
+            parallel_value = getattr(parallel_result, key)
+            assert serial_value == parallel_value, \
+                f"Frame {serial_result.frame_index} {key} differs: {serial_value} != {parallel_value}"
+
+    
+    errors = [error for processor in (serial, parallel) for detector in get_detectors(processor)
+              for error in detector.errors]
+    assert not errors, errors[0]
+    
+    print(f"Processed {frames} frames with matching results")
+    print("Serial and parallel results test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test parallel detector execution")
+    parser.parse_args()
+    
+    try:
+        test_serial_detectors()
+        test_parallel_detectors()
+        test_same_results()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Parallel detectors test passed")
+    else:
+        print("Parallel detectors test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
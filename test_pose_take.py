@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Test script for recorded pose takes.
+This script tests the keyed channels of every rotation mode, array growth,
+quaternion sign continuity and keyframe reduction without Blender.
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.pose_take import PoseTake, CHANNEL_COUNTS, simplify_curve, reduce_keyframes
+
+# Recorded bones: name, pose bone row, rotation mode
+TEST_BONES = [
+    ("Hips", 4, 'QUATERNION'),
+    ("Spine", 1, 'XYZ'),
+    ("Head", 0, 'ZXY'),
+    ("LeftHand", 3, 'AXIS_ANGLE'),
+    ("RightHand", 6, 'QUATERNION')
+]
+
+POSE_BONE_COUNT = 7
+
+def create_take(capacity=1024):
+    """Create a take of the test bones."""
+    names, rows, modes = zip(*TEST_BONES)
+    return PoseTake(names, rows, modes, capacity)
+
+def create_pose_values(rng):
+    """Create random values of every recordable property for all pose bones."""
+    return {name: rng.uniform(-1.0, 1.0, (POSE_BONE_COUNT, size)).astype(np.float32)
+            for name, size in CHANNEL_COUNTS.items()}
+
+def get_expected_row(pose_values):
+    """Read the keyed channels of the test bones one bone at a time."""
+    row = []
+    for _, pose_bone_row, rotation_mode in TEST_BONES:
+        rotation = {'QUATERNION': 'rotation_quaternion', 'AXIS_ANGLE': 'rotation_axis_angle'}.get(
+            rotation_mode, 'rotation_euler')
+        row.extend(pose_values['location'][pose_bone_row])
+        row.extend(pose_values[rotation][pose_bone_row])
+    return np.array(row, dtype=np.float32)
+
+def test_channels():
+    """Test that every bone records its location and the rotation property of its mode."""
+    print("Testing recorded channels...")
+    
+    take = create_take()
+    properties = [(take.bone_names[b], name) for b, name, index in take.channels if index == 0]
+    assert properties == [
+        ("Hips", 'location'), ("Hips", 'rotation_quaternion'),
+        ("Spine", 'location'), ("Spine", 'rotation_euler'),
+        ("Head", 'location'), ("Head", 'rotation_euler'),
+        ("LeftHand", 'location'), ("LeftHand", 'rotation_axis_angle'),
+        ("RightHand", 'location'), ("RightHand", 'rotation_quaternion')
+    ], f"Wrong recorded properties: {properties}"
+    assert len(take.channels) == 3 * 5 + 4 + 3 + 3 + 4 + 4, f"Wrong channel count: {len(take.channels)}"
+    assert take.bone_columns == [0, 7, 13, 19, 26], f"Wrong bone columns: {take.bone_columns}"
+    assert sorted(take.properties) == ['location', 'rotation_axis_angle', 'rotation_euler', 'rotation_quaternion'], \
+        f"Wrong properties read from the pose: {sorted(take.properties)}"
+    
+    # Only the keyed properties are read
+    euler_take = PoseTake(["Spine"], [1], ['YZX'])
+    assert sorted(euler_take.properties) == ['location', 'rotation_euler'], "Unused properties are read"
+    
+    rng = np.random.default_rng(0)
+    pose_values = create_pose_values(rng)
+    take.record(1.0, pose_values)
+    _, values = take.get_take()
+    assert np.array_equal(values[0], get_expected_row(pose_values)), "Recorded row differs from the pose"
+    
+    print("Recorded channels test passed")
+
+def test_growth(capacity=4, count=37):
+    """Test that recording past the capacity keeps every frame."""
+    print("Testing array growth...")
+    
+    rng = np.random.default_rng(1)
+    take = create_take(capacity)
+    frames = []
+    rows = []
+    for i in range(count):
+        pose_values = create_pose_values(rng)
+        # Keep quaternions in one hemisphere so the sign pass changes nothing
+        pose_values['rotation_quaternion'][:, 0] = 2.0
+        take.record(i * 0.5 + 1.0, pose_values)
+        frames.append(i * 0.5 + 1.0)
+        rows.append(get_expected_row(pose_values))
+    
+    assert len(take) == count and len(take.frames) >= count, f"Wrong length after growing: {len(take)}"
+    recorded_frames, values = take.get_take()
+    assert np.array_equal(recorded_frames, frames), "Frames changed while growing"
+    assert np.array_equal(values, rows), "Values changed while growing"
+    
+    # The take is a copy of the recording
+    values[:] = 0.0
+    assert np.array_equal(take.get_take()[1], rows), "Take shares memory with the recording"
+    
+    empty_frames, empty_values = create_take().get_take()
+    assert empty_frames.shape == (0,) and empty_values.shape == (0, len(take.channels)), "Empty take has the wrong shape"
+    
+    print("Array growth test passed")
+
+def test_sign_continuity(count=50):
+    """Test that quaternion signs are made continuous and other channels are untouched."""
+    print("Testing quaternion sign continuity...")
+    
+    rng = np.random.default_rng(2)
+    take = create_take()
+    hips = take.bone_columns[0] + 3
+    right_hand = take.bone_columns[4] + 3
+    
+    # A slow rotation about Z, recorded with random signs
+    angles = np.linspace(0.0, 1.5 * np.pi, count)
+    rotations = np.stack((np.cos(angles / 2), np.zeros(count), np.zeros(count), np.sin(angles / 2)), axis=1)
+    flips = rng.choice([-1.0, 1.0], (count, 2))
+    flips[0] = 1.0
+    rows = []
+    for i in range(count):
+        pose_values = create_pose_values(rng)
+        pose_values['rotation_quaternion'][4] = rotations[i] * flips[i, 0]
+        pose_values['rotation_quaternion'][6] = rotations[i] * flips[i, 1]
+        take.record(float(i), pose_values)
+        rows.append(get_expected_row(pose_values))
+    rows = np.array(rows)
+    
+    _, values = take.get_take()
+    for column in (hips, right_hand):
+        quaternions = values[:, column:column + 4]
+        assert np.allclose(quaternions, rotations, atol=1e-6), "Quaternion signs were not made continuous"
+        dots = np.einsum('fi,fi->f', quaternions[1:], quaternions[:-1])
+        assert np.all(dots > 0), "Neighbouring quaternions point to opposite hemispheres"
+    
+    # Location, Euler and axis-angle channels are never flipped
+    quaternion_columns = np.concatenate((np.arange(hips, hips + 4), np.arange(right_hand, right_hand + 4)))
+    others = np.setdiff1d(np.arange(len(take.channels)), quaternion_columns)
+    assert np.array_equal(values[:, others], rows[:, others]), "Non-quaternion channels changed"
+    
+    print("Quaternion sign continuity test passed")
+
+def get_reduction_error(frames, values, keep):
+    """Get the largest difference between a curve and linear interpolation of its kept keys."""
+    values = np.asarray(values, dtype=np.float64).reshape(len(frames), -1)
+    kept = np.flatnonzero(keep)
+    interpolated = np.stack([np.interp(frames, frames[kept], values[kept, c]) for c in range(values.shape[1])], axis=1)
+    return np.abs(values - interpolated).max()
+
+def test_error_bound(count=400):
+    """Test that reduced curves stay within the tolerance and keep their end keys."""
+    print("Testing keyframe reduction error bound...")
+    
+    rng = np.random.default_rng(3)
+    frames = np.cumsum(rng.uniform(0.5, 1.5, count))
+    t = np.linspace(0.0, 4.0 * np.pi, count)
+    curves = {
+        'smooth': np.stack((np.sin(t), np.cos(0.5 * t), 0.1 * t), axis=1),
+        'noisy': np.sin(t)[:, None] + rng.normal(0.0, 0.01, (count, 2)),
+        'steps': np.repeat(rng.uniform(-1.0, 1.0, count // 20), 20)
+    }
+    
+    for name, values in curves.items():
+        previous = np.zeros(count, dtype=bool)
+        for tolerance in (0.1, 0.01, 0.001):
+            keep = simplify_curve(frames, values, tolerance)
+            error = get_reduction_error(frames, values, keep)
+            assert keep[0] and keep[-1], f"End keys of the {name} curve were dropped"
+            assert error <= tolerance, f"{name} curve error {error} exceeds tolerance {tolerance}"
+            assert keep[previous].all(), f"Tighter tolerance dropped keys of the {name} curve"
+            previous = keep
+    
+    # Tolerance 0 keeps every key that is not exactly on a line
+    keep = simplify_curve(frames, curves['noisy'], 0.0)
+    assert keep.all(), f"Tolerance 0 dropped {count - keep.sum()} keys"
+    
+    # A straight line needs only its ends
+    keep = simplify_curve(frames, 2.0 * frames - 1.0, 1e-9)
+    assert np.flatnonzero(keep).tolist() == [0, count - 1], "Straight line kept interior keys"
+    
+    # Keys that must be kept stay kept
+    required = np.zeros(count, dtype=bool)
+    required[[50, 51, 300]] = True
+    keep = simplify_curve(frames, 2.0 * frames - 1.0, 1e-9, required)
+    assert np.flatnonzero(keep).tolist() == [0, 50, 51, 300, count - 1], "Required keys were not kept"
+    
+    # Short curves are kept whole
+    assert simplify_curve(frames[:2], curves['smooth'][:2], 1.0).all(), "Two-key curve was reduced"
+    
+    print("Keyframe reduction error bound test passed")
+
+def test_bone_boundaries(count=120):
+    """Test that every bone is reduced on its own channels with its end keys kept."""
+    print("Testing keyframe reduction bone boundaries...")
+    
+    rng = np.random.default_rng(4)
+    take = create_take()
+    frames = np.arange(count, dtype=np.float64)
+    t = np.linspace(0.0, 2.0 * np.pi, count)
+    
+    # Bones alternate between a constant pose and motion, so a bone's neighbours
+    # have very different curves at the shared boundary of the stacked curve
+    values = np.zeros((count, len(take.channels)))
+    ends = take.bone_columns[1:] + [len(take.channels)]
+    for b, (start, end) in enumerate(zip(take.bone_columns, ends)):
+        if b % 2 == 0:
+            values[:, start:end] = rng.uniform(-1.0, 1.0, end - start)
+        else:
+            values[:, start:end] = np.sin(t[:, None] * (1 + np.arange(end - start)))
+    
+    tolerance = 0.005
+    keep = reduce_keyframes(frames, values, take.bone_columns, tolerance)
+    assert keep.shape == (count, len(take.bone_names)), f"Wrong keep shape: {keep.shape}"
+    assert keep[0].all() and keep[-1].all(), "First or last key of a bone was dropped"
+    
+    for b, (start, end) in enumerate(zip(take.bone_columns, ends)):
+        # Same keys as reducing the bone alone, within the tolerance on all its channels
+        expected = simplify_curve(frames, values[:, start:end], tolerance)
+        assert np.array_equal(keep[:, b], expected), f"Bone {take.bone_names[b]} depends on its neighbours"
+        error = get_reduction_error(frames, values[:, start:end], keep[:, b])
+        assert error <= tolerance, f"Bone {take.bone_names[b]} error {error} exceeds the tolerance"
+        if b % 2 == 0:
+            assert keep[:, b].sum() == 2, f"Constant bone {take.bone_names[b]} kept interior keys"
+    
+    # Takes of up to two frames keep every key
+    assert reduce_keyframes(frames[:2], values[:2], take.bone_columns, tolerance).all(), "Two-frame take was reduced"
+    
+    print("Keyframe reduction bone boundaries test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test pose takes")
+    parser.parse_args()
+    
+    try:
+        test_channels()
+        test_growth()
+        test_sign_continuity()
+        test_error_bound()
+        test_bone_boundaries()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Pose take test passed")
+    else:
+        print("Pose take test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Test script for the processing pipeline.
+This script tests the stage queue drop policies and chained pipeline stages.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.processing_pipeline import StageQueue, PipelineStage
+from src.mediapipe_module.landmark_detection import MediaPipeProcessor
+
+class StubCapture:
+    """Stand-in video capture that only tracks its frame callbacks."""
+    
+    def __init__(self, start_result=True):
+        self.start_result = start_result
+        self.frame_callbacks = []
+        self.is_live = False
+    
+    def add_frame_callback(self, callback):
+        self.frame_callbacks.append(callback)
+    
+    def remove_frame_callback(self, callback):
+        if callback in self.frame_callbacks:
+            self.frame_callbacks.remove(callback)
+    
+    def start(self):
+        return self.start_result
+    
+    def stop(self):
+        pass
+
+def test_latest_policy(maxsize=2, count=5):
+    """Test that a full "latest" queue drops its oldest items."""
+    print("Testing latest drop policy...")
+    
+    dropped = []
+    queue = StageQueue(maxsize, "latest", on_drop=dropped.append)
+    
+    for i in range(count):
+        queued = queue.put(i)
+        assert queued, f"Item {i} was not queued"
+    
+    assert dropped == list(range(count - maxsize)) and queue.dropped_count == count - maxsize, \
+        f"Wrong items dropped: {dropped}"
+    
+    item = queue.get()
+    assert queue.put_count == count and item == count - maxsize and len(queue) == maxsize - 1, \
+        "Queue does not hold the newest items"
+    
+    # Cleared items are passed to the drop callback too
+    queue.clear()
+    item = queue.get(timeout=0.01)
+    assert dropped[-1] == count - 1 and len(queue) == 0 and item is None, "Queue was not cleared"
+    
+    print("Latest drop policy test passed")
+
+def test_block_policy():
+    """Test that a full "block" queue makes the producer wait and drops on timeout."""
+    print("Testing block drop policy...")
+    
+    dropped = []
+    queue = StageQueue(1, "block", on_drop=dropped.append)
+    queue.put(1)
+    
+    # The producer gives up after the timeout and the new item is dropped
+    start_time = time.time()
+    queued = queue.put(2, timeout=0.05)
+    assert not queued and time.time() - start_time >= 0.05, "Producer did not wait for space"
+    assert dropped == [2] and queue.dropped_count == 1, f"Wrong items dropped: {dropped}"
+    
+    # Without a timeout the producer waits until a consumer takes an item
+    def consume():
+        time.sleep(0.1)
+        queue.get()
+    
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    start_time = time.time()
+    queued = queue.put(3)
+    waited = time.time() - start_time
+    consumer.join()
+    
+    item = queue.get(timeout=0.1)
+    assert queued and waited >= 0.05 and item == 3 and queue.dropped_count == 1, \
+        f"Blocked producer was not resumed (waited {waited:.3f} s)"
+    
+    
+    print("Block drop policy test passed")
+
+def run_pipeline(drop_policy, count, delay):
+    """Feed items through two chained stages and return the taken items, results, queue and stages."""
+    taken = []
+    results = []
+    first_queue = StageQueue(2, drop_policy)
+    second_queue = StageQueue(2, drop_policy)
+    
+    def square(item):
+        taken.append(item)
+        
+        # Failing items are skipped without stopping the stage
+        if item == 7:
+            raise ValueError("Test error")
+        time.sleep(delay)
+        return item * item
+    
+    def collect(item):
+        results.append(item)
+    
+    stages = [
+        PipelineStage("square", square, first_queue, second_queue),
+        PipelineStage("collect", collect, second_queue)
+    ]
+    for stage in stages:
+        stage.start()
+    
+    for i in range(count):
+        first_queue.put(i, timeout=1.0)
+    
+    # Wait for the queues to drain
+    deadline = time.time() + 10.0
+    while (len(first_queue) or len(second_queue)) and time.time() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    
+    for stage in stages:
+        stage.stop()
+    
+    return taken, results, first_queue, stages
+
+def test_pipeline_stages(count=100):
+    """Test chained stages with both drop policies."""
+    print("Testing pipeline stages...")
+    
+    # Blocking queues pass every item through in order
+    _, results, first_queue, stages = run_pipeline("block", count, 0.001)
+    expected = [i * i for i in range(count) if i != 7]
+    assert results == expected and first_queue.dropped_count == 0, \
+        f"Blocking pipeline lost items: {len(results)} of {len(expected)}"
+    assert stages[0].item_count == count - 1 and stages[0].get_average_process_time() > 0, \
+        "Stage metrics were not updated"
+    
+    # A slow stage behind "latest" queues only sees recent items
+    taken, results, first_queue, stages = run_pipeline("latest", count, 0.005)
+    print(f"Latest pipeline took {len(taken)} of {count} items, dropped {first_queue.dropped_count}")
+    assert first_queue.dropped_count != 0 and results == sorted(results) and results[-1] == (count - 1) ** 2, \
+        "Latest pipeline did not drop stale items"
+    
+    # Every item was either taken by the stage or counted as dropped
+    assert len(taken) + first_queue.dropped_count == count and taken == sorted(taken), \
+        "Items were lost without being counted as dropped"
+    
+    print("Pipeline stages test passed")
+
+def test_processor_callbacks():
+    """Test that the processor removes the frame callback it registered, whatever the current mode."""
+    print("Testing processor frame callbacks...")
+    
+    processor = MediaPipeProcessor(enable_face=False, enable_hands=False, enable_pose=False, pipelined=True)
+    processor.capture = StubCapture()
+    started = processor.start()
+    assert started and len(processor.capture.frame_callbacks) == 1 and processor.stages, \
+        "Pipelined processor did not start"
+    
+    # Reconfiguring the mode while running must not leave the old callback attached
+    processor.pipelined = False
+    processor.stop()
+    assert processor.capture.frame_callbacks == [] and processor.stages == [], \
+        f"Frame callbacks left after stop: {processor.capture.frame_callbacks}"
+    
+    # The callback is removed again when the capture fails to start
+    processor.capture = StubCapture(start_result=False)
+    started = processor.start()
+    assert not started and processor.capture.frame_callbacks == [], "Callback left after a failed start"
+    
+    print("Processor frame callbacks test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test processing pipeline")
+    parser.parse_args()
+    
+    try:
+        test_latest_policy()
+        test_block_policy()
+        test_pipeline_stages()
+        test_processor_callbacks()
+        
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Processing pipeline test passed")
+    else:
+        print("Processing pipeline test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
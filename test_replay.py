@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for replaying recorded detection results.
+This script records a take and replays it at different speeds.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.take_format import TakeWriter
+from src.mediapipe_module.replay import ResultReplayer
+from src.mediapipe_module.landmark_detection import DetectionResult, PoseData
+
+def write_take(path, frames=30, frame_time=20.0):
+    """Write a take whose pose landmarks hold the frame number."""
+    with TakeWriter(path, chunk_size=8) as writer:
+        for i in range(frames):
+            writer.write({
+                'faces': [],
+                'hands': [],
+                'pose': [{
+                    'landmarks': [{'x': float(i), 'y': 0.0, 'z': 0.0, 'visibility': 1.0}] * 33,
+                    'detection_confidence': 0.9
+                }],
+                'frame_timestamp': 1000.0 + i * frame_time,
+                'frame_index': i,
+                'source_dimensions': (640, 480)
+            })
+
+def replay(path, speed, **kwargs):
+    """Replay a take and return the results and the replay duration."""
+    results = []
+    replayer = ResultReplayer(path, speed=speed, **kwargs)
+    replayer.set_result_callback(results.append)
+    
+    start_time = time.time()
+    if not replayer.start() or not replayer.wait(timeout=10.0):
+        return None, 0.0
+    return results, time.time() - start_time
+
+def test_replay_order(frames=30):
+    """Test that results are replayed in order as DetectionResult objects."""
+    print("Testing replay order...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.take")
+        write_take(path, frames)
+        
+        results, _ = replay(path, None)
+        ranged, _ = replay(path, None, start_frame=5, end_frame=12)
+    
+    assert results is not None and [result.frame_index for result in results] == list(range(frames)), \
+        "Results are missing or out of order"
+    
+    result = results[7]
+    assert isinstance(result, DetectionResult) and isinstance(result.pose[0], PoseData), \
+        "Results are not detection results"
+    
+    assert np.all(result.pose[0].landmarks.x == 7.0) and result.frame_timestamp == 1140.0, \
+        "Replayed landmarks do not match"
+    
+    assert [result.frame_index for result in ranged] == list(range(5, 12)), "Frame range was not respected"
+    
+    print("Replay order test passed")
+
+def test_replay_timing(frames=30, frame_time=20.0):
+    """Test replay at the recorded timing and at a higher speed."""
+    print("Testing replay timing...")
+    
+    recorded = (frames - 1) * frame_time / 1000.0
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.take")
+        write_take(path, frames, frame_time)
+        
+        _, realtime_duration = replay(path, 1.0)
+        _, fast_duration = replay(path, 4.0)
+    
+    print(f"Recorded: {recorded:.3f} s, 1x: {realtime_duration:.3f} s, 4x: {fast_duration:.3f} s")
+    assert recorded * 0.9 <= realtime_duration <= recorded * 1.5, \
+        "Replay at 1x does not follow the recorded timing"
+    assert recorded / 4 * 0.9 <= fast_duration <= recorded / 4 * 1.5 + 0.05, \
+        "Replay at 4x does not follow the scaled timing"
+    
+    print("Replay timing test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test result replay")
+    parser.parse_args()
+    
+    try:
+        test_replay_order()
+        test_replay_timing()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Replay test passed")
+    else:
+        print("Replay test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
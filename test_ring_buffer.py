@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the ring buffer module.
+This script tests the ring of position arrays against a plain list window
+and the summary statistics of scalar timing windows.
+"""
+
+import os
+import sys
+import random
+import argparse
+import numpy as np
+from collections import deque
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.ring_buffer import RingBuffer, get_window_stats
+
+def test_array_items(capacity=5, count=1000):
+    """Test a ring of position arrays against a list that drops its oldest frame."""
+    print("Testing array items...")
+    
+    rng = np.random.default_rng(0)
+    buffer = RingBuffer(capacity, shape=(21, 3))
+    window = []
+    
+    for i in range(count):
+        frame = rng.uniform(-1.0, 1.0, (21, 3))
+        buffer.push(frame)
+        window.append(frame)
+        if len(window) > capacity:
+            window.pop(0)
+        
+        assert len(buffer) == len(window) and np.array_equal(buffer.last(), frame), \
+            f"Wrong contents after {i + 1} frames"
+        assert np.array_equal(buffer.ordered(), window), f"Frames are not ordered from oldest to newest after {i + 1}"
+        assert np.allclose(buffer.mean(), np.mean(window, axis=0), rtol=0.0, atol=1e-12), \
+            f"Mean mismatch after {i + 1} frames"
+        
+        weights = np.arange(1, len(window) + 1)
+        assert np.allclose(buffer.weighted_mean(weights), np.average(window, axis=0, weights=weights),
+                           rtol=0.0, atol=1e-12), f"Weighted mean mismatch after {i + 1} frames"
+    
+    try:
+        buffer.weighted_mean(np.ones(capacity + 1))
+        raise AssertionError("Weighted mean accepted the wrong number of weights")
+    except ValueError:
+        pass
+    
+    buffer.clear()
+    assert len(buffer) == 0 and buffer.last() is None and not buffer.mean().any(), "Buffer was not cleared"
+    
+    print("Array item test passed")
+
+def test_window_stats(capacity=30, count=2000):
+    """Test the statistics of a scalar deque window against a plain list."""
+    print("Testing window statistics...")
+    
+    rng = random.Random(0)
+    times = deque(maxlen=capacity)
+    window = []
+    
+    for i in range(count):
+        value = rng.uniform(0.0, 50.0)
+        times.append(value)
+        window.append(value)
+        if len(window) > capacity:
+            window.pop(0)
+        
+        if i % 97 == 0 or i == count - 1:
+            stats = get_window_stats(times)
+            assert stats['count'] == len(window) and abs(stats['mean'] - sum(window) / len(window)) < 1e-9, \
+                f"Count or mean mismatch after {i + 1} values"
+            assert stats['min'] == min(window) and stats['max'] == max(window), \
+                f"Min/max mismatch after {i + 1} values"
+            assert abs(stats['p95'] - np.percentile(window, 95)) < 1e-9, f"Percentile mismatch after {i + 1} values"
+    
+    print(f"Statistics: {get_window_stats(times)}")
+    
+    stats = get_window_stats(deque(maxlen=capacity))
+    assert stats['count'] == 0 and all(value == 0.0 for value in stats.values()), "Empty window statistics are not zero"
+    
+    print("Window statistics test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test ring buffer module")
+    parser.parse_args()
+    
+    try:
+        test_array_items()
+        test_window_stats()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Ring buffer test passed")
+    else:
+        print("Ring buffer test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared-memory streamer.
+This script tests reading the latest message, slots caught being rewritten,
+taking over blocks of running and exited servers, clients following a
+restarted server, and a writer process streaming into a small ring while a
+client polls it.
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.data_streaming import SharedMemoryStreamer
+
+def create_result(frame_index, face_count=468):
+    """Create a result whose landmarks and timestamp all encode the frame index."""
+    value = (frame_index % 1000) / 1000.0
+    face_data = {
+        'landmarks': [{'x': value, 'y': value, 'z': 0.0, 'visibility': 1.0} for _ in range(face_count)],
+        'visibility': [1.0] * face_count,
+        'timestamp': frame_index * 10.0,
+        'detection_confidence': 0.9,
+        'tracking_id': 0
+    }
+    return {
+        'faces': [face_data],
+        'hands': [],
+        'pose': [],
+        'frame_timestamp': frame_index * 10.0,
+        'frame_index': frame_index,
+        'source_dimensions': (640, 480)
+    }
+
+def is_consistent(result):
+    """Check that every field of a received result belongs to the same frame."""
+    frame_index = result['frame_index']
+    landmarks = result['faces'][0]['landmarks']
+    value = np.float32((frame_index % 1000) / 1000.0)
+    return (result['frame_timestamp'] == frame_index * 10.0 and
+            result['faces'][0]['timestamp'] == frame_index * 10.0 and
+            np.all(landmarks.x == value) and np.all(landmarks.y == value))
+
+def create_client(name, start=False, owner_check_interval=0.0):
+    """Attach a client to a ring, starting its polling thread or leaving it to be polled directly."""
+    client = SharedMemoryStreamer(mode="client", name=name, poll_interval=0.0,
+                                  owner_check_interval=owner_check_interval)
+    if start:
+        if not client.start():
+            return None
+    else:
+        client._attach()
+    
+    # Clients unregister the block so only the server unlinks it, but the test
+    # servers share this process's resource tracker and still need the entry
+    resource_tracker.register(client.memory._name, "shared_memory")
+    return client
+
+def test_receive_latest(name="mediapipe_test_latest"):
+    """Test that clients read only new messages and skip to the newest one."""
+    print("Testing shared-memory latest message...")
+    
+    server = SharedMemoryStreamer(mode="server", name=name, slot_count=4, slot_size=65536)
+    started = server.start()
+    assert started, "Failed to start shared-memory server"
+    
+    try:
+        client = create_client(name)
+        result = client.receive_latest()
+        assert result is None, "Empty ring returned a message"
+        
+        server.send_message(create_result(0))
+        result = client.receive_latest()
+        assert result is not None and result['frame_index'] == 0 and is_consistent(result), \
+            f"Wrong first message: {result and result['frame_index']}"
+        result = client.receive_latest()
+        assert result is None, "Message was read twice"
+        
+        # Only the newest of several messages is read, the others count as missed
+        for frame_index in range(1, 7):
+            server.send_message(create_result(frame_index))
+        result = client.receive_latest()
+        assert result is not None and result['frame_index'] == 6 and client.missed_count == 5, \
+            f"Did not skip to the newest message: {result and result['frame_index']}, {client.missed_count} missed"
+        
+        # Messages larger than a slot are rejected instead of overflowing it
+        sent = server.send_message(create_result(7, face_count=5000))
+        assert not sent, "Oversized message was written"
+        result = client.receive_latest()
+        assert result is None, "Rejected message was read"
+        
+        client._cleanup()
+    
+    finally:
+        server.stop()
+    
+    print("Shared-memory latest message test passed")
+
+def test_torn_reads(name="mediapipe_test_torn"):
+    """Test that slots being written or already rewritten are retried and never returned."""
+    print("Testing shared-memory torn reads...")
+    
+    server = SharedMemoryStreamer(mode="server", name=name, slot_count=4, slot_size=65536)
+    started = server.start()
+    assert started, "Failed to start shared-memory server"
+    
+    try:
+        client = create_client(name)
+        server.send_message(create_result(1))
+        offset = server._slot_offset(1)
+        slot_sequence, length = server.SLOT_STRUCT.unpack_from(server.buffer, offset)
+        
+        # A writer that stopped half way leaves an odd sequence number; the client
+        # retries once per slot and gives up without returning the partial message
+        server.SLOT_STRUCT.pack_into(server.buffer, offset, slot_sequence - 1, length)
+        result = client.receive_latest()
+        assert result is None and client.sequence == 0, "Slot being written was read"
+        
+        # Once the write completes the message is read
+        server.SLOT_STRUCT.pack_into(server.buffer, offset, slot_sequence, length)
+        result = client.receive_latest()
+        assert result is not None and result['frame_index'] == 1, "Completed slot was not read"
+        
+        # A slot that was already rewritten for a later lap does not belong to
+        # the latest sequence number and is not returned either
+        server.send_message(create_result(2))
+        offset = server._slot_offset(2)
+        _, length = server.SLOT_STRUCT.unpack_from(server.buffer, offset)
+        server.SLOT_STRUCT.pack_into(server.buffer, offset, 2 * (2 + server.slot_count), length)
+        result = client.receive_latest()
+        assert result is None and client.sequence == 1, "Rewritten slot was read"
+        
+        # A corrupt length is rejected instead of reading past the slot
+        server.SLOT_STRUCT.pack_into(server.buffer, offset, 4, server.slot_size + 1)
+        result = client.receive_latest()
+        assert result is None, "Slot with an invalid length was read"
+        
+        # The next complete message is read normally
+        server.send_message(create_result(3))
+        result = client.receive_latest()
+        assert result is not None and result['frame_index'] == 3 and client.missed_count == 1, \
+            "Ring did not recover after a torn slot"
+        
+        client._cleanup()
+    
+    finally:
+        server.stop()
+    
+    print("Shared-memory torn reads test passed")
+
+def get_exited_pid():
+    """Get the process id of a process that has exited."""
+    process = multiprocessing.Process(target=time.sleep, args=(0,))
+    process.start()
+    process.join()
+    return process.pid
+
+def test_server_takeover(name="mediapipe_test_takeover"):
+    """Test that a server takes over only blocks left behind by exited servers."""
+    print("Testing shared-memory server takeover...")
+    
+    server = SharedMemoryStreamer(mode="server", name=name, slot_count=4, slot_size=65536)
+    started = server.start()
+    assert started, "Failed to start shared-memory server"
+    
+    try:
+        server.send_message(create_result(1))
+        
+        # A second server must not reset the ring of a running one
+        second = SharedMemoryStreamer(mode="server", name=name, slot_count=4, slot_size=65536)
+        started = second.start()
+        assert not started, "Second server took over the ring of a running server"
+        # The failed server unregistered the block from the shared resource tracker
+        resource_tracker.register(server.memory._name, "shared_memory")
+        
+        client = create_client(name)
+        assert client.sequence == 1, f"Ring was reset by the second server: sequence {client.sequence}"
+        server.send_message(create_result(2))
+        result = client.receive_latest()
+        assert result is not None and result['frame_index'] == 2, "Running server stopped working"
+        
+        # A server that exits without stopping leaves the block behind with its process id
+        server.OWNER_STRUCT.pack_into(server.buffer, server.OWNER_OFFSET, server.generation, get_exited_pid())
+        server.words.release()
+        server.memory.close()
+        server.memory = None
+        
+        server = SharedMemoryStreamer(mode="server", name=name, slot_count=2, slot_size=65536)
+        started = server.start()
+        assert started, "Block of an exited server was not taken over"
+        
+        # The client follows the new generation of the same block and its layout
+        server.send_message(create_result(3))
+        result = client.receive_latest()
+        assert result is None and client.slot_count == 2 and client.generation == server.generation, \
+            "Client did not follow the new ring layout"
+        resource_tracker.register(client.memory._name, "shared_memory")
+
+        server.send_message(create_result(4))
+        result = client.receive_latest()
+        assert result is not None and result['frame_index'] == 4, "Message of the new server was not read"
+        
+        client._cleanup()
+    
+    finally:
+        server.stop()
+    
+    # Blocks that are not landmark rings are left untouched
+    foreign = shared_memory.SharedMemory(name=name, create=True, size=4096)
+    try:
+        foreign.buf[:4] = b'TEST'
+        server = SharedMemoryStreamer(mode="server", name=name, slot_count=1, slot_size=1024)
+        started = server.start()
+        assert not started and bytes(foreign.buf[:4]) == b'TEST', "Foreign shared memory block was overwritten"
+    finally:
+        resource_tracker.register(foreign._name, "shared_memory")
+        foreign.close()
+        foreign.unlink()
+    
+    print("Shared-memory server takeover test passed")
+
+def test_client_reattach(name="mediapipe_test_reattach"):
+    """Test that a client follows a server that stopped and started again."""
+    print("Testing shared-memory client reattach...")
+    
+    server = SharedMemoryStreamer(mode="server", name=name, slot_count=4, slot_size=65536)
+    started = server.start()
+    assert started, "Failed to start shared-memory server"
+    client = create_client(name)
+    
+    try:
+        server.send_message(create_result(1))
+        result = client.receive_latest()
+        assert result is not None and result['frame_index'] == 1, "First message was not read"
+        
+        # The stopped server unlinks its block, the restarted one creates a new block
+        server.stop()
+        result = client.receive_latest()
+        assert result is None and client.memory is not None, "Client lost the ring of the stopped server"
+        
+        server = SharedMemoryStreamer(mode="server", name=name, slot_count=4, slot_size=65536)
+        started = server.start()
+        assert started, "Failed to restart shared-memory server"
+        server.send_message(create_result(10))
+        
+        result = client.receive_latest()
+        assert result is None and client.generation == server.generation, "Client did not attach to the new block"
+        resource_tracker.register(client.memory._name, "shared_memory")
+        
+        server.send_message(create_result(11))
+        result = client.receive_latest()
+        assert result is not None and result['frame_index'] == 11, "Message of the restarted server was not read"
+        
+        client._cleanup()
+    
+    finally:
+        server.stop()
+    
+    print("Shared-memory client reattach test passed")
+
+def write_messages(name, count, ready_event, start_event):
+    """Writer process that streams consistent results into a small ring."""
+    server = SharedMemoryStreamer(mode="server", name=name, slot_count=2, slot_size=65536)
+    if not server.start():
+        return
+    ready_event.set()
+    start_event.wait(10.0)
+    
+    for frame_index in range(1, count + 1):
+        server.send_message(create_result(frame_index))
+        if frame_index % 50 == 0:
+            time.sleep(0.001)
+    
+    # The client keeps its mapping of the ring after the block is unlinked
+    server.stop()
+
+def test_concurrent_access(count=3000, name="mediapipe_test_concurrent"):
+    """Test a client polling the ring while another process writes into it."""
+    print("Testing concurrent shared-memory access...")
+    
+    # The writer process must share the resource tracker the client registers with
+    resource_tracker.ensure_running()
+    
+    ready_event = multiprocessing.Event()
+    start_event = multiprocessing.Event()
+    writer = multiprocessing.Process(target=write_messages, args=(name, count, ready_event, start_event))
+    writer.start()
+    
+    if not ready_event.wait(10.0):
+        writer.terminate()
+        raise AssertionError("Writer process did not start")
+    
+    # Opening the block of the stopping writer would unregister it from the resource tracker the test shares
+    client = create_client(name, start=True, owner_check_interval=60.0)
+
+    if client is None:
+        writer.terminate()
+        raise AssertionError("Failed to start shared-memory client")
+    received = []
+    client.add_message_callback(received.append)
+    
+    # The writer laps the two slots constantly, so the client races it on every read
+    start_event.set()
+    deadline = time.time() + 30.0
+    while time.time() < deadline and (not received or received[-1]['frame_index'] != count):
+        time.sleep(0.01)
+    
+    client.stop()
+    writer.join(timeout=15.0)
+    if writer.is_alive():
+        writer.terminate()
+    
+    print(f"Received {len(received)} of {count} messages, {client.missed_count} skipped")
+    for result in received:
+        assert is_consistent(result), f"Torn message read for frame {result['frame_index']}"
+    
+    frame_indices = [result['frame_index'] for result in received]
+    assert received and frame_indices[-1] == count, "Last message was not received"
+    
+    assert all(a < b for a, b in zip(frame_indices, frame_indices[1:])), "Messages were read out of order"
+    
+    # Every message is either read or counted as skipped
+    assert len(received) + client.missed_count == count, \
+        f"{count - len(received) - client.missed_count} messages are unaccounted for"
+    
+    print("Concurrent shared-memory access test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test shared-memory streamer")
+    parser.add_argument("--count", type=int, default=3000, help="Messages written in the concurrent test")
+    args = parser.parse_args()
+    
+    try:
+        test_receive_latest()
+        test_torn_reads()
+        test_server_takeover()
+        test_client_reattach()
+        
+        test_concurrent_access(args.count)
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Shared-memory streamer test passed")
+    else:
+        print("Shared-memory streamer test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Test script for landmark smoothing.
+This script compares the weighted moving average with the per-landmark
+smoothing loop it replaced, frame by frame, for dictionaries and landmark
+arrays, and tests the smoothing factor and landmark count changes. It also
+tests that the adaptive filters settle on a step, that the spring filter never
+overshoots and how frame times are taken when timestamps are missing.
+
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.landmark_array import LandmarkArray
+from src.mediapipe_module.smoothing import (
+    LandmarkSmoother, LandmarkFilterBank, SpringFilter, FILTER_TYPES
+)
+
+class ReferenceSmoother:
+    """Per-landmark weighted moving average as computed before the smoothing module."""
+    
+    def __init__(self, buffer_size=5):
+        self.buffer_size = buffer_size
+        self.position_buffer = {}
+    
+    def smooth_landmarks(self, key, landmarks, previous_landmarks, smoothing):
+        smoothed_landmarks = []
+        for i, lm in enumerate(landmarks):
+            if i >= len(previous_landmarks):
+                smoothed_landmarks.append(lm)
+                continue
+            
+            buffer = self.position_buffer.setdefault(f"{key}_{i}", [])
+            buffer.append(np.array((lm['x'], lm['y'], lm['z'])))
+            if len(buffer) > self.buffer_size:
+                buffer.pop(0)
+            
+            smoothed_pos = np.zeros(3)
+            weights = 0
+            for j, pos in enumerate(buffer):
+                weight = (j + 1) / len(buffer)
+                smoothed_pos += pos * weight
+                weights += weight
+            smoothed_pos /= weights
+            
+            raw = np.array((lm['x'], lm['y'], lm['z']))
+            final_pos = raw + (smoothed_pos - raw) * smoothing
+            
+            smoothed_lm = {'x': final_pos[0], 'y': final_pos[1], 'z': final_pos[2]}
+            for name, value in lm.items():
+                if name not in ['x', 'y', 'z']:
+                    smoothed_lm[name] = value
+            smoothed_landmarks.append(smoothed_lm)
+        
+        return smoothed_landmarks
+
+def create_frames(frames=40, count=478, seed=0):
+    """Create landmark dictionaries of a random walk, with extra properties on each landmark."""
+    rng = np.random.default_rng(seed)
+    positions = np.cumsum(rng.normal(0.0, 0.01, (frames, count, 3)), axis=0) + 0.5
+    return [
+        [{'x': x, 'y': y, 'z': z, 'visibility': 0.75, 'presence': 0.5} for x, y, z in frame.tolist()]
+        for frame in positions
+    ]
+
+def to_positions(landmarks):
+    """Get the positions of landmark dictionaries as an (N, 3) array."""
+    return np.array([[lm['x'], lm['y'], lm['z']] for lm in landmarks])
+
+def test_weighted_average(frames=40, buffer_size=5, smoothing=0.5):
+    """Test that the weighted moving average matches the per-landmark loop on every frame."""
+    print("Testing weighted moving average...")
+    
+    landmark_frames = create_frames(frames)
+    reference = ReferenceSmoother(buffer_size)
+    smoother = LandmarkSmoother(buffer_size)
+    array_smoother = LandmarkSmoother(buffer_size)
+    
+    previous = []
+    max_error = 0.0
+    for frame_index, landmarks in enumerate(landmark_frames):
+        expected = reference.smooth_landmarks("face_0", landmarks, previous, smoothing)
+        smoothed = smoother.smooth_landmarks(("face", 0, 'landmarks'), landmarks, len(previous), smoothing)
+        smoothed_array = array_smoother.smooth_landmarks(
+            ("face", 0, 'landmarks'), LandmarkArray.from_dicts(landmarks), len(previous), smoothing
+        )
+        
+        assert len(smoothed) == len(expected), f"Frame {frame_index} has {len(smoothed)} landmarks"
+        assert isinstance(smoothed_array, LandmarkArray), "Landmark array input returned another format"
+        assert all(lm.keys() == lm_expected.keys() and lm['presence'] == lm_expected['presence']
+                   for lm, lm_expected in zip(smoothed, expected)), \
+            f"Landmark properties were not kept on frame {frame_index}"
+        
+        error = np.abs(to_positions(smoothed) - to_positions(expected)).max()
+        max_error = max(max_error, error)
+        assert error < 1e-12, f"Smoothed positions differ by {error} on frame {frame_index}"
+        
+        # Landmark arrays hold float32, so they match to single precision
+        error = np.abs(smoothed_array.xyz - to_positions(expected)).max()
+        assert error < 1e-6, f"Smoothed landmark array differs by {error} on frame {frame_index}"
+        
+        # Landmarks without a previous frame are returned unchanged
+        assert smoothed[len(previous):] == landmarks[len(previous):], \
+            f"Landmarks missing from the previous frame were smoothed on frame {frame_index}"
+        
+        # Only the landmarks the next frame shares with this one are smoothed
+        previous = landmarks[:-10]
+    
+    print(f"Largest difference from the per-landmark loop: {max_error:.3g}")
+    print("Weighted moving average test passed")
+
+def test_smoothing_factor():
+    """Test that the smoothing factor blends from the raw positions to the average."""
+    print("Testing smoothing factor...")
+    
+    landmark_frames = create_frames(frames=8, count=5)
+    raw = LandmarkSmoother(3)
+    averaged = LandmarkSmoother(3)
+    
+    for landmarks in landmark_frames:
+        unsmoothed = raw.smooth_landmarks("pose", landmarks, len(landmarks), 0.0)
+        assert unsmoothed == landmarks, "Smoothing factor 0.0 changed the landmarks"
+        smoothed = averaged.smooth_landmarks("pose", landmarks, len(landmarks), 1.0)
+    
+    # With a factor of 1.0 the result is the weighted average of the last three frames
+    history = np.array([to_positions(landmarks) for landmarks in landmark_frames[-3:]])
+    expected = np.tensordot(np.array([1.0, 2.0, 3.0]) / 6.0, history, axes=1)
+    assert np.allclose(to_positions(smoothed), expected, rtol=0.0, atol=1e-12), \
+        "Smoothing factor 1.0 did not return the weighted average"
+    
+    print("Smoothing factor test passed")
+
+def test_landmark_count_change():
+    """Test that the buffer of a subject starts over when its number of smoothed landmarks changes."""
+    print("Testing landmark count change...")
+    
+    landmark_frames = create_frames(frames=10, count=8)
+    smoother = LandmarkSmoother(5)
+    for landmarks in landmark_frames[:6]:
+        smoother.smooth_landmarks("hand", landmarks, 8, 0.75)
+    
+    # Fewer landmarks in the previous frame smooth like a new subject
+    restarted = LandmarkSmoother(5)
+    for landmarks in landmark_frames[6:]:
+        smoothed = smoother.smooth_landmarks("hand", landmarks, 6, 0.75)
+        expected = restarted.smooth_landmarks("hand", landmarks, 6, 0.75)
+        assert smoothed == expected, "Buffer did not start over after the landmark count changed"
+    
+    # Subjects are buffered independently
+    other = LandmarkSmoother(5).smooth_landmarks("face", landmark_frames[0], 8, 0.75)
+    smoothed = smoother.smooth_landmarks("face", landmark_frames[0], 8, 0.75)
+    assert smoothed == other, "Subjects share a buffer"
+    
+    print("Landmark count change test passed")
+
+def create_step(count=4):
+    """Create landmark dictionaries at the origin and at a step of (1, -0.5, 0.25) from it."""
+    start = [{'x': 0.0, 'y': 0.0, 'z': 0.0, 'visibility': 1.0} for _ in range(count)]
+    target = [{'x': 1.0, 'y': -0.5, 'z': 0.25, 'visibility': 1.0} for _ in range(count)]
+    return start, target
+
+def test_step_convergence(duration=3.0, fps=30.0):
+    """Test that every filter settles on a step input with the defaults of every body part."""
+    print("Testing filter step convergence...")
+    
+    start, target = create_step()
+    for filter_type in FILTER_TYPES:
+        for body_part in ('face', 'hand', 'pose'):
+            bank = LandmarkFilterBank(filter_type)
+            bank.filter_landmarks("subject", body_part, start, len(start), timestamp=0.0)
+            
+            errors = []
+            for frame_index in range(1, int(duration * fps) + 1):
+                filtered = bank.filter_landmarks("subject", body_part, target, len(target),
+                                                 timestamp=frame_index / fps)
+                errors.append(np.abs(to_positions(filtered) - to_positions(target)).max())
+            
+            assert errors[0] > 1e-3, f"{filter_type} filter for {body_part} did not filter the step"
+            assert errors[-1] < 1e-3, \
+                f"{filter_type} filter for {body_part} is {errors[-1]} from the step after {duration} s"
+            assert max(errors[len(errors) // 2:]) < 1e-2, f"{filter_type} filter for {body_part} did not settle"
+    
+    print("Filter step convergence test passed")
+
+def test_spring_overshoot():
+    """Test that the spring filter approaches a step monotonically at any frame time."""
+    print("Testing spring filter overshoot...")
+    
+    target = np.array([[1.0, -0.5, 0.25]])
+    for frequency in (1.0, 4.0, 12.0):
+        for dt in (1.0 / 240.0, 1.0 / 30.0, 0.25, 2.0):
+            spring = SpringFilter(frequency)
+            previous = spring.filter(np.zeros((1, 3)), dt)
+            for _ in range(200):
+                position = spring.filter(target, dt)
+                assert np.all(np.abs(position) <= np.abs(target) + 1e-12), \
+                    f"Spring at {frequency} Hz overshot the step with a {dt} s frame time: {position}"
+                assert np.all(np.abs(position) >= np.abs(previous) - 1e-12), \
+                    f"Spring at {frequency} Hz moved back with a {dt} s frame time"
+                previous = position
+    
+    # The exact solution gives the same position at the same time at any frame rate
+    positions = []
+    for fps in (30.0, 60.0, 90.0):
+        spring = SpringFilter(4.0)
+        spring.filter(np.zeros((1, 3)), 1.0 / fps)
+        for _ in range(int(fps / 2)):
+            position = spring.filter(target, 1.0 / fps)
+        positions.append(position)
+    assert np.allclose(positions, positions[0], rtol=0.0, atol=1e-9), \
+        f"Spring position after 0.5 s depends on the frame rate: {positions}"
+    
+    print("Spring filter overshoot test passed")
+
+def test_missing_timestamps(default_dt=0.05):
+    """Test that frames without a usable timestamp are filtered with the default frame time."""
+    print("Testing missing timestamps...")
+    
+    start, target = create_step()
+    for filter_type in FILTER_TYPES:
+        timed = LandmarkFilterBank(filter_type, default_dt=default_dt)
+        untimed = LandmarkFilterBank(filter_type, default_dt=default_dt)
+        mixed = LandmarkFilterBank(filter_type, default_dt=default_dt)
+        
+        # Timestamps that are missing, repeated or going backwards fall back to the default
+        mixed_timestamps = [None, 1.0, None, 1.0, 1.0 + default_dt, 0.5, 0.5 + default_dt, None]
+        for frame_index, timestamp in enumerate(mixed_timestamps):
+            landmarks = start if frame_index == 0 else target
+            expected = timed.filter_landmarks("pose", "pose", landmarks, len(landmarks),
+                                              timestamp=frame_index * default_dt)
+            filtered = untimed.filter_landmarks("pose", "pose", landmarks, len(landmarks))
+            assert np.allclose(to_positions(filtered), to_positions(expected), rtol=0.0, atol=1e-9), \
+                f"{filter_type} filter without timestamps did not use the default frame time"
+            filtered = mixed.filter_landmarks("pose", "pose", landmarks, len(landmarks), timestamp=timestamp)
+            assert np.allclose(to_positions(filtered), to_positions(expected), rtol=0.0, atol=1e-9), \
+                f"{filter_type} filter with timestamp {timestamp} on frame {frame_index} used another frame time"
+        
+        # Real frame times are used when they are known, a longer frame moves further
+        errors = []
+        for dt in (default_dt, 4 * default_dt):
+            bank = LandmarkFilterBank(filter_type, default_dt=default_dt)
+            bank.filter_landmarks("pose", "pose", start, len(start), timestamp=0.0)
+            filtered = bank.filter_landmarks("pose", "pose", target, len(target), timestamp=dt)
+            errors.append(np.abs(to_positions(filtered) - to_positions(target)).max())
+        assert errors[1] < errors[0], f"{filter_type} filter ignored the frame time: errors {errors}"
+    
+    
+    print("Missing timestamps test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test landmark smoothing")
+    parser.parse_args()
+    
+    try:
+        test_weighted_average()
+        test_smoothing_factor()
+        test_landmark_count_change()
+        test_step_convergence()
+        test_spring_overshoot()
+        test_missing_timestamps()
+        
+        
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Smoothing test passed")
+    else:
+        print("Smoothing test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
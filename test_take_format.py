@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar take format.
+This script writes a take in chunks and reads it back with random access.
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+import numpy as np
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.landmark_array import LandmarkArray
+from src.mediapipe_module.take_format import TakeWriter, TakeReader
+
+def create_frame(i, rng):
+    """Create a mock detection result; the right hand is only seen on even frames."""
+    pose = rng.random((33, 4)).astype(np.float32)
+    hand = rng.random((21, 4)).astype(np.float32)
+    
+    def to_dicts(array):
+        return [{'x': x, 'y': y, 'z': z, 'visibility': v} for x, y, z, v in array.tolist()]
+    
+    data = {
+        'faces': [],
+        'hands': [],
+        'pose': [{
+            'landmarks': to_dicts(pose),
+            'world_landmarks': to_dicts(pose * 2),
+            'timestamp': i * 33.0,
+            'detection_confidence': 0.9,
+            'tracking_id': 0
+        }],
+        'frame_timestamp': i * 33.0,
+        'frame_index': i,
+        'source_dimensions': (640, 480)
+    }
+    
+    if i % 2 == 0:
+        data['hands'].append({
+            'landmarks': to_dicts(hand),
+            'timestamp': i * 33.0,
+            'detection_confidence': 0.8,
+            'tracking_id': None,
+            'handedness': 'Right',
+            'hand_flag': 1
+        })
+    
+    return data, pose, hand
+
+def test_round_trip(frames=600, chunk_size=256):
+    """Test that every frame and channel range reads back unchanged."""
+    print("Testing take round trip...")
+    
+    rng = np.random.default_rng(0)
+    expected = [create_frame(i, rng) for i in range(frames)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.take")
+        with TakeWriter(path, chunk_size, metadata={'actor': 'test'}) as writer:
+            for data, _, _ in expected:
+                writer.write(data)
+                
+                # Finished chunks can be read while recording
+                if len(writer) == chunk_size + 1:
+                    recorded = len(TakeReader(path))
+                    assert recorded == chunk_size, "First chunk is not readable during recording"
+        
+        reader = TakeReader(path)
+        print(f"Take has {len(reader)} frames in {len(reader.chunks)} chunks")
+        assert len(reader) == frames and reader.metadata.get('actor') == 'test', "Wrong frame count or metadata"
+        
+        # Random access to single frames
+        for i in [0, 255, 256, 431, frames - 1]:
+            result = reader[i]
+            data, pose, hand = expected[i]
+            assert result['frame_index'] == i and result['frame_timestamp'] == data['frame_timestamp'], \
+                f"Wrong frame header at {i}"
+            assert np.array_equal(result['pose'][0]['landmarks'].data, pose), f"Pose landmarks do not match at {i}"
+            assert np.array_equal(result['pose'][0]['world_landmarks'].data, pose * 2), \
+                f"Pose world landmarks do not match at {i}"
+            assert len(result['hands']) == (1 if i % 2 == 0 else 0), f"Wrong hands at {i}"
+            assert not result['hands'] or (result['hands'][0]['handedness'] == 'Right'
+                                           and np.array_equal(result['hands'][0]['landmarks'].data, hand)), \
+                f"Hand landmarks do not match at {i}"
+        
+        # Channel ranges across chunk boundaries
+        landmarks, present = reader.get_channel('right_hand', 200, 300)
+        assert landmarks.shape == (100, 21, 4) and np.array_equal(present, np.arange(200, 300) % 2 == 0), \
+            "Wrong right hand presence mask"
+        assert np.array_equal(landmarks[::2], np.array([expected[i][2] for i in range(200, 300, 2)])), \
+            "Right hand range does not match"
+        
+        _, present = reader.get_channel('face')
+        assert not present.any(), "Face should never be present"
+        
+        assert reader.find_frame(33.0 * 400 + 10) == 400, "Timestamp lookup failed"
+    
+    print("Take round trip test passed")
+
+def test_blendshapes(frames=6, chunk_size=4):
+    """Test that blendshape scores are stored by name when frames list different blendshapes."""
+    print("Testing take blendshapes...")
+    
+    names = ['browDownLeft', 'eyeBlinkLeft', 'jawOpen', 'mouthSmileLeft']
+    frame_blendshapes = [
+        [(name, 0.1 * (k + 1)) for k, name in enumerate(names)],
+        [('browDownLeft', 0.5), ('eyeBlinkLeft', 0.25)],
+        [('jawOpen', 0.75), ('browDownLeft', 0.125)],
+        [],
+        [(name, 0.2) for name in names] + [('tongueOut', 0.9)],
+        [('mouthSmileLeft', 1.0)]
+    ]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "face.take")
+        with TakeWriter(path, chunk_size) as writer:
+            for i, blendshapes in enumerate(frame_blendshapes):
+                writer.write({
+                    'faces': [{
+                        'landmarks': LandmarkArray(np.full((478, 4), i, dtype=np.float32)),
+                        'blendshapes': [{'name': name, 'score': score} for name, score in blendshapes],
+                        'timestamp': i * 33.0,
+                        'detection_confidence': 0.9,
+                        'tracking_id': 0
+                    }],
+                    'hands': [],
+                    'pose': [],
+                    'frame_timestamp': i * 33.0,
+                    'frame_index': i,
+                    'source_dimensions': (640, 480)
+                })
+        
+        reader = TakeReader(path)
+        assert reader.blendshape_names == names, f"Wrong blendshape names: {reader.blendshape_names}"
+        
+        for i, blendshapes in enumerate(frame_blendshapes):
+            scores = {name: score for name, score in blendshapes}
+            stored = {shape['name']: shape['score'] for shape in reader[i]['faces'][0]['blendshapes']}
+            expected = {name: np.float32(scores.get(name, 0.0)) for name in names}
+            assert stored == expected, f"Wrong blendshapes at frame {i}: {stored}"
+    
+    print("Take blendshapes test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test columnar take format")
+    parser.parse_args()
+    
+    try:
+        test_round_trip()
+        test_blendshapes()
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Take format test passed")
+    else:
+        print("Take format test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
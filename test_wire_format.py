@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Test script for the binary wire format.
+This script tests encoding and decoding of landmark messages.
+"""
+
+import os
+import sys
+import time
+import zlib
+import pickle
+import argparse
+
+# Add parent directory to path to import mediapipe_module
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from src.mediapipe_module.wire_format import (
+    encode_result, decode_result, decode_parts, get_serializer, DeltaSerializer, DeltaEncoder, DeltaDecoder
+)
+
+def create_mock_data():
+    """Create mock MediaPipe data for testing."""
+    face_data = {
+        'landmarks': [
+            {'x': 0.5, 'y': 0.25, 'z': -0.125, 'visibility': 1.0} for _ in range(478)
+        ],
+        'timestamp': time.time() * 1000,
+        'detection_confidence': 0.95,
+        'tracking_id': 0,
+        'blendshapes': [
+            {'name': 'jawOpen', 'score': 0.5},
+            {'name': 'mouthSmileLeft', 'score': 0.25}
+        ]
+    }
+    
+    hand_data = {
+        'landmarks': [
+            {'x': 0.375, 'y': 0.625, 'z': 0.0, 'visibility': 1.0} for _ in range(21)
+        ],
+        'world_landmarks': [
+            {'x': 0.015625, 'y': 0.03125, 'z': 0.0625, 'visibility': 1.0} for _ in range(21)
+        ],
+        'timestamp': time.time() * 1000,
+        'detection_confidence': 0.9,
+        'tracking_id': None,
+        'handedness': 'Right',
+        'hand_flag': 1
+    }
+    
+    pose_data = {
+        'landmarks': [
+            {'x': 0.5, 'y': 0.5, 'z': 0.0, 'visibility': 0.75} for _ in range(33)
+        ],
+        'timestamp': time.time() * 1000,
+        'detection_confidence': 0.95,
+        'tracking_id': 0
+    }
+    
+    return {
+        'faces': [face_data],
+        'hands': [hand_data],
+        'pose': [pose_data],
+        'frame_timestamp': time.time() * 1000,
+        'frame_index': 7,
+        'source_dimensions': (640, 480)
+    }
+
+def test_round_trip():
+    """Test that a decoded message matches the original data (values are exact in float32)."""
+    print("Testing wire format round trip...")
+    
+    data = create_mock_data()
+    message = encode_result(data)
+    decoded = decode_result(message)
+    
+    print(f"Binary message size: {len(message)} bytes (pickle: {len(pickle.dumps(data))} bytes)")
+    
+    for key in ['frame_timestamp', 'frame_index', 'source_dimensions']:
+        assert decoded[key] == data[key], f"Mismatch in {key}: {decoded[key]} != {data[key]}"
+    
+    for key in ['faces', 'hands', 'pose']:
+        assert len(decoded[key]) == len(data[key]), f"Mismatch in number of {key}"
+        
+        for original, entry in zip(data[key], decoded[key]):
+            for field, value in original.items():
+                decoded_value = entry[field]
+                if field in ['landmarks', 'world_landmarks']:
+                    decoded_value = decoded_value.to_dicts()
+                assert decoded_value == value, f"Mismatch in {key} {field}"
+    
+    print("Round trip test passed")
+
+def test_multipart():
+    """Test that a message split into frames decodes like a single buffer."""
+    print("Testing multipart messages...")
+    
+    data = create_mock_data()
+    frames = get_serializer("binary").dumps_parts(data)
+    
+    # Frames arrive as separate buffers, one per landmark array
+    decoded = decode_parts([memoryview(frame) for frame in frames])
+    expected = decode_result(encode_result(data))
+    
+    for key in ['faces', 'hands', 'pose']:
+        for entry, expected_entry in zip(decoded[key], expected[key]):
+            assert entry['landmarks'].to_dicts() == expected_entry['landmarks'].to_dicts(), \
+                f"Mismatch in {key} landmarks"
+    
+    try:
+        decode_parts([memoryview(frame) for frame in frames[:-1]])
+        raise AssertionError("Message with a missing frame was accepted")
+    except ValueError as e:
+        print(f"Rejected message with a missing frame: {e}")
+    
+    print("Multipart test passed")
+
+def test_delta_messages(frames=60, keyframe_interval=20):
+    """Test keyframe and delta messages, including resynchronization after a lost keyframe."""
+    print("Testing delta messages...")
+    
+    encoder = DeltaSerializer(keyframe_interval=keyframe_interval)
+    decoder = DeltaSerializer()
+    step = float(encoder.encoder.quantization_step)
+    plain_size = 0
+    delta_size = 0
+    
+    for i in range(frames):
+        data = create_mock_data()
+        data['frame_index'] = i
+        for landmark in data['faces'][0]['landmarks']:
+            landmark['x'] += 0.001 * i
+        
+        message = encoder.dumps(data)
+        plain_size += len(encode_result(data))
+        delta_size += len(message)
+        
+        # Lose the second keyframe; deltas referring to it must be skipped
+        if i == keyframe_interval:
+            continue
+        
+        decoded = decoder.loads(message)
+        if keyframe_interval < i < 2 * keyframe_interval:
+            assert decoded is None, f"Delta {i} was decoded without its keyframe"
+            continue
+        
+        assert decoded is not None and decoded['frame_index'] == i, f"Failed to decode message {i}"
+        
+        x = decoded['faces'][0]['landmarks'].x[0]
+        assert abs(x - data['faces'][0]['landmarks'][0]['x']) <= step, \
+            f"Delta error too large in message {i}: {x}"
+    
+    print(f"Delta stream size: {delta_size} bytes (binary: {plain_size} bytes)")
+    print(f"Skipped {decoder.decoder.skipped_count} messages while waiting for a keyframe")
+    
+    print("Delta message test passed")
+
+def test_delta_payload_limits():
+    """Test that delta payloads inflating past the keyframe size or truncated are rejected."""
+    print("Testing delta payload limits...")
+    
+    encoder = DeltaEncoder()
+    decoder = DeltaDecoder()
+    data = create_mock_data()
+    decoded = decoder.decode_parts(encoder.encode_parts(data))
+    assert decoded is not None, "Keyframe was not decoded"
+    metadata, payload = encoder.encode_parts(data)
+    
+    # A payload of 64 MiB of zeros compresses to about 64 KiB
+    invalid_payloads = {
+        'oversized': zlib.compress(bytes(64 << 20)),
+        'truncated': payload[:-4],
+        'short': zlib.compress(zlib.decompress(payload)[:-2])
+    }
+    for name, invalid in invalid_payloads.items():
+        try:
+            decoder.decode_parts([metadata, invalid])
+            raise AssertionError(f"Delta with a {name} payload was accepted")
+        except ValueError as e:
+            print(f"Rejected {name} delta payload: {e}")
+    
+    decoded = decoder.decode_parts([metadata, payload])
+    assert decoded is not None and decoded['frame_index'] == data['frame_index'], \
+        "Valid delta was not decoded after rejected payloads"
+    
+    print("Delta payload limits test passed")
+
+def test_invalid_messages():
+    """Test that invalid messages are rejected."""
+    print("Testing invalid messages...")
+    
+    message = encode_result(create_mock_data())
+    serializer = get_serializer("binary")
+    
+    for invalid in [b'', b'XXXX' + message[4:], message[:-4]]:
+        try:
+            serializer.loads(invalid)
+            raise AssertionError("Invalid message was accepted")
+        except ValueError as e:
+            
+            print(f"Rejected invalid message: {e}")
+    
+    print("Invalid message test passed")
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description="Test binary wire format")
+    parser.parse_args()
+    
+    try:
+        test_round_trip()
+        test_multipart()
+        test_delta_messages()
+        test_delta_payload_limits()
+        test_invalid_messages()
+        
+        success = True
+    except AssertionError as e:
+        print(e)
+        success = False
+    
+    if success:
+        print("Wire format test passed")
+    else:
+        print("Wire format test failed")
+    
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
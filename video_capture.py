@@ -4,11 +4,233 @@ Video capture module for MediaPipe to Blender live animation add-on.
 This module handles webcam capture and provides frames for MediaPipe processing.
 """
 
+import os
 import cv2
+import glob
 import time
 import threading
 import numpy as np
-from typing import Tuple, Optional, Callable, Dict, Any
+from typing import Tuple, Optional, Callable, Dict, Any, List, Sequence, Union
+
+
+class FrameRef:
+    """
+    Borrowed reference to a frame held in a FrameRing.
+    The frame is a read-only view that stays valid until release() is called,
+    so consumers can read it without copying while the capture thread keeps
+    writing into the other slots.
+    """
+    
+    __slots__ = ("frame", "timestamp", "sequence", "_ring", "_slot", "_generation")
+    
+    def __init__(self, ring: "FrameRing", slot: int, generation: int,
+                 frame: np.ndarray, timestamp: float, sequence: int):
+        """
+        Initialize the frame reference.
+        
+        Args:
+            ring: Ring that owns the frame buffer
+            slot: Index of the slot in the ring
+            generation: Allocation generation of the ring when borrowed
+            frame: Read-only view of the frame
+            timestamp: Timestamp of the frame in milliseconds
+            sequence: Sequence number of the frame
+        """
+        self._ring = ring
+        self._slot = slot
+        self._generation = generation
+        self.frame = frame
+        self.timestamp = timestamp
+        self.sequence = sequence
+    
+    def release(self) -> None:
+        """Return the slot to the ring. The frame must not be used afterwards."""
+        if self._ring is not None:
+            self._ring.release(self._slot, self._generation)
+            self._ring = None
+            self.frame = None
+    
+    def __enter__(self) -> "FrameRef":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.release()
+    
+    def __del__(self):
+        """Release the slot if the consumer forgot to."""
+        self.release()
+
+
+class FrameRing:
+    """
+    Preallocated ring of frame buffers shared between the capture thread and consumers.
+    The capture thread reads into a free slot, publishes it with a sequence number
+    and consumers borrow the latest slot through reference-counted FrameRef objects.
+    Slots that are borrowed are never written, so no frame is copied or allocated
+    once the ring has been sized to the camera resolution.
+    """
+    
+    def __init__(self, size: int = 4):
+        """
+        Initialize the frame ring.
+        
+        Args:
+            size: Number of frame slots (at least 2)
+        """
+        if size < 2:
+            raise ValueError("FrameRing needs at least 2 slots")
+        
+        self.size = size
+        # Re-entrant so a FrameRef collected while the lock is held can still release
+        self.lock = threading.RLock()
+        
+        # Slot storage, allocated lazily once the frame shape is known
+        self.buffers: List[np.ndarray] = []
+        self.views: List[np.ndarray] = []
+        self.generation = 0
+        
+        # Slot state
+        self.ref_counts = [0] * size
+        self.sequences = [0] * size
+        self.timestamps = [0.0] * size
+        self.latest_slot = -1
+        self.sequence = 0
+        
+        # Frames dropped because every slot was borrowed
+        self.dropped_frames = 0
+    
+    def is_allocated(self) -> bool:
+        """
+        Check if the slot buffers have been allocated.
+        
+        Returns:
+            bool: True if allocated, False otherwise
+        """
+        return bool(self.buffers)
+    
+    def allocate(self, shape: Tuple[int, ...], dtype: Any = np.uint8) -> None:
+        """
+        (Re)allocate all slots for the specified frame shape.
+        Outstanding references keep their old buffers alive and are ignored on release.
+        
+        Args:
+            shape: Frame shape, e.g. (height, width, 3)
+            dtype: Frame data type
+        """
+        with self.lock:
+            self.buffers = [np.empty(shape, dtype=dtype) for _ in range(self.size)]
+            self.views = []
+            for buffer in self.buffers:
+                view = buffer.view()
+                view.flags.writeable = False
+                self.views.append(view)
+            
+            self.generation += 1
+            self.ref_counts = [0] * self.size
+            self.latest_slot = -1
+    
+    def acquire_slot(self) -> Optional[int]:
+        """
+        Get a slot the writer may fill.
+        Skips the latest published slot and any slot that is currently borrowed.
+        
+        Returns:
+            Optional[int]: Slot index, or None if not allocated or every slot is busy
+        """
+        with self.lock:
+            if not self.buffers:
+                return None
+            
+            for offset in range(1, self.size + 1):
+                slot = (self.latest_slot + offset) % self.size
+                if slot != self.latest_slot and self.ref_counts[slot] == 0:
+                    return slot
+            
+            return None
+    
+    def buffer(self, slot: int) -> np.ndarray:
+        """
+        Get the writable buffer of a slot returned by acquire_slot().
+        
+        Args:
+            slot: Slot index
+        
+        Returns:
+            np.ndarray: Writable frame buffer
+        """
+        return self.buffers[slot]
+    
+    def view(self, slot: int) -> np.ndarray:
+        """
+        Get the read-only view of a slot.
+        
+        Args:
+            slot: Slot index
+        
+        Returns:
+            np.ndarray: Read-only frame view
+        """
+        return self.views[slot]
+    
+    def publish(self, slot: int, timestamp: float) -> int:
+        """
+        Publish a filled slot as the latest frame.
+        
+        Args:
+            slot: Slot index
+            timestamp: Timestamp of the frame in milliseconds
+        
+        Returns:
+            int: Sequence number assigned to the frame
+        """
+        with self.lock:
+            self.sequence += 1
+            self.sequences[slot] = self.sequence
+            self.timestamps[slot] = timestamp
+            self.latest_slot = slot
+            return self.sequence
+    
+    def borrow(self, min_sequence: int = 0) -> Optional[FrameRef]:
+        """
+        Borrow the latest published frame without copying it.
+        
+        Args:
+            min_sequence: Only return a frame with a sequence number of at least this value
+        
+        Returns:
+            Optional[FrameRef]: Reference to the latest frame or None if not available
+        """
+        with self.lock:
+            slot = self.latest_slot
+            if slot < 0 or self.sequences[slot] < min_sequence:
+                return None
+            
+            self.ref_counts[slot] += 1
+            return FrameRef(self, slot, self.generation, self.views[slot],
+                            self.timestamps[slot], self.sequences[slot])
+    
+    def release(self, slot: int, generation: int) -> None:
+        """
+        Release a borrowed slot.
+        
+        Args:
+            slot: Slot index
+            generation: Allocation generation the slot was borrowed from
+        """
+        with self.lock:
+            if generation == self.generation and self.ref_counts[slot] > 0:
+                self.ref_counts[slot] -= 1
+    
+    def get_latest_sequence(self) -> int:
+        """
+        Get the sequence number of the latest published frame.
+        
+        Returns:
+            int: Latest sequence number (0 if no frame has been published)
+        """
+        with self.lock:
+            return self.sequence
+
 
 class VideoCapture:
     """
@@ -16,7 +238,17 @@ class VideoCapture:
     Supports multiple camera sources and provides thread-safe access to frames.
     """
     
-    def __init__(self, camera_index: int = 0, width: int = 640, height: int = 480, fps: int = 30):
+    # Frames are timestamped with the wall clock when captured
+    is_live = True
+    
+    def __init__(
+        self,
+        camera_index: int = 0,
+        width: int = 640,
+        height: int = 480,
+        fps: int = 30,
+        ring_size: int = 4
+    ):
         """
         Initialize the video capture with specified parameters.
         
@@ -25,20 +257,25 @@ class VideoCapture:
             width: Desired frame width (default: 640)
             height: Desired frame height (default: 480)
             fps: Desired frames per second (default: 30)
+            ring_size: Number of preallocated frame slots (default: 4)
         """
         self.camera_index = camera_index
         self.width = width
         self.height = height
         self.fps = fps
         
+        # Preallocated frame slots shared with consumers
+        self.frame_ring = FrameRing(ring_size)
+        
         self.cap = None
         self.is_running = False
         self.thread = None
         self.lock = threading.Lock()
         
-        # Current frame and timestamp
+        # Current frame (read-only view into the frame ring) and timestamp
         self.current_frame = None
         self.current_timestamp = 0
+        self.current_sequence = 0
         
         # Performance metrics
         self.frame_count = 0
@@ -100,18 +337,43 @@ class VideoCapture:
     def _capture_loop(self) -> None:
         """Main capture loop that runs in a separate thread."""
         while self.is_running:
-            ret, frame = self.cap.read()
+            # Pick a free slot of the frame ring to decode into
+            slot = self.frame_ring.acquire_slot()
+            if slot is None and self.frame_ring.is_allocated():
+                # Every slot is borrowed; drop the frame instead of allocating a new one
+                self.cap.grab()
+                self.frame_ring.dropped_frames += 1
+                time.sleep(max(0, 1.0/self.fps - 0.01))
+                continue
+            
+            if slot is not None:
+                buffer = self.frame_ring.buffer(slot)
+                ret, frame = self.cap.read(image=buffer)
+            else:
+                buffer = None
+                ret, frame = self.cap.read()
+            
             if not ret:
                 print("Error: Failed to capture frame")
                 time.sleep(0.1)
                 continue
             
+            # OpenCV allocates a new array on the first frame or a resolution change,
+            # in which case the ring is resized to match and the frame copied in once
+            if buffer is None or frame.shape != buffer.shape or frame.ctypes.data != buffer.ctypes.data:
+                self.frame_ring.allocate(frame.shape, frame.dtype)
+                slot = self.frame_ring.acquire_slot()
+                np.copyto(self.frame_ring.buffer(slot), frame)
+            
             timestamp = time.time() * 1000  # Timestamp in milliseconds
+            sequence = self.frame_ring.publish(slot, timestamp)
+            frame = self.frame_ring.view(slot)
             
             # Update current frame with thread safety
             with self.lock:
                 self.current_frame = frame
                 self.current_timestamp = timestamp
+                self.current_sequence = sequence
                 self.frame_count += 1
                 
                 # Calculate actual FPS every second
@@ -121,7 +383,8 @@ class VideoCapture:
                     self.frame_count = 0
                     self.start_time = timestamp / 1000
             
-            # Call frame callbacks
+            # Call frame callbacks; the read-only frame is only guaranteed to be
+            # valid during the call, consumers that keep it must use borrow_frame()
             for callback in self.frame_callbacks:
                 try:
                     callback(frame, timestamp)
@@ -133,17 +396,34 @@ class VideoCapture:
     
     def get_frame(self) -> Tuple[Optional[np.ndarray], float]:
         """
-        Get the current frame and its timestamp.
+        Get a writable copy of the current frame and its timestamp.
+        Use borrow_frame() to read the frame without copying.
         
         Returns:
             Tuple containing:
                 - np.ndarray: Current frame or None if not available
                 - float: Timestamp of the frame in milliseconds
         """
-        with self.lock:
-            if self.current_frame is None:
-                return None, 0
-            return self.current_frame.copy(), self.current_timestamp
+        frame_ref = self.frame_ring.borrow()
+        if frame_ref is None:
+            return None, 0
+        
+        with frame_ref:
+            return frame_ref.frame.copy(), frame_ref.timestamp
+    
+    def borrow_frame(self, min_sequence: int = 0) -> Optional[FrameRef]:
+        """
+        Borrow the current frame without copying it.
+        The returned reference must be released (or used as a context manager)
+        so the capture thread can reuse its slot.
+        
+        Args:
+            min_sequence: Only return a frame with a sequence number of at least this value
+        
+        Returns:
+            Optional[FrameRef]: Read-only reference to the current frame or None if not available
+        """
+        return self.frame_ring.borrow(min_sequence)
     
     def add_frame_callback(self, callback: Callable[[np.ndarray, float], None]) -> None:
         """
@@ -179,7 +459,8 @@ class VideoCapture:
             "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
             "fps": self.cap.get(cv2.CAP_PROP_FPS),
             "actual_fps": self.actual_fps,
-            "camera_index": self.camera_index
+            "camera_index": self.camera_index,
+            "dropped_frames": self.frame_ring.dropped_frames
         }
     
     def is_available(self) -> bool:
@@ -206,6 +487,285 @@ class VideoCapture:
         self.stop()
 
 
+def expand_video_paths(source: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Expand a video path, glob pattern or list of them into sorted file paths.
+    
+    Args:
+        source: Path or glob pattern of video files, or a list of them
+    
+    Returns:
+        List[str]: Existing video file paths in processing order
+    """
+    patterns = [source] if isinstance(source, str) else list(source)
+    
+    paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            paths.extend(sorted(path for path in glob.glob(pattern) if os.path.isfile(path)))
+        elif os.path.isfile(pattern):
+            paths.append(pattern)
+    
+    return paths
+
+
+class VideoFileCapture(VideoCapture):
+    """
+    Video capture that reads recorded video files instead of a camera.
+    Frames are decoded as fast as the frame callbacks consume them, without
+    the real-time sleep of camera capture, and are timestamped with their
+    position in the source file so results line up with the footage.
+    """
+    
+    # Timestamps come from the source file, not the wall clock
+    is_live = False
+    
+    def __init__(
+        self,
+        source: Union[str, Sequence[str]],
+        realtime: bool = False,
+        ring_size: int = 4,
+        start_frame: int = 0,
+        end_frame: Optional[int] = None
+    ):
+        """
+        Initialize the file capture with specified parameters.
+        
+        Args:
+            source: Path or glob pattern of video files, or a list of them; files are
+                played one after the other
+            realtime: Whether to pace frames at the source frame rate instead of as fast as possible
+            ring_size: Number of preallocated frame slots (default: 4)
+            start_frame: Index of the first frame read from each file
+            end_frame: Index of the frame each file stops before, or None to read to the end
+        """
+        super().__init__(camera_index=-1, ring_size=ring_size)
+        self.source = source
+        self.paths = expand_video_paths(source)
+        self.realtime = realtime
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        
+        # Playback state
+        self.file_index = 0
+        self.file_position = 0  # Index of the next frame of the current file
+        self.current_path = None
+        self.timestamp_offset = 0.0  # Added to the timestamps of later files
+        self.frames_read = 0
+        self.finished = threading.Event()
+    
+    def _open(self, file_index: int) -> bool:
+        """
+        Open one of the video files.
+        
+        Args:
+            file_index: Index of the file in paths
+        
+        Returns:
+            bool: True if the file was opened, False otherwise
+        """
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        
+        path = self.paths[file_index]
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            print(f"Error: Could not open video file {path}")
+            cap.release()
+            return False
+        
+        # Seek to the first frame; seeking is not frame accurate for every
+        # codec, in which case the frames before it are decoded and skipped
+        if self.start_frame > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, self.start_frame)
+            if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != self.start_frame:
+                cap.release()
+                cap = cv2.VideoCapture(path)
+                for _ in range(self.start_frame):
+                    if not cap.grab():
+                        break
+        
+        self.cap = cap
+        self.file_index = file_index
+        self.file_position = self.start_frame
+        self.current_path = path
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or self.fps
+        self.width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return True
+    
+    def start(self) -> bool:
+        """
+        Start reading the video files in a separate thread.
+        
+        Returns:
+            bool: True if successfully started, False otherwise
+        """
+        if self.is_running:
+            return True
+        
+        if not self.paths:
+            print(f"Error: No video files found for {self.source}")
+            return False
+        
+        try:
+            if not self._open(0):
+                return False
+            
+            self.is_running = True
+            self.finished.clear()
+            self.start_time = time.time()
+            self.frame_count = 0
+            self.frames_read = 0
+            self.timestamp_offset = 0.0
+            self.thread = threading.Thread(target=self._capture_loop)
+            self.thread.daemon = True
+            self.thread.start()
+            
+            return True
+        
+        except Exception as e:
+            print(f"Error starting video file capture: {e}")
+            if self.cap is not None:
+                self.cap.release()
+                self.cap = None
+            return False
+    
+    def _acquire_slot(self) -> Optional[int]:
+        """
+        Get a free slot of the frame ring, waiting while every slot is borrowed.
+        Unlike a camera, a file has no frames to lose, so nothing is dropped.
+        
+        Returns:
+            Optional[int]: Slot index, or None if the ring is not allocated yet or capture stopped
+        """
+        slot = self.frame_ring.acquire_slot()
+        while slot is None and self.frame_ring.is_allocated() and self.is_running:
+            time.sleep(0.001)
+            slot = self.frame_ring.acquire_slot()
+        return slot
+    
+    def _capture_loop(self) -> None:
+        """Main read loop that runs in a separate thread until every file is done."""
+        first_timestamp = None
+        last_timestamp = 0.0
+        clock_start = time.time()
+        
+        while self.is_running:
+            slot = self._acquire_slot()
+            if not self.is_running:
+                break
+            
+            if self.end_frame is not None and self.file_position >= self.end_frame:
+                ret = False
+            elif slot is not None:
+                buffer = self.frame_ring.buffer(slot)
+                ret, frame = self.cap.read(image=buffer)
+            else:
+                buffer = None
+                ret, frame = self.cap.read()
+            
+            if not ret:
+                # End of the file; continue with the next one after the last frame of this one
+                if self.file_index + 1 >= len(self.paths):
+                    break
+                
+                self.timestamp_offset = last_timestamp + (1 - self.start_frame) * 1000.0 / self.fps
+                if not self._open(self.file_index + 1):
+                    break
+                continue
+            
+            if buffer is None or frame.shape != buffer.shape or frame.ctypes.data != buffer.ctypes.data:
+                self.frame_ring.allocate(frame.shape, frame.dtype)
+                slot = self.frame_ring.acquire_slot()
+                np.copyto(self.frame_ring.buffer(slot), frame)
+            
+            # Position of the decoded frame in the source, in milliseconds
+            timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) + self.timestamp_offset
+            last_timestamp = timestamp
+            self.file_position += 1
+            
+            if first_timestamp is None:
+                first_timestamp = timestamp
+            
+            if self.realtime:
+                delay = clock_start + (timestamp - first_timestamp) / 1000 - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            
+            sequence = self.frame_ring.publish(slot, timestamp)
+            frame = self.frame_ring.view(slot)
+            
+            with self.lock:
+                self.current_frame = frame
+                self.current_timestamp = timestamp
+                self.current_sequence = sequence
+                self.frame_count += 1
+                self.frames_read += 1
+                
+                # Calculate the decode rate every second
+                elapsed = time.time() - self.start_time
+                if elapsed >= 1.0:
+                    self.actual_fps = self.frame_count / elapsed
+                    self.frame_count = 0
+                    self.start_time = time.time()
+            
+            # Callbacks run in this thread, so the next frame is decoded once they return
+            for callback in self.frame_callbacks:
+                try:
+                    callback(frame, timestamp)
+                except Exception as e:
+                    print(f"Error in frame callback: {e}")
+        
+        self.is_running = False
+        self.finished.set()
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every file has been read and all frame callbacks have returned.
+        
+        Args:
+            timeout: Maximum time to wait in seconds (None waits forever)
+        
+        Returns:
+            bool: True if finished, False if the timeout expired
+        """
+        return self.finished.wait(timeout)
+    
+    def get_camera_properties(self) -> Dict[str, Any]:
+        """
+        Get current video file properties.
+        
+        Returns:
+            Dict containing video file properties
+        """
+        if self.cap is None:
+            return {}
+        
+        return {
+            "width": self.width,
+            "height": self.height,
+            "fps": self.fps,
+            "actual_fps": self.actual_fps,
+            "path": self.current_path,
+            "file_index": self.file_index,
+            "file_count": len(self.paths),
+            "frame_count": int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            "frames_read": self.frames_read,
+            "dropped_frames": self.frame_ring.dropped_frames
+        }
+    
+    def is_available(self) -> bool:
+        """
+        Check if any video file was found.
+        
+        Returns:
+            bool: True if there is at least one video file, False otherwise
+        """
+        return bool(self.paths)
+
+
 class VideoManager:
     """
     Manager class for handling multiple video capture instances.
@@ -301,15 +861,19 @@ if __name__ == "__main__":
     parser.add_argument("--width", type=int, default=640, help="Frame width")
     parser.add_argument("--height", type=int, default=480, help="Frame height")
     parser.add_argument("--fps", type=int, default=30, help="Target FPS")
+    parser.add_argument("--video", type=str, default=None, help="Video file path or glob pattern to play instead of a camera")
     args = parser.parse_args()
     
     # Create and start video capture
-    capture = VideoCapture(
-        camera_index=args.camera,
-        width=args.width,
-        height=args.height,
-        fps=args.fps
-    )
+    if args.video:
+        capture = VideoFileCapture(args.video, realtime=True)
+    else:
+        capture = VideoCapture(
+            camera_index=args.camera,
+            width=args.width,
+            height=args.height,
+            fps=args.fps
+        )
     
     if not capture.start():
         print("Failed to start video capture")
@@ -327,7 +891,7 @@ if __name__ == "__main__":
                             cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
                 
                 cv2.imshow("Video Capture Test", frame)
-                
+            
             key = cv2.waitKey(1) & 0xFF
             if key == 27:  # ESC key
                 break
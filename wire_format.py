@@ -0,0 +1,848 @@
+#!/usr/bin/env python3
+"""
+Wire format module for MediaPipe to Blender live animation add-on.
+This module defines the binary message format used to stream detection results
+and the serializers that can be selected for a ZMQ streamer.
+"""
+
+import zlib
+import struct
+import pickle
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .landmark_array import LandmarkArray, as_landmark_array
+
+
+# Message layout (all values little-endian):
+#
+#   header       HEADER_STRUCT
+#   descriptors  BLOCK_STRUCT for each face, hand and pose block
+#   names        UTF-8 blendshape names of each block, separated by newlines
+#   padding      zero bytes up to a multiple of 4 (header metadata_size)
+#   arrays       per block: landmarks (N, 4) float32, world landmarks (N, 4)
+#                float32 if present, blendshape scores (B,) float32
+#
+# Delta messages replace the arrays with a single zlib-compressed payload of
+# int16 steps relative to the keyframe they reference, stored as the low bytes
+# of all values followed by the high bytes.
+MAGIC = b'MPBL'
+VERSION = 2
+
+# magic, version, message flags, block count, frame index, frame timestamp,
+# source width, source height, metadata size, keyframe id, quantization step
+HEADER_STRUCT = struct.Struct('<4sBBHqdIIIIf')
+
+# Message flags
+MESSAGE_KEYFRAME = 0x01
+MESSAGE_DELTA = 0x02
+
+# kind, flags, handedness, hand flag, landmark count, blendshape count,
+# tracking id (-1 for none), detection confidence, timestamp, names size
+BLOCK_STRUCT = struct.Struct('<BBBBHHiddI')
+
+# Block kinds and the result keys they are stored under
+BLOCK_KINDS = ('faces', 'hands', 'pose')
+
+# Block flags
+FLAG_WORLD_LANDMARKS = 0x01
+
+# Handedness labels reported by MediaPipe
+HANDEDNESS = ('UNKNOWN', 'Left', 'Right')
+
+FLOAT32 = np.dtype('<f4')
+INT16 = np.dtype('<i2')
+INT16_LIMIT = 32767
+
+
+def get_field(entry: Any, name: str, default: Any = None) -> Any:
+    """
+    Read a field from a result dictionary or a landmark data object.
+    
+    Args:
+        entry: Dictionary or FaceData, HandData or PoseData instance
+        name: Field name
+        default: Value returned if the field is missing
+    
+    Returns:
+        Any: Field value
+    """
+    if isinstance(entry, dict):
+        return entry.get(name, default)
+    return getattr(entry, name, default)
+
+
+def _as_float32(array: np.ndarray) -> np.ndarray:
+    """Return a contiguous little-endian float32 version of an array."""
+    return np.ascontiguousarray(array, dtype=FLOAT32)
+
+
+def _encode_blocks(data: Any) -> Tuple[List[bytes], List[bytes], List[np.ndarray], Tuple]:
+    """
+    Encode the face, hand and pose blocks of a detection result.
+    
+    Args:
+        data: DetectionResult or dictionary in the streamer result format
+    
+    Returns:
+        Tuple[List[bytes], List[bytes], List[np.ndarray], Tuple]: Packed descriptors,
+            blendshape names and arrays of every block, and the layout of the arrays
+    """
+    descriptors = []
+    names = []
+    arrays = []
+    layout = []
+    
+    for kind, key in enumerate(BLOCK_KINDS):
+        for entry in get_field(data, key) or []:
+            landmarks = as_landmark_array(get_field(entry, 'landmarks'))
+            world_landmarks = as_landmark_array(get_field(entry, 'world_landmarks'))
+            blendshapes = get_field(entry, 'blendshapes') or []
+            
+            if world_landmarks is not None and len(world_landmarks) != len(landmarks):
+                raise ValueError("World landmarks must match the landmark count")
+            
+            flags = FLAG_WORLD_LANDMARKS if world_landmarks is not None else 0
+            block_names = '\n'.join(shape['name'] for shape in blendshapes).encode('utf-8')
+            tracking_id = get_field(entry, 'tracking_id')
+            handedness = get_field(entry, 'handedness', 'UNKNOWN')
+            
+            descriptors.append(BLOCK_STRUCT.pack(
+                kind,
+                flags,
+                HANDEDNESS.index(handedness) if handedness in HANDEDNESS else 0,
+                get_field(entry, 'hand_flag', 0),
+                len(landmarks),
+                len(blendshapes),
+                -1 if tracking_id is None else tracking_id,
+                get_field(entry, 'detection_confidence', 0.0),
+                get_field(entry, 'timestamp', 0.0),
+                len(block_names)
+            ))
+            names.append(block_names)
+            layout.append((kind, flags, len(landmarks), len(blendshapes), block_names))
+            
+            arrays.append(_as_float32(landmarks.data))
+            if world_landmarks is not None:
+                arrays.append(_as_float32(world_landmarks.data))
+            if blendshapes:
+                arrays.append(np.array([shape['score'] for shape in blendshapes], dtype=FLOAT32))
+    
+    return descriptors, names, arrays, tuple(layout)
+
+
+def _pack_metadata(
+    data: Any,
+    descriptors: List[bytes],
+    names: List[bytes],
+    message_flags: int = 0,
+    keyframe_id: int = 0,
+    quantization_step: float = 0.0
+) -> bytes:
+    """
+    Pack the message header, block descriptors and blendshape names.
+    
+    Args:
+        data: DetectionResult or dictionary in the streamer result format
+        descriptors: Packed block descriptors
+        names: Blendshape names of every block
+        message_flags: MESSAGE_KEYFRAME, MESSAGE_DELTA or 0 for a plain message
+        keyframe_id: Keyframe the message is or refers to
+        quantization_step: Value of one delta step
+    
+    Returns:
+        bytes: Message metadata
+    """
+    names_size = sum(len(block_names) for block_names in names)
+    metadata_size = HEADER_STRUCT.size + len(descriptors) * BLOCK_STRUCT.size + names_size
+    padding = -metadata_size % 4
+    metadata_size += padding
+    
+    width, height = get_field(data, 'source_dimensions', (0, 0))
+    header = HEADER_STRUCT.pack(
+        MAGIC,
+        VERSION,
+        message_flags,
+        len(descriptors),
+        get_field(data, 'frame_index', 0),
+        get_field(data, 'frame_timestamp', 0.0),
+        width,
+        height,
+        metadata_size,
+        keyframe_id,
+        quantization_step
+    )
+    
+    return b''.join([header, *descriptors, *names, b'\0' * padding])
+
+
+def encode_parts(data: Any) -> Tuple[bytes, List[np.ndarray]]:
+    """
+    Encode a detection result into message metadata and landmark arrays.
+    
+    Args:
+        data: DetectionResult or dictionary in the streamer result format
+    
+    Returns:
+        Tuple[bytes, List[np.ndarray]]: Metadata bytes and the arrays that follow it, in order
+    """
+    descriptors, names, arrays, _ = _encode_blocks(data)
+    return _pack_metadata(data, descriptors, names), arrays
+
+
+def encode_result(data: Any) -> bytes:
+    """
+    Encode a detection result into a single binary message.
+    
+    Args:
+        data: DetectionResult or dictionary in the streamer result format
+    
+    Returns:
+        bytes: Encoded message
+    """
+    metadata, arrays = encode_parts(data)
+    return b''.join([metadata, *(array.data for array in arrays)])
+
+
+def decode_result(message: Union[bytes, memoryview]) -> Dict[str, Any]:
+    """
+    Decode a single-buffer binary message into a result dictionary.
+    Landmark arrays are read-only views over the message buffer, so the buffer
+    must stay alive and unchanged while the result is in use.
+    
+    Args:
+        message: Encoded message
+    
+    Returns:
+        Dict[str, Any]: Result dictionary with LandmarkArray landmarks
+    """
+    return decode_parts([message])
+
+
+def decode_parts(frames: Sequence[Union[bytes, memoryview]]) -> Dict[str, Any]:
+    """
+    Decode a binary message received as metadata followed by one frame per array.
+    A single frame holding the whole message is accepted as well. Landmark
+    arrays are read-only views over the frame buffers, so the frames must stay
+    alive and unchanged while the result is in use.
+    
+    Args:
+        frames: Metadata frame and array frames, as produced by encode_parts()
+    
+    Returns:
+        Dict[str, Any]: Result dictionary with LandmarkArray landmarks
+    """
+    buffer, header = _unpack_header(frames)
+    if header[2] & MESSAGE_DELTA:
+        raise ValueError("Delta messages must be decoded with a DeltaDecoder")
+    
+    return _decode_blocks(buffer, header, _ArrayReader(buffer, header[8], frames[1:]))
+
+
+def _unpack_header(frames: Sequence[Union[bytes, memoryview]]) -> Tuple[memoryview, Tuple]:
+    """
+    Unpack and validate the header of a message.
+    
+    Args:
+        frames: Received frames, starting with the metadata
+    
+    Returns:
+        Tuple[memoryview, Tuple]: Metadata buffer and the unpacked header fields
+    """
+    if not frames:
+        raise ValueError("Message has no frames")
+    
+    buffer = memoryview(frames[0]).cast('B')
+    if len(buffer) < HEADER_STRUCT.size:
+        raise ValueError("Message is shorter than the header")
+    
+    header = HEADER_STRUCT.unpack_from(buffer, 0)
+    if header[0] != MAGIC:
+        raise ValueError("Message is not a binary landmark message")
+    if header[1] != VERSION:
+        raise ValueError(f"Unsupported wire format version: {header[1]}")
+    if header[8] > len(buffer):
+        raise ValueError("Message is truncated")
+    
+    return buffer, header
+
+
+def _decode_blocks(buffer: memoryview, header: Tuple, reader: "_ArrayReader") -> Dict[str, Any]:
+    """
+    Decode the face, hand and pose blocks of a message.
+    
+    Args:
+        buffer: Metadata buffer
+        header: Unpacked header fields
+        reader: Reader returning the arrays of the message in order
+    
+    Returns:
+        Dict[str, Any]: Result dictionary with LandmarkArray landmarks
+    """
+    _, _, _, block_count, frame_index, frame_timestamp, width, height, _, _, _ = header
+    
+    result = {key: [] for key in BLOCK_KINDS}
+    result['frame_timestamp'] = frame_timestamp
+    result['frame_index'] = frame_index
+    result['source_dimensions'] = (width, height)
+    
+    descriptor_offset = HEADER_STRUCT.size
+    names_offset = descriptor_offset + block_count * BLOCK_STRUCT.size
+    
+    for _ in range(block_count):
+        (kind, flags, handedness, hand_flag, landmark_count, blendshape_count,
+         tracking_id, detection_confidence, timestamp, names_size) = \
+            BLOCK_STRUCT.unpack_from(buffer, descriptor_offset)
+        descriptor_offset += BLOCK_STRUCT.size
+        
+        if kind >= len(BLOCK_KINDS):
+            raise ValueError(f"Unknown block kind: {kind}")
+        
+        landmarks = LandmarkArray(reader.read(landmark_count * 4).reshape(landmark_count, 4))
+        
+        entry = {
+            'landmarks': landmarks,
+            'visibility': landmarks.visibility,
+            'timestamp': timestamp,
+            'detection_confidence': detection_confidence,
+            'tracking_id': None if tracking_id < 0 else tracking_id
+        }
+        
+        if flags & FLAG_WORLD_LANDMARKS:
+            world_landmarks = reader.read(landmark_count * 4)
+            entry['world_landmarks'] = LandmarkArray(world_landmarks.reshape(landmark_count, 4))
+        
+        if blendshape_count:
+            scores = reader.read(blendshape_count)
+            names = bytes(buffer[names_offset:names_offset + names_size]).decode('utf-8').split('\n')
+            entry['blendshapes'] = [
+                {'name': name, 'score': score}
+                for name, score in zip(names, scores.tolist())
+            ]
+        names_offset += names_size
+        
+        if BLOCK_KINDS[kind] == 'hands':
+            entry['handedness'] = HANDEDNESS[handedness] if handedness < len(HANDEDNESS) else 'UNKNOWN'
+            entry['hand_flag'] = hand_flag
+        
+        result[BLOCK_KINDS[kind]].append(entry)
+    
+    reader.finish()
+    return result
+
+
+class _ArrayReader:
+    """
+    Reads the float32 arrays of a message in order, either from the end of the
+    metadata buffer or from one frame per array.
+    """
+    
+    def __init__(self, buffer: memoryview, offset: int, frames: Sequence[Union[bytes, memoryview]]):
+        """
+        Initialize the array reader.
+        
+        Args:
+            buffer: Metadata buffer
+            offset: Byte offset of the first array in the metadata buffer
+            frames: Array frames, or an empty sequence if the arrays follow the metadata
+        """
+        self.buffer = buffer
+        self.offset = offset
+        self.frames = frames
+        self.frame_index = 0
+    
+    def read(self, count: int) -> np.ndarray:
+        """
+        Read the next array without copying it.
+        
+        Args:
+            count: Number of float32 values
+        
+        Returns:
+            np.ndarray: Read-only float32 view
+        """
+        size = count * FLOAT32.itemsize
+        
+        if not self.frames:
+            end = self.offset + size
+            if end > len(self.buffer):
+                raise ValueError("Message is truncated")
+            array = np.frombuffer(self.buffer, dtype=FLOAT32, count=count, offset=self.offset)
+            self.offset = end
+            return array
+        
+        if self.frame_index >= len(self.frames):
+            raise ValueError("Message is missing array frames")
+        frame = self.frames[self.frame_index]
+        self.frame_index += 1
+        
+        array = np.frombuffer(frame, dtype=FLOAT32)
+        if array.size != count:
+            raise ValueError(f"Array frame has {array.size} values, expected {count}")
+        return array
+    
+    def finish(self) -> None:
+        """Check that every array frame was read."""
+        if self.frame_index < len(self.frames):
+            raise ValueError("Message has unexpected array frames")
+
+
+class DeltaEncoder:
+    """
+    Encoder sending periodic keyframes and, in between, int16 deltas relative
+    to the last keyframe. Deltas never depend on earlier deltas, so a lost
+    message only affects itself and a receiver recovers at the next keyframe.
+    """
+    
+    def __init__(
+        self,
+        keyframe_interval: int = 30,
+        quantization_step: float = 0.00025,
+        compression_level: int = 1
+    ):
+        """
+        Initialize the delta encoder.
+        
+        Args:
+            keyframe_interval: Maximum number of messages from one keyframe to the next
+            quantization_step: Value of one delta step (normalized units or meters)
+            compression_level: zlib compression level for delta payloads
+        """
+        if keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be at least 1")
+        if quantization_step <= 0:
+            raise ValueError("Quantization step must be positive")
+        
+        self.keyframe_interval = keyframe_interval
+        self.quantization_step = np.float32(quantization_step)
+        self.compression_level = compression_level
+        
+        # Last keyframe
+        self.keyframe_id = 0
+        self.keyframe_values = None
+        self.keyframe_layout = None
+        self.messages_since_keyframe = 0
+        
+        # Statistics
+        self.keyframe_count = 0
+        self.delta_count = 0
+    
+    def request_keyframe(self) -> None:
+        """Make the next message a keyframe."""
+        self.keyframe_values = None
+    
+    def encode_parts(self, data: Any) -> List[Union[bytes, np.ndarray]]:
+        """
+        Encode a detection result as a keyframe or a delta message.
+        
+        Args:
+            data: DetectionResult or dictionary in the streamer result format
+        
+        Returns:
+            List[Union[bytes, np.ndarray]]: Metadata frame followed by the array frames
+                of a keyframe, or by the compressed payload of a delta
+        """
+        descriptors, names, arrays, layout = _encode_blocks(data)
+        values = np.concatenate([array.ravel() for array in arrays]) if arrays else np.empty(0, dtype=FLOAT32)
+        
+        steps = None
+        if (self.keyframe_values is not None
+                and layout == self.keyframe_layout
+                and self.messages_since_keyframe < self.keyframe_interval):
+            steps = np.rint((values - self.keyframe_values) / self.quantization_step)
+            # NaN steps fail this check as well and force a keyframe
+            if not (np.abs(steps) <= INT16_LIMIT).all():
+                steps = None
+        
+        if steps is None:
+            self.keyframe_id = (self.keyframe_id + 1) & 0xFFFFFFFF
+            self.keyframe_values = values
+            self.keyframe_layout = layout
+            self.messages_since_keyframe = 1
+            self.keyframe_count += 1
+            
+            metadata = _pack_metadata(data, descriptors, names, MESSAGE_KEYFRAME, self.keyframe_id)
+            return [metadata, *arrays]
+        
+        self.messages_since_keyframe += 1
+        self.delta_count += 1
+        
+        # Group low and high bytes so small steps compress well
+        planes = steps.astype(INT16).view(np.uint8).reshape(-1, 2).T
+        payload = zlib.compress(planes.tobytes(), self.compression_level)
+        
+        metadata = _pack_metadata(
+            data, descriptors, names, MESSAGE_DELTA, self.keyframe_id, float(self.quantization_step)
+        )
+        return [metadata, payload]
+
+
+class DeltaDecoder:
+    """
+    Decoder for messages produced by DeltaEncoder.
+    Deltas are dropped until the keyframe they refer to has been received,
+    which resynchronizes receivers that joined late or lost a keyframe.
+    """
+    
+    def __init__(self):
+        """Initialize the delta decoder."""
+        self.keyframe_id = None
+        self.keyframe_values = None
+        
+        # Statistics
+        self.keyframe_count = 0
+        self.delta_count = 0
+        self.skipped_count = 0
+    
+    def decode_parts(self, frames: Sequence[Union[bytes, memoryview]]) -> Optional[Dict[str, Any]]:
+        """
+        Decode a keyframe, delta or plain binary message.
+        
+        Args:
+            frames: Received frames
+        
+        Returns:
+            Optional[Dict[str, Any]]: Result dictionary, or None if the referenced keyframe is missing
+        """
+        buffer, header = _unpack_header(frames)
+        message_flags, metadata_size, keyframe_id, quantization_step = \
+            header[2], header[8], header[9], header[10]
+        
+        if not message_flags & MESSAGE_DELTA:
+            result = _decode_blocks(buffer, header, _ArrayReader(buffer, metadata_size, frames[1:]))
+            
+            if message_flags & MESSAGE_KEYFRAME:
+                self.keyframe_id = keyframe_id
+                self.keyframe_values = _concatenate_values(result)
+                self.keyframe_count += 1
+            
+            return result
+        
+        if keyframe_id != self.keyframe_id:
+            self.skipped_count += 1
+            return None
+        
+        payload = frames[1] if len(frames) > 1 else buffer[metadata_size:]
+        
+        # Never inflate more than the keyframe size, a corrupt or hostile payload
+        # could otherwise expand to an arbitrary amount of memory
+        decompressor = zlib.decompressobj()
+        planes = np.frombuffer(decompressor.decompress(payload, 2 * self.keyframe_values.size), dtype=np.uint8)
+        if decompressor.unconsumed_tail or not decompressor.eof:
+            raise ValueError("Delta payload is larger than the keyframe or truncated")
+        if planes.size != 2 * self.keyframe_values.size:
+            raise ValueError("Delta payload does not match the keyframe")
+        
+        
+        steps = planes.reshape(2, -1).T.copy().view(INT16).ravel()
+        values = self.keyframe_values + steps * np.float32(quantization_step)
+        self.delta_count += 1
+        
+        return _decode_blocks(buffer, header, _ArrayReader(memoryview(values).cast('B'), 0, ()))
+    
+    def skip_parts(self, frames: Sequence[Union[bytes, memoryview]]) -> None:
+        """
+        Skip a message that will not be used. Keyframes are still decoded so
+        the deltas that refer to them can be decoded later.
+        
+        Args:
+            frames: Received frames
+        """
+        _, header = _unpack_header(frames)
+        if header[2] & MESSAGE_KEYFRAME:
+            self.decode_parts(frames)
+
+
+def _concatenate_values(result: Dict[str, Any]) -> np.ndarray:
+    """
+    Concatenate the arrays of a decoded result in message order.
+    
+    Args:
+        result: Result dictionary returned by _decode_blocks()
+    
+    Returns:
+        np.ndarray: Flat float32 copy of all values
+    """
+    arrays = []
+    for key in BLOCK_KINDS:
+        for entry in result[key]:
+            arrays.append(entry['landmarks'].data.ravel())
+            if 'world_landmarks' in entry:
+                arrays.append(entry['world_landmarks'].data.ravel())
+            if 'blendshapes' in entry:
+                arrays.append(np.array([shape['score'] for shape in entry['blendshapes']], dtype=FLOAT32))
+    
+    return np.concatenate(arrays) if arrays else np.empty(0, dtype=FLOAT32)
+
+
+class PickleSerializer:
+    """
+    Serializer using pickle.
+    Handles any Python data, but must only be used with trusted peers.
+    """
+    
+    name = "pickle"
+    
+    # Whether send_message() accepts DetectionResult objects directly
+    accepts_detection_results = False
+    
+    def dumps(self, data: Any) -> bytes:
+        """
+        Serialize data to bytes.
+        
+        Args:
+            data: Data to serialize
+        
+        Returns:
+            bytes: Serialized data
+        """
+        return pickle.dumps(data)
+    
+    def loads(self, message: Union[bytes, memoryview]) -> Any:
+        """
+        Deserialize data from bytes.
+        
+        Args:
+            message: Serialized data
+        
+        Returns:
+            Any: Deserialized data
+        """
+        return pickle.loads(message)
+    
+    def dumps_parts(self, data: Any) -> List[bytes]:
+        """
+        Serialize data to message frames.
+        
+        Args:
+            data: Data to serialize
+        
+        Returns:
+            List[bytes]: Single frame with the pickled data
+        """
+        return [pickle.dumps(data)]
+    
+    def loads_parts(self, frames: Sequence[Union[bytes, memoryview]]) -> Any:
+        """
+        Deserialize data from message frames.
+        
+        Args:
+            frames: Received frames
+        
+        Returns:
+            Any: Deserialized data
+        """
+        if len(frames) != 1:
+            raise ValueError(f"Expected a single pickle frame, got {len(frames)}")
+        return pickle.loads(frames[0])
+    
+    def skip_parts(self, frames: Sequence[Union[bytes, memoryview]]) -> None:
+        """
+        Skip a received message without deserializing it.
+        
+        Args:
+            frames: Received frames
+        """
+        pass
+    
+    def fork(self) -> "PickleSerializer":
+        """
+        Get a serializer for another message stream.
+        
+        Returns:
+            PickleSerializer: This serializer, which keeps no state
+        """
+        return self
+
+
+class BinarySerializer:
+    """
+    Serializer using the binary landmark wire format.
+    Only detection results can be sent, and decoding never executes code from
+    the message.
+    """
+    
+    name = "binary"
+    
+    # Whether send_message() accepts DetectionResult objects directly
+    accepts_detection_results = True
+    
+    def dumps(self, data: Any) -> bytes:
+        """
+        Serialize a detection result to bytes.
+        
+        Args:
+            data: DetectionResult or dictionary in the streamer result format
+        
+        Returns:
+            bytes: Serialized data
+        """
+        return encode_result(data)
+    
+    def loads(self, message: Union[bytes, memoryview]) -> Dict[str, Any]:
+        """
+        Deserialize a detection result from bytes.
+        
+        Args:
+            message: Serialized data
+        
+        Returns:
+            Dict[str, Any]: Result dictionary with LandmarkArray landmarks
+        """
+        return decode_result(message)
+    
+    def dumps_parts(self, data: Any) -> List[Union[bytes, np.ndarray]]:
+        """
+        Serialize a detection result to message frames without copying the
+        landmark arrays. The arrays must not be modified until they are sent.
+        
+        Args:
+            data: DetectionResult or dictionary in the streamer result format
+        
+        Returns:
+            List[Union[bytes, np.ndarray]]: Metadata frame followed by one frame per array
+        """
+        metadata, arrays = encode_parts(data)
+        return [metadata, *arrays]
+    
+    def loads_parts(self, frames: Sequence[Union[bytes, memoryview]]) -> Dict[str, Any]:
+        """
+        Deserialize a detection result from message frames without copying.
+        
+        Args:
+            frames: Received frames
+        
+        Returns:
+            Dict[str, Any]: Result dictionary with LandmarkArray landmarks viewing the frames
+        """
+        return decode_parts(frames)
+    
+    def skip_parts(self, frames: Sequence[Union[bytes, memoryview]]) -> None:
+        """
+        Skip a received message without decoding it.
+        
+        Args:
+            frames: Received frames
+        """
+        pass
+    
+    def fork(self) -> "BinarySerializer":
+        """
+        Get a serializer for another message stream.
+        
+        Returns:
+            BinarySerializer: This serializer, which keeps no state
+        """
+        return self
+
+
+class DeltaSerializer(BinarySerializer):
+    """
+    Serializer using the binary wire format with keyframe and delta messages.
+    Each instance keeps encoder and decoder state, so every streamer needs its
+    own instance.
+    """
+    
+    name = "delta"
+    
+    def __init__(self, keyframe_interval: int = 30, quantization_step: float = 0.00025):
+        """
+        Initialize the delta serializer.
+        
+        Args:
+            keyframe_interval: Maximum number of messages from one keyframe to the next
+            quantization_step: Value of one delta step (normalized units or meters)
+        """
+        self.encoder = DeltaEncoder(keyframe_interval, quantization_step)
+        self.decoder = DeltaDecoder()
+    
+    def dumps(self, data: Any) -> bytes:
+        """
+        Serialize a detection result to bytes.
+        
+        Args:
+            data: DetectionResult or dictionary in the streamer result format
+        
+        Returns:
+            bytes: Serialized data
+        """
+        return b''.join(memoryview(frame).cast('B') for frame in self.dumps_parts(data))
+    
+    def loads(self, message: Union[bytes, memoryview]) -> Optional[Dict[str, Any]]:
+        """
+        Deserialize a detection result from bytes.
+        
+        Args:
+            message: Serialized data
+        
+        Returns:
+            Optional[Dict[str, Any]]: Result dictionary, or None while waiting for a keyframe
+        """
+        return self.decoder.decode_parts([message])
+    
+    def dumps_parts(self, data: Any) -> List[Union[bytes, np.ndarray]]:
+        """
+        Serialize a detection result to message frames.
+        
+        Args:
+            data: DetectionResult or dictionary in the streamer result format
+        
+        Returns:
+            List[Union[bytes, np.ndarray]]: Keyframe or delta message frames
+        """
+        return self.encoder.encode_parts(data)
+    
+    def loads_parts(self, frames: Sequence[Union[bytes, memoryview]]) -> Optional[Dict[str, Any]]:
+        """
+        Deserialize a detection result from message frames.
+        
+        Args:
+            frames: Received frames
+        
+        Returns:
+            Optional[Dict[str, Any]]: Result dictionary, or None while waiting for a keyframe
+        """
+        return self.decoder.decode_parts(frames)
+    
+    def skip_parts(self, frames: Sequence[Union[bytes, memoryview]]) -> None:
+        """
+        Skip a received message, still decoding it if it is a keyframe.
+        
+        Args:
+            frames: Received frames
+        """
+        self.decoder.skip_parts(frames)
+    
+    def fork(self) -> "DeltaSerializer":
+        """
+        Get a serializer for another message stream, with the same settings
+        but its own keyframes.
+        
+        Returns:
+            DeltaSerializer: New serializer instance
+        """
+        return DeltaSerializer(self.encoder.keyframe_interval, float(self.encoder.quantization_step))
+
+
+# Serializers that can be selected by name
+SERIALIZERS = {
+    PickleSerializer.name: PickleSerializer,
+    BinarySerializer.name: BinarySerializer,
+    DeltaSerializer.name: DeltaSerializer
+}
+
+def get_serializer(serializer: Union[str, Any]) -> Any:
+    """
+    Get a serializer instance.
+    
+    Args:
+        serializer: Serializer name ("pickle", "binary" or "delta") or serializer instance
+    
+    Returns:
+        Any: Serializer instance
+    """
+    if not isinstance(serializer, str):
+        return serializer
+    if serializer not in SERIALIZERS:
+        raise ValueError(f"Unsupported serializer: {serializer}")
+    return SERIALIZERS[serializer]()